@@ -1,11 +1,36 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session, abort, make_response, Response, stream_with_context
 from flask_migrate import Migrate
+import click
 from config import Config
 from extensions import db
+from database import analyze_database, configure_engine, is_transient_error, retry_on_lock
+from routing import init_routing, read_replica, sync_sqlite_replica
+from maintenance_plans import DEFAULT_HORIZON_DAYS, InvalidPlan, generate_plan_requests, validate_plan
 from models import *
+from queries import request_query, equipment_query, member_query
+from pagination import InvalidCursor, keyset_paginate, page_size
+from caching import apply_cache_policy, conditional_get, fingerprint_static_urls
+from profiling import init_profiling, slowest_requests
+from kanban_moves import InvalidMoves, apply_moves, parse_moves
+from change_feed import event_stream
+from exports import EXPORTS, export_query, stream_json_array, stream_ndjson
+from query_plans import check_query_plans
+from employee_codes import allocate_employee_code, preview_employee_code
+from validators import is_valid_email, is_valid_phone
+from bulk_import import IMPORTERS, ImportFileError, import_rows, read_rows
+from dashboard_stats import DashboardStats, get_dashboard_stats, rebuild_dashboard_counters, rollover_dashboard_counters
+from workload import pick_technician, rebuild_workload_index, technician_utilization
+from timeline import TIMELINE_KINDS, equipment_timeline
+from request_listing import REQUEST_PRIORITIES, REQUEST_STATUSES, REQUEST_TYPES, InvalidRequestFilter, RequestFilters, list_requests, request_facets
+from search import SEARCH_KINDS, include_schema_name, rebuild_search_index, search, suggest
+from jobs import enqueue, init_jobs, run_worker
+from overdue import sweep_overdue
+import tasks  # registers the background tasks with jobs.TASKS
+from reliability import HISTORY_ACTIONS, InvalidHistory, rebuild_reliability_rollups, reliability_breakdown, reliability_trend, validate_history
 from datetime import datetime
 import re
 import os
+import uuid
 from functools import wraps
 
 app = Flask(__name__)
@@ -15,16 +40,123 @@ app.config.from_object(Config)
 if not app.config.get('SECRET_KEY'):
     app.config['SECRET_KEY'] = 'dev-secret-key-change-in-production'
 
+configure_engine(app)
 db.init_app(app)
-migrate = Migrate(app, db)
-
-# Add response headers to prevent caching
-@app.after_request
-def add_header(response):
-    response.headers['Cache-Control'] = 'no-store, no-cache, must-revalidate, post-check=0, pre-check=0, max-age=0'
-    response.headers['Pragma'] = 'no-cache'
-    response.headers['Expires'] = '-1'
-    return response
+migrate = Migrate(app, db, include_name=include_schema_name)
+
+# Read-only routes marked @read_replica use the replica bind when configured
+init_routing(app)
+
+# Caching policy: fingerprinted static assets are immutable, /api/* reads
+# answer conditional GETs, pages are not stored
+app.url_defaults(fingerprint_static_urls)
+app.after_request(apply_cache_policy)
+
+# Per-request SQL/template timings (Server-Timing header, log, /debug/profile)
+init_profiling(app)
+
+# Background jobs: the job table is the queue, 'flask run-worker' drains it
+init_jobs(app)
+
+# CLI commands
+@app.cli.command('rebuild-counters')
+def rebuild_counters_command():
+    """Rebuild the materialized dashboard counters from scratch"""
+    count = rebuild_dashboard_counters()
+    print(f"Rebuilt {count} dashboard counter rows")
+
+@app.cli.command('rollover-counters')
+def rollover_counters_command():
+    """Move requests that became overdue since the last run into the overdue count"""
+    if rollover_dashboard_counters():
+        print("Dashboard counters rolled over")
+    else:
+        print("Dashboard counters have not been built, run 'flask rebuild-counters' first")
+
+@app.cli.command('check-query-plans')
+def check_query_plans_command():
+    """Fail if a hot route query reads a whole table or index (SQLite)"""
+    if db.engine.dialect.name != 'sqlite':
+        print("check-query-plans reads SQLite's EXPLAIN QUERY PLAN, skipping")
+        return
+    failed = False
+    for name, (plan, scanned) in check_query_plans().items():
+        print(f"{'FAIL' if scanned else 'ok  '} {name}: {'; '.join(plan)}")
+        failed = failed or bool(scanned)
+    if failed:
+        raise SystemExit(1)
+
+@app.cli.command('analyze-db')
+def analyze_db_command():
+    """Refresh the query planner statistics, e.g. after a bulk import"""
+    analyze_database()
+    print("Planner statistics updated")
+
+@app.cli.command('import-data')
+@click.argument('kind', type=click.Choice(sorted(IMPORTERS)))
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+def import_data_command(kind, path):
+    """Bulk import members or equipment from a CSV or .xlsx file"""
+    def progress(report):
+        print(f"{report.rows} rows read, {report.created} created, {report.error_count} errors")
+    with open(path, 'rb') as f:
+        try:
+            report = import_rows(kind, read_rows(f, path), on_progress=progress)
+        except ImportFileError as e:
+            print(f"Import failed: {e}")
+            raise SystemExit(1)
+    for error in report.errors:
+        print(f"Row {error['row']}: {error['message']}")
+    if report.error_count > len(report.errors):
+        print(f"... and {report.error_count - len(report.errors)} more errors")
+
+@app.cli.command('run-worker')
+@click.option('--threads', type=int, help='jobs run at once (default JOB_WORKER_THREADS)')
+@click.option('--poll', type=float, help='seconds between polls when idle (default JOB_POLL_SECONDS)')
+@click.option('--burst', is_flag=True, help='exit once no job is due')
+def run_worker_command(threads, poll, burst):
+    """Run queued background jobs until stopped"""
+    run_worker(app, threads=threads, poll_interval=poll, burst=burst)
+
+@app.cli.command('sweep-overdue')
+def sweep_overdue_command():
+    """Flag newly overdue requests and queue their alerts (workers also run this periodically)"""
+    flagged, cleared, queued = sweep_overdue()
+    print(f"Flagged {flagged} overdue requests, cleared {cleared}, queued {queued} alerts")
+
+@app.cli.command('sync-replica')
+def sync_replica_command():
+    """Copy the primary SQLite database to the replica (local testing)"""
+    if 'replica' not in app.config['SQLALCHEMY_BINDS']:
+        print("No replica configured, set DATABASE_REPLICA_URL")
+        raise SystemExit(1)
+    sync_sqlite_replica(db)
+    print("Replica synced from the primary")
+
+@app.cli.command('generate-maintenance')
+@click.option('--horizon', default=DEFAULT_HORIZON_DAYS, show_default=True, help='days ahead to generate')
+def generate_maintenance_command(horizon):
+    """Create preventive requests from active maintenance plans (workers also run this periodically)"""
+    created = generate_plan_requests(horizon_days=horizon)
+    print(f"Created {created} preventive requests")
+
+@app.cli.command('rebuild-workload')
+def rebuild_workload_command():
+    """Rebuild the technician load index from the open requests"""
+    count = rebuild_workload_index()
+    print(f"Rebuilt {count} technician load rows")
+
+@app.cli.command('rebuild-search')
+def rebuild_search_command():
+    """Re-index requests, equipment and maintenance history for /api/search"""
+    count = rebuild_search_index()
+    print(f"Indexed {count} documents")
+
+@app.cli.command('rebuild-reliability')
+def rebuild_reliability_command():
+    """Rebuild the MTBF/MTTR rollups from the maintenance history"""
+    count = rebuild_reliability_rollups()
+    print(f"Rebuilt {count} reliability rollup rows")
 
 # Login required decorator
 def login_required(f):
@@ -154,76 +286,88 @@ def logout():
     flash('You have been logged out.', 'success')
     return redirect(url_for('login'))
 
-# Helper: generate next employee code like EMP0001
-def generate_employee_id():
-    existing_rows = TeamMember.query.with_entities(TeamMember.employee_id)\
-        .filter(TeamMember.employee_id.isnot(None)).all()
-    existing_ids = [row[0] for row in existing_rows if row and row[0]]
-    numbers = []
-    for eid in existing_ids:
-        m = re.fullmatch(r"EMP(\d+)", eid.strip())
-        if m:
-            numbers.append(int(m.group(1)))
-    next_n = (max(numbers) + 1) if numbers else 1
-    candidate = f"EMP{next_n:04d}"
-    # ensure uniqueness even if non-standard codes exist
-    while TeamMember.query.filter_by(employee_id=candidate).first():
-        next_n += 1
-        candidate = f"EMP{next_n:04d}"
-    return candidate
+# Helper: parse an optional YYYY-MM-DD query argument
+def parse_date_arg(name):
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError(f"Invalid '{name}' date, expected YYYY-MM-DD")
+
+# Helper: inclusive date range filter with optional bounds
+def date_window(column, start, end):
+    clauses = []
+    if start:
+        clauses.append(column >= start)
+    if end:
+        clauses.append(column <= end)
+    return db.and_(*clauses)
+
+# Helper: keyset pagination driven by ?cursor=&limit=&count=1
+def paginate_from_args(query, columns, descending=False):
+    return keyset_paginate(
+        query, columns,
+        cursor=request.args.get('cursor'),
+        limit=page_size(request.args.get('limit')),
+        descending=descending,
+        with_total=request.args.get('count') == '1'
+    )
+
+def paginate_or_400(query, columns, descending=False):
+    try:
+        return paginate_from_args(query, columns, descending)
+    except InvalidCursor:
+        abort(400)
+
+# Helper: pagination is opt-in for API listings that used to return every row
+def wants_page():
+    return any(name in request.args for name in ('cursor', 'limit', 'count'))
+
+# Helper: JSON body for one page of an API listing
+def page_payload(page, key, items):
+    payload = {key: items, 'next_cursor': page.next_cursor}
+    if page.total is not None:
+        payload['total'] = page.total
+    return payload
+
+# Helper: one page of an equipment timeline from ?cursor=&limit=&kind=&status=&action_type=
+def timeline_from_args(equipment_id, limit=None):
+    def values(name):
+        return list(dict.fromkeys(v.strip() for v in request.args.get(name, '').split(',') if v.strip()))
+    kinds = [k for k in values('kind') if k in TIMELINE_KINDS] or None
+    return equipment_timeline(
+        equipment_id,
+        cursor=request.args.get('cursor'),
+        limit=limit or page_size(request.args.get('limit')),
+        kinds=kinds,
+        statuses=[v.upper() for v in values('status')],
+        action_types=[v.upper() for v in values('action_type')],
+    )
+
+# Helper: render the rows of a follow-up page for infinite scroll
+def render_partial(template, page, **context):
+    response = make_response(render_template(template, **context))
+    response.headers['X-Next-Cursor'] = page.next_cursor or ''
+    return response
 
 @app.route('/')
+@read_replica
 def dashboard():
-    # Refresh database session to ensure fresh data
-    db.session.expire_all()
-    
-    # Get statistics for dashboard
-    total_teams = Team.query.count()
-    total_members = TeamMember.query.count()
-    total_equipment = Equipment.query.count()
-    active_members = TeamMember.query.filter_by(status='active').count()
+    # Counters are read from the materialized dashboard_counter table
+    try:
+        stats = get_dashboard_stats()
+    except Exception as e:
+        print(f"Error computing dashboard stats: {e}")
+        stats = DashboardStats()
     
-    # Get all requests for the table (with safe column access)
+    # Get latest requests for the table
     try:
-        all_requests = Request.query.order_by(Request.created_at.desc()).limit(10).all()
-        pending_requests = Request.query.filter_by(status='NEW_REQUEST').count()
-        
-        # Count requests by type
-        corrective_requests = Request.query.filter_by(type='CORRECTIVE').count()
-        preventive_requests = Request.query.filter_by(type='PREVENTIVE').count()
-        
-        # Get overdue requests (due_date passed but status still pending)
-        from datetime import date
-        overdue_requests = Request.query.filter(
-            Request.due_date < date.today(),
-            Request.status.in_(['NEW_REQUEST', 'IN_PROGRESS'])
-        ).count()
+        all_requests = request_query('summary').order_by(Request.created_at.desc()).limit(10).all()
     except Exception as e:
         print(f"Error fetching requests: {e}")
         all_requests = []
-        pending_requests = 0
-        corrective_requests = 0
-        preventive_requests = 0
-        overdue_requests = 0
-    
-    # Calculate critical equipment (status = 'critical' or 'maintenance')
-    try:
-        critical_equipment = Equipment.query.filter(
-            Equipment.status.in_(['critical', 'maintenance', 'under_repair'])
-        ).count()
-    except:
-        critical_equipment = 0
-    
-    # Get equipment by status
-    try:
-        available_equipment = Equipment.query.filter_by(status='available').count()
-        in_use_equipment = Equipment.query.filter_by(status='in_use').count()
-    except:
-        available_equipment = 0
-        in_use_equipment = 0
-    
-    # Calculate technician load (active members vs pending requests)
-    tech_load = min(int((pending_requests / max(active_members, 1)) * 100), 100) if active_members > 0 else 0
     
     # Get recent teams
     recent_teams = Team.query.order_by(Team.id.desc()).limit(5).all()
@@ -232,29 +376,29 @@ def dashboard():
     technicians = TeamMember.query.filter_by(status='active').order_by(TeamMember.name).all()
     
     return render_template('dashboard.html', 
-                         total_teams=total_teams,
-                         total_members=total_members,
-                         total_equipment=total_equipment,
-                         active_members=active_members,
-                         critical_equipment=critical_equipment,
-                         tech_load=tech_load,
-                         pending_requests=pending_requests,
-                         overdue_requests=overdue_requests,
-                         corrective_requests=corrective_requests,
-                         preventive_requests=preventive_requests,
-                         available_equipment=available_equipment,
-                         in_use_equipment=in_use_equipment,
+                         stats=stats,
                          all_requests=all_requests,
                          recent_teams=recent_teams,
                          technicians=technicians)
 
+@app.route('/api/dashboard/stats')
+@read_replica
+@conditional_get(Team, TeamMember, Equipment, Request)
+def api_dashboard_stats():
+    """Get dashboard counters as JSON"""
+    try:
+        stats = get_dashboard_stats()
+    except Exception as e:
+        print(f"Error computing dashboard stats: {e}")
+        stats = DashboardStats()
+    return jsonify({'stats': stats.to_dict()})
+
 @app.route('/equipment')
 def equipment():
-    all_equipment = Equipment.query.all()
-    # Build maps for related display (team and member names)
-    teams_by_id = {t.id: t for t in Team.query.all()}
-    members_by_id = {m.id: m for m in TeamMember.query.all()}
-    return render_template('equipment.html', equipment=all_equipment, teams_by_id=teams_by_id, members_by_id=members_by_id)
+    page = paginate_or_400(equipment_query(), [Equipment.name, Equipment.id])
+    if request.args.get('partial'):
+        return render_partial('_equipment_cards.html', page, equipment=page.items)
+    return render_template('equipment.html', equipment=page.items, next_cursor=page.next_cursor)
 
 # Removed Requests form route
 
@@ -263,19 +407,21 @@ def kanban():
     # Fetch tasks (requests) from DB
     tasks = []
     try:
-        for r in Request.query.all():
+        for r in request_query('kanban').all():
             tasks.append({
                 'id': r.id,
                 'title': r.title,
                 'status': r.status or 'NEW',
                 'type': getattr(r, 'type', None) or 'CORRECTIVE',
                 'dueDate': r.due_date.strftime('%Y-%m-%d') if r.due_date else None,
+                'updatedAt': r.updated_at.isoformat() if r.updated_at else None,
             })
     except:
         pass
     return render_template('kanban.html', tasks=tasks)
 
 @app.route('/kanban/move', methods=['POST'])
+@retry_on_lock
 def kanban_move():
     data = request.get_json(silent=True) or {}
     task_id = data.get('taskId')
@@ -290,16 +436,57 @@ def kanban_move():
     db.session.commit()
     return {'ok': True}
 
+@app.route('/kanban/move/batch', methods=['POST'])
+@retry_on_lock
+def kanban_move_batch():
+    """Apply many kanban moves in one transaction.
+    
+    Body: {"moves": [{"taskId", "newStatus", "expectedUpdatedAt"}, ...]}.
+    Each result is ok, conflict (with the current status and updatedAt)
+    or not_found.
+    """
+    try:
+        moves = parse_moves(request.get_json(silent=True))
+    except InvalidMoves as e:
+        return {'ok': False, 'error': str(e)}, 400
+    try:
+        results = apply_moves(moves)
+    except Exception as e:
+        if is_transient_error(e):
+            raise  # retried by @retry_on_lock
+        print(f"Error applying kanban moves: {e}")
+        db.session.rollback()
+        return {'ok': False, 'error': 'Could not apply moves'}, 500
+    return {'ok': True, 'results': results}
+
 @app.route('/calendar')
 def calendar():
     return render_template('calendar.html')
 
 @app.route('/requests')
+@read_replica
 def requests():
-    all_requests = Request.query.order_by(Request.created_at.desc()).all()
-    return render_template('requests.html', requests=all_requests)
+    """Requests listing filtered, sorted and faceted from the query string (see request_listing.py)"""
+    try:
+        filters = RequestFilters.from_args(request.args)
+        page = list_requests(filters, cursor=request.args.get('cursor'), limit=page_size(request.args.get('limit')))
+    except (InvalidRequestFilter, InvalidCursor):
+        abort(400)
+    if request.args.get('partial'):
+        return render_partial('_request_rows.html', page, requests=page.items)
+    
+    # Stat cards and facet counts cover every matching request, not just the first page
+    facets = request_facets(filters)
+    teams = Team.query.options(db.load_only(Team.id, Team.name)).order_by(Team.name).all()
+    technician = db.session.get(TeamMember, filters.technician_id) if filters.technician_id else None
+    equipment_item = db.session.get(Equipment, filters.equipment_id) if filters.equipment_id else None
+    return render_template('requests.html', requests=page.items, next_cursor=page.next_cursor,
+                           filters=filters, facets=facets, teams=teams, technician=technician,
+                           equipment=equipment_item, statuses=REQUEST_STATUSES, types=REQUEST_TYPES,
+                           priorities=REQUEST_PRIORITIES)
 
 @app.route('/requests/new', methods=['GET', 'POST'])
+@retry_on_lock
 def new_request():
     if request.method == 'POST':
         title = request.form.get('title', '').strip()
@@ -311,19 +498,23 @@ def new_request():
         scheduled_date_str = request.form.get('scheduled_date')
         due_date_str = request.form.get('due_date')
         
+        from datetime import datetime as dt
+        scheduled_date = dt.strptime(scheduled_date_str, '%Y-%m-%d').date() if scheduled_date_str else None
+        due_date = dt.strptime(due_date_str, '%Y-%m-%d').date() if due_date_str else None
+        
+        team_id = None
+        if equipment_id:
+            eq = Equipment.query.get(equipment_id)
+            if eq and eq.maintenance_team_id:
+                team_id = eq.maintenance_team_id
+        
+        # No technician picked: assign the least-loaded one in the equipment's team
+        if not technician_id:
+            technician_id = pick_technician(team_id, scheduled_date or due_date)
+        
         if not title or not technician_id:
-            flash('Title and technician are required', 'danger')
+            flash('Title and an available technician are required', 'danger')
         else:
-            from datetime import datetime as dt
-            scheduled_date = dt.strptime(scheduled_date_str, '%Y-%m-%d').date() if scheduled_date_str else None
-            due_date = dt.strptime(due_date_str, '%Y-%m-%d').date() if due_date_str else None
-            
-            team_id = None
-            if equipment_id:
-                eq = Equipment.query.get(equipment_id)
-                if eq and eq.maintenance_team_id:
-                    team_id = eq.maintenance_team_id
-            
             new_req = Request(
                 title=title,
                 description=description,
@@ -402,10 +593,13 @@ def delete_team(team_id):
 # Team Member Routes
 @app.route('/members')
 def members():
-    all_members = TeamMember.query.all()
-    return render_template('members.html', members=all_members)
+    page = paginate_or_400(member_query(), [TeamMember.name, TeamMember.id])
+    if request.args.get('partial'):
+        return render_partial('_member_rows.html', page, members=page.items)
+    return render_template('members.html', members=page.items, next_cursor=page.next_cursor)
 
 @app.route('/members/add', methods=['GET', 'POST'])
+@retry_on_lock
 def add_member():
     if request.method == 'POST':
         name = request.form.get('name')
@@ -424,11 +618,11 @@ def add_member():
             field_errors['name'] = 'Name is required.'
         if not email:
             field_errors['email'] = 'Email is required.'
-        elif not re.fullmatch(r"[^@\s]+@[^@\s]+\.[^@\s]+", email):
+        elif not is_valid_email(email):
             field_errors['email'] = 'Enter a valid email address.'
         if not team_id:
             field_errors['team_id'] = 'Team selection is required.'
-        if phone and not re.fullmatch(r"\d{10}", phone):
+        if phone and not is_valid_phone(phone):
             field_errors['phone'] = 'Phone number must be exactly 10 digits.'
 
         # Duplicate checks
@@ -452,8 +646,8 @@ def add_member():
             }
             return render_template('add_member.html', teams=teams, form_data=form_data, field_errors=field_errors)
 
-        # Always auto-assign employee code from database using generator
-        employee_id = generate_employee_id()
+        # Always auto-assign employee code from the sequence, in this transaction
+        employee_id = allocate_employee_code()
 
         new_member = TeamMember(
             name=name,
@@ -472,8 +666,8 @@ def add_member():
         return redirect(url_for('teams'))
     
     teams = Team.query.all()
-    # Provide next employee id preview for the form (read-only)
-    next_employee_id = generate_employee_id()
+    # Provide next employee id preview for the form (read-only, not reserved)
+    next_employee_id = preview_employee_code()
     return render_template('add_member.html', teams=teams, next_employee_id=next_employee_id)
 
 @app.route('/members/<int:member_id>')
@@ -482,6 +676,7 @@ def member_detail(member_id):
     return render_template('member_detail.html', member=member)
 
 @app.route('/members/<int:member_id>/edit', methods=['GET', 'POST'])
+@retry_on_lock
 def edit_member(member_id):
     member = TeamMember.query.get_or_404(member_id)
     if request.method == 'POST':
@@ -497,7 +692,7 @@ def edit_member(member_id):
 
         # Field-level validations and duplicate checks (excluding current member)
         field_errors = {}
-        if member.phone and not re.fullmatch(r"\d{10}", member.phone):
+        if member.phone and not is_valid_phone(member.phone):
             field_errors['phone'] = 'Phone number must be exactly 10 digits.'
         if member.employee_id:
             existing_emp = TeamMember.query.filter(TeamMember.employee_id == member.employee_id, TeamMember.id != member.id).first()
@@ -506,7 +701,7 @@ def edit_member(member_id):
         existing_email = TeamMember.query.filter(TeamMember.email == member.email, TeamMember.id != member.id).first()
         if existing_email:
             field_errors['email'] = 'Email already exists. Please use a unique email.'
-        elif member.email and not re.fullmatch(r"[^@\s]+@[^@\s]+\.[^@\s]+", member.email):
+        elif member.email and not is_valid_email(member.email):
             field_errors['email'] = 'Enter a valid email address.'
         if member.phone:
             existing_phone = TeamMember.query.filter(TeamMember.phone == member.phone, TeamMember.id != member.id).first()
@@ -520,9 +715,9 @@ def edit_member(member_id):
             teams = Team.query.all()
             return render_template('edit_member.html', member=member, teams=teams, field_errors=field_errors)
 
-        # Auto-assign employee code if missing using generator
+        # Auto-assign employee code if missing from the sequence
         if not member.employee_id:
-            member.employee_id = generate_employee_id()
+            member.employee_id = allocate_employee_code()
 
         member.updated_at = datetime.utcnow()
         db.session.commit()
@@ -642,7 +837,9 @@ def add_equipment():
 @app.route('/equipment/view/<int:id>')
 def view_equipment(id):
     equipment_item = Equipment.query.get_or_404(id)
-    return render_template('view_equipment.html', equipment=equipment_item)
+    recent = equipment_timeline(equipment_item.id, limit=5)
+    return render_template('view_equipment.html', equipment=equipment_item, recent_entries=recent.items,
+                           more_entries=recent.has_more)
 
 @app.route('/equipment/edit/<int:id>', methods=['GET', 'POST'])
 def edit_equipment(id):
@@ -723,18 +920,68 @@ def delete_equipment(id):
     return redirect(url_for('equipment'))
 
 @app.route('/equipment/<int:equipment_id>/maintenance')
+@read_replica
 def equipment_maintenance(equipment_id):
-    """Smart button route - shows maintenance requests for specific equipment"""
+    """Smart button route - requests and history of one piece of equipment, newest first"""
     equipment_item = Equipment.query.get_or_404(equipment_id)
-    # Get all requests related to this equipment
-    # For now, we'll return a simple page showing equipment maintenance requests
-    maintenance_requests = []  # Would filter by equipment_id when Request model is updated
-    return render_template('equipment_maintenance.html', 
-                         equipment=equipment_item, 
-                         requests=maintenance_requests)
+    try:
+        page = timeline_from_args(equipment_item.id)
+    except InvalidCursor:
+        abort(400)
+    if request.args.get('partial'):
+        return render_partial('_timeline_items.html', page, entries=page.items)
+    return render_template('equipment_maintenance.html',
+                         equipment=equipment_item,
+                         entries=page.items,
+                         next_cursor=page.next_cursor,
+                         statuses=REQUEST_STATUSES,
+                         action_types=HISTORY_ACTIONS)
+
+@app.route('/api/equipment/<int:equipment_id>/timeline')
+@read_replica
+def api_equipment_timeline(equipment_id):
+    """One page of an equipment's requests and history (?cursor=&limit=&kind=&status=&action_type=)"""
+    equipment_item = Equipment.query.get_or_404(equipment_id)
+    try:
+        page = timeline_from_args(equipment_item.id)
+    except InvalidCursor as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    return jsonify(page_payload(page, 'timeline', [entry.to_dict() for entry in page.items]))
+
+@app.route('/api/equipment/<int:equipment_id>/plans', methods=['GET', 'POST'])
+def api_equipment_plans(equipment_id):
+    """List or add recurring maintenance plans for one piece of equipment"""
+    equipment_item = Equipment.query.get_or_404(equipment_id)
+    if request.method == 'GET':
+        plans = MaintenancePlan.query.filter_by(equipment_id=equipment_id).order_by(MaintenancePlan.id).all()
+        return jsonify({'plans': [plan.to_dict() for plan in plans]})
+    
+    try:
+        values = validate_plan(request.get_json(silent=True) or {})
+    except InvalidPlan as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    plan = MaintenancePlan(equipment_id=equipment_item.id, **values)
+    db.session.add(plan)
+    db.session.commit()
+    created = generate_plan_requests(plan_ids=[plan.id])
+    return jsonify({'success': True, 'plan': plan.to_dict(), 'created_requests': created}), 201
+
+@app.route('/api/equipment/<int:equipment_id>/history', methods=['POST'])
+def api_equipment_history(equipment_id):
+    """Record a repair, inspection, replacement or calibration for one piece of equipment"""
+    equipment_item = Equipment.query.get_or_404(equipment_id)
+    try:
+        values = validate_history(request.get_json(silent=True) or {})
+    except InvalidHistory as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    entry = MaintenanceHistory(equipment_id=equipment_item.id, **values)
+    db.session.add(entry)
+    db.session.commit()
+    return jsonify({'success': True, 'history': entry.to_dict()}), 201
 
 # API Routes for AJAX requests
 @app.route('/api/teams')
+@conditional_get(Team, TeamMember)
 def api_teams():
     teams = Team.query.all()
     return jsonify([{
@@ -745,19 +992,32 @@ def api_teams():
     } for team in teams])
 
 @app.route('/api/members')
+@read_replica
+@conditional_get(TeamMember, Team)
 def api_members():
-    members = TeamMember.query.all()
-    return jsonify([{
-        'id': member.id,
-        'name': member.name,
-        'email': member.email,
-        'position': member.position,
-        'team': member.team.name if member.team else None,
-        'status': member.status
-    } for member in members])
+    """Team members ordered by name: all of them as a list, or with
+    ?cursor=&limit=&count=1 one page as {members, next_cursor[, total]}"""
+    def member_json(member):
+        return {
+            'id': member.id,
+            'name': member.name,
+            'email': member.email,
+            'position': member.position,
+            'team': member.team.name if member.team else None,
+            'status': member.status
+        }
+    if not wants_page():
+        return jsonify([member_json(member) for member in member_query().order_by(TeamMember.name, TeamMember.id)])
+    try:
+        page = paginate_from_args(member_query(), [TeamMember.name, TeamMember.id])
+    except InvalidCursor as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    return jsonify(page_payload(page, 'members', [member_json(member) for member in page.items]))
 
 # Calendar API Routes
 @app.route('/api/technicians')
+@read_replica
+@conditional_get(TeamMember)
 def api_technicians():
     """Get list of technicians for calendar assignment"""
     technicians = TeamMember.query.filter_by(status='active').all()
@@ -770,39 +1030,221 @@ def api_technicians():
         } for tech in technicians]
     })
 
+@app.route('/api/technicians/workload')
+@read_replica
+def api_technician_workload():
+    """Open hours and utilization per active technician (?team_id=&start=&days=)"""
+    team_id = request.args.get('team_id', type=int)
+    days = min(max(request.args.get('days', 14, type=int), 1), 90)
+    start = None
+    if request.args.get('start'):
+        try:
+            start = datetime.strptime(request.args['start'], '%Y-%m-%d').date()
+        except ValueError:
+            return jsonify({'success': False, 'message': 'start must be YYYY-MM-DD'}), 400
+    return jsonify({
+        'days': days,
+        'technicians': technician_utilization(team_id=team_id, start=start, days=days),
+    })
+
 @app.route('/api/equipment')
+@read_replica
+@conditional_get(Equipment)
 def api_equipment():
-    """Get list of equipment for calendar assignment"""
+    """Equipment ordered by name as {equipment}: all of it, or with
+    ?cursor=&limit=&count=1 one page plus next_cursor[ and total]"""
+    page = None
+    if wants_page():
+        try:
+            page = paginate_from_args(equipment_query(), [Equipment.name, Equipment.id])
+        except InvalidCursor as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
     try:
-        equipment = Equipment.query.all()
-        return jsonify({
-            'equipment': [{
-                'id': eq.id,
-                'name': eq.name,
-                'category': eq.category,
-                'location': eq.location,
-                'status': eq.status,
-                'maintenance_team_id': eq.maintenance_team_id,
-                'technician_id': eq.technician_id,
-                'employee_id': eq.employee_id
-            } for eq in equipment]
-        })
+        if page is None:
+            equipment = equipment_query().order_by(Equipment.name, Equipment.id)
+            return jsonify({'equipment': [eq.to_dict() for eq in equipment]})
+        return jsonify(page_payload(page, 'equipment', [eq.to_dict() for eq in page.items]))
     except Exception as e:
         print(f"Error fetching equipment: {e}")
         return jsonify({'equipment': []})
 
 @app.route('/api/requests')
+@read_replica
+@conditional_get(Request, Equipment, TeamMember, Team)
 def api_get_requests():
-    """Get all maintenance requests for calendar display"""
+    """Get maintenance requests for calendar display.
+    
+    Optional query args: start/end (YYYY-MM-DD) limit the result to requests
+    scheduled or due inside the window; technician_id, team_id and status
+    (comma separated) narrow it further.
+    """
     try:
-        requests = Request.query.all()
+        start = parse_date_arg('start')
+        end = parse_date_arg('end')
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    
+    try:
+        query = request_query('serialize')
+        if start or end:
+            query = query.filter(db.or_(
+                date_window(Request.scheduled_date, start, end),
+                date_window(Request.due_date, start, end)
+            ))
+        technician_id = request.args.get('technician_id', type=int)
+        if technician_id:
+            query = query.filter(Request.technician_id == technician_id)
+        team_id = request.args.get('team_id', type=int)
+        if team_id:
+            query = query.filter(Request.team_id == team_id)
+        statuses = [s for s in request.args.get('status', '').split(',') if s]
+        if statuses:
+            query = query.filter(Request.status.in_(statuses))
+        
+        requests = query.all()
         return jsonify({
             'requests': [req.to_dict() for req in requests]
         })
-    except:
+    except Exception as e:
+        print(f"Error fetching requests: {e}")
         return jsonify({'requests': []})
 
+@app.route('/api/search')
+@read_replica
+def api_search():
+    """Ranked full text search (?q=&kind=request|equipment|history&limit=)"""
+    kind = request.args.get('kind') or None
+    if kind and kind not in SEARCH_KINDS:
+        return jsonify({'success': False, 'message': f"kind must be one of {', '.join(SEARCH_KINDS)}"}), 400
+    limit = min(max(request.args.get('limit', 20, type=int), 1), 50)
+    return jsonify({'results': search(request.args.get('q', ''), kind=kind, limit=limit)})
+
+@app.route('/api/search/suggest')
+@read_replica
+def api_search_suggest():
+    """Autocomplete titles for the words typed so far (?q=)"""
+    return jsonify({'suggestions': suggest(request.args.get('q', ''))})
+
+@app.route('/api/reliability')
+@read_replica
+def api_reliability():
+    """MTBF, MTTR, downtime and cost per period (?dimension=&key=&grain=month|day&start=&end=)"""
+    try:
+        return jsonify(reliability_trend(
+            dimension=request.args.get('dimension', 'all'),
+            key=request.args.get('key', ''),
+            grain=request.args.get('grain', 'month'),
+            start=parse_date_arg('start'),
+            end=parse_date_arg('end'),
+        ))
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
+@app.route('/api/reliability/breakdown')
+@read_replica
+def api_reliability_breakdown():
+    """Equipment, categories or teams ranked by cost, downtime or failures.
+    
+    Query args: dimension, sort, start/end (YYYY-MM-DD), limit; category and
+    team_id narrow an equipment ranking.
+    """
+    try:
+        return jsonify(reliability_breakdown(
+            request.args.get('dimension', 'equipment'),
+            start=parse_date_arg('start'),
+            end=parse_date_arg('end'),
+            sort=request.args.get('sort', 'cost'),
+            limit=min(max(request.args.get('limit', 20, type=int), 1), 100),
+            category=request.args.get('category'),
+            team_id=request.args.get('team_id', type=int),
+        ))
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+
+@app.route('/api/import/<kind>', methods=['POST'])
+def api_import(kind):
+    """Queue a bulk import of members or equipment from an uploaded CSV/.xlsx (field "file").
+
+    Answers 202 with the job; poll its status URL for progress and the report.
+    """
+    if kind not in IMPORTERS:
+        abort(404)
+    upload = request.files.get('file')
+    if not upload or not upload.filename:
+        return jsonify({'success': False, 'message': 'Upload a .csv or .xlsx file as "file"'}), 400
+    extension = os.path.splitext(upload.filename)[1].lower()
+    if extension not in ('.csv', '.xlsx', '.xlsm'):
+        return jsonify({'success': False, 'message': 'Unsupported file type, expected .csv or .xlsx'}), 400
+    # The worker reads the file from disk, so it must share this folder
+    folder = app.config.get('JOB_UPLOAD_FOLDER') or os.path.join(app.instance_path, 'uploads')
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, f'{uuid.uuid4().hex}{extension}')
+    upload.save(path)
+    job = enqueue('import_data', {'kind': kind, 'path': path, 'filename': upload.filename})
+    status_url = url_for('api_job', job_id=job.id)
+    response = jsonify({'success': True, 'job': job.to_dict(), 'statusUrl': status_url})
+    response.headers['Location'] = status_url
+    return response, 202
+
+@app.route('/api/jobs/<int:job_id>')
+def api_job(job_id):
+    """Status, progress and result of a background job"""
+    job = db.session.get(Job, job_id)
+    if job is None:
+        return jsonify({'success': False, 'message': 'Job not found'}), 404
+    return jsonify({'success': True, 'job': job.to_dict()})
+
+@app.route('/debug/profile')
+def debug_profile():
+    """Slowest recent requests; enabled with GEARGUARD_PROFILE_PAGE=1"""
+    if not app.config.get('PROFILE_DEBUG_PAGE'):
+        abort(404)
+    profiles = slowest_requests.snapshot()
+    if request.args.get('format') == 'json':
+        return jsonify({'requests': profiles})
+    return render_template('debug_profile.html', profiles=profiles)
+
+@app.route('/api/export/<kind>')
+@read_replica
+def api_export(kind):
+    """Stream every request or equipment row for bulk pulls.
+    
+    ?format=ndjson (default) or json; ?since=<ISO datetime> only returns rows
+    updated at or after that time (for requests, also those whose overdue
+    flag changed since).
+    """
+    model = EXPORTS.get(kind)
+    if model is None:
+        return jsonify({'success': False, 'message': f'Unknown export: {kind}'}), 404
+    
+    since = None
+    since_str = request.args.get('since')
+    if since_str:
+        try:
+            since = datetime.fromisoformat(since_str)
+        except ValueError:
+            return jsonify({'success': False, 'message': "Invalid 'since', expected an ISO datetime"}), 400
+    
+    query = export_query(model, since)
+    if request.args.get('format') == 'json':
+        body = stream_json_array(query, kind)
+        mimetype = 'application/json'
+    else:
+        body = stream_ndjson(query)
+        mimetype = 'application/x-ndjson'
+    return Response(stream_with_context(body), mimetype=mimetype)
+
+@app.route('/api/stream/requests')
+def api_stream_requests():
+    """Server-Sent Events feed of request created/updated/moved/deleted events"""
+    last_event_id = request.headers.get('Last-Event-ID', type=int)
+    return Response(event_stream(last_event_id), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
 @app.route('/api/requests', methods=['POST'])
+@retry_on_lock
 def api_create_request():
     """Create a new maintenance request from calendar"""
     data = request.get_json(silent=True) or {}
@@ -822,9 +1264,6 @@ def api_create_request():
         if not title:
             return jsonify({'success': False, 'message': 'Title is required'}), 400
         
-        if not technician_id:
-            return jsonify({'success': False, 'message': 'Technician is required'}), 400
-        
         # Parse dates
         from datetime import datetime as dt
         scheduled_date = dt.strptime(scheduled_date_str, '%Y-%m-%d').date() if scheduled_date_str else None
@@ -837,6 +1276,12 @@ def api_create_request():
             if eq and eq.maintenance_team_id:
                 team_id = eq.maintenance_team_id
         
+        # Auto-assign the least-loaded technician of that team if none was picked
+        if not technician_id:
+            technician_id = pick_technician(team_id, scheduled_date or due_date)
+            if not technician_id:
+                return jsonify({'success': False, 'message': 'No active technician available to assign'}), 400
+        
         # Create request
         new_request = Request(
             title=title,
@@ -862,6 +1307,8 @@ def api_create_request():
             'request': new_request.to_dict()
         })
     except Exception as e:
+        if is_transient_error(e):
+            raise  # retried by @retry_on_lock
         print(f"Error creating request: {e}")
         db.session.rollback()
         return jsonify({'success': False, 'message': str(e)}), 500
@@ -0,0 +1,211 @@
+"""
+Route benchmarks against generated datasets, with regression thresholds
+
+    python benchmark.py                          # 1k, 10k and 100k requests
+    python benchmark.py --sizes 1000 --save-baseline
+    python benchmark.py --latency-threshold 0.5  # fail if p95 grows by more than 50%
+
+Each dataset size runs in its own process against a cached SQLite file in
+instance/benchmarks/ (built with generate_data.py on first use). For every
+route the Flask test client records latency percentiles, the number of SQL
+statements per request and the peak Python memory of one request. Results
+are compared with the JSON baseline and the exit status is 1 if any route
+regressed past a threshold.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATASET_DIR = os.path.join(BASE_DIR, 'instance', 'benchmarks')
+DEFAULT_BASELINE = os.path.join(BASE_DIR, 'benchmarks', 'baseline.json')
+DEFAULT_SIZES = [1000, 10000, 100000]
+
+
+def routes():
+    """Benchmarked URLs by name, as the pages and the calendar request them"""
+    month = date.today().replace(day=1)
+    return {
+        'dashboard': '/',
+        'requests': '/requests',
+        'equipment': '/equipment',
+        'kanban': '/kanban',
+        'api_requests': '/api/requests',
+        'api_requests_month': f'/api/requests?start={month}&end={month + timedelta(days=41)}',
+        'api_equipment': '/api/equipment',
+    }
+
+
+def dataset_shape(size):
+    """Row counts for a dataset with size requests"""
+    members = max(20, size // 100)
+    return {
+        'teams': max(5, members // 25),
+        'members': members,
+        'equipment': max(50, size // 10),
+        'requests': size,
+    }
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def measure(iterations, warmup):
+    """Run every route in this process; the app is bound by DATABASE_URL"""
+    from sqlalchemy import event
+    from app import app, db
+
+    statements = []
+    with app.app_context():
+        @event.listens_for(db.engine, 'before_cursor_execute')
+        def count_statement(*args):
+            statements.append(1)
+
+    client = app.test_client()
+    results = {}
+    for name, url in routes().items():
+        for _ in range(warmup):
+            client.get(url)
+        timings = []
+        counts = []
+        for _ in range(iterations):
+            statements.clear()
+            started = time.perf_counter()
+            response = client.get(url)
+            timings.append((time.perf_counter() - started) * 1000)
+            counts.append(len(statements))
+            if response.status_code != 200:
+                raise SystemExit(f"{url} returned {response.status_code}")
+        # Memory is sampled separately, tracemalloc slows everything down
+        tracemalloc.start()
+        client.get(url)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        results[name] = {
+            'p50_ms': round(percentile(timings, 0.50), 2),
+            'p95_ms': round(percentile(timings, 0.95), 2),
+            'p99_ms': round(percentile(timings, 0.99), 2),
+            'statements': max(counts),
+            'peak_kb': round(peak / 1024, 1),
+        }
+    return results
+
+
+def prepare_dataset(size):
+    """Path of the cached dataset for size, generating it if needed"""
+    os.makedirs(DATASET_DIR, exist_ok=True)
+    path = os.path.join(DATASET_DIR, f'requests_{size}.db')
+    if not os.path.exists(path):
+        env = dict(os.environ, DATABASE_URL=f'sqlite:///{path}')
+        shape = dataset_shape(size)
+        subprocess.run([sys.executable, '-m', 'flask', '--app', 'app', 'db', 'upgrade'],
+                       cwd=BASE_DIR, env=env, check=True, capture_output=True)
+        subprocess.run([sys.executable, 'generate_data.py', '--seed', '1', '--years', '3']
+                       + [f'--{key}={value}' for key, value in shape.items()],
+                       cwd=BASE_DIR, env=env, check=True, stdout=subprocess.DEVNULL)
+    return path
+
+
+def run_size(size, iterations, warmup):
+    """Benchmark one dataset size in a child process bound to its database"""
+    path = prepare_dataset(size)
+    env = dict(os.environ, DATABASE_URL=f'sqlite:///{path}')
+    with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as f:
+        output = f.name
+    try:
+        subprocess.run([sys.executable, __file__, '--worker', output,
+                        '--iterations', str(iterations), '--warmup', str(warmup)],
+                       cwd=BASE_DIR, env=env, check=True)
+        with open(output) as f:
+            return json.load(f)
+    finally:
+        os.remove(output)
+
+
+def compare(results, baseline, latency_threshold, latency_slack_ms, memory_threshold, statement_threshold):
+    """Regression messages for results against baseline"""
+    regressions = []
+    for size, routes_measured in results.items():
+        for name, current in routes_measured.items():
+            previous = baseline.get(size, {}).get(name)
+            if not previous:
+                continue
+            if current['p95_ms'] > previous['p95_ms'] * (1 + latency_threshold) + latency_slack_ms:
+                regressions.append(f"{size} {name}: p95 {previous['p95_ms']}ms -> {current['p95_ms']}ms")
+            if current['statements'] > previous['statements'] + statement_threshold:
+                regressions.append(f"{size} {name}: statements {previous['statements']} -> {current['statements']}")
+            if current['peak_kb'] > previous['peak_kb'] * (1 + memory_threshold):
+                regressions.append(f"{size} {name}: peak memory {previous['peak_kb']}KB -> {current['peak_kb']}KB")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default=','.join(map(str, DEFAULT_SIZES)),
+                        help='comma separated request counts')
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--warmup', type=int, default=2)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help='write the results as the new baseline')
+    parser.add_argument('--output', help='also write the results to this JSON file')
+    parser.add_argument('--latency-threshold', type=float, default=0.25, help='allowed relative p95 growth')
+    parser.add_argument('--latency-slack-ms', type=float, default=5.0,
+                        help='absolute p95 growth always allowed, absorbs timer noise on fast routes')
+    parser.add_argument('--memory-threshold', type=float, default=0.25, help='allowed relative peak memory growth')
+    parser.add_argument('--statement-threshold', type=int, default=0, help='allowed extra SQL statements')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        results = measure(args.iterations, args.warmup)
+        with open(args.worker, 'w') as f:
+            json.dump(results, f)
+        return
+
+    results = {}
+    for size in [int(s) for s in args.sizes.split(',') if s]:
+        print(f"Benchmarking {size} requests...")
+        results[str(size)] = run_size(size, args.iterations, args.warmup)
+        for name, r in results[str(size)].items():
+            print(f"  {name:20} p50 {r['p50_ms']:>9}ms  p95 {r['p95_ms']:>9}ms  p99 {r['p99_ms']:>9}ms"
+                  f"  {r['statements']:>3} stmts  {r['peak_kb']:>9}KB")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        baseline.update(results)
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    if not baseline:
+        print("No baseline yet, run with --save-baseline to create one")
+        return
+    regressions = compare(results, baseline, args.latency_threshold, args.latency_slack_ms,
+                          args.memory_threshold, args.statement_threshold)
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    if regressions:
+        sys.exit(1)
+    print("No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+import csv
+import io
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import islice
+
+from sqlalchemy import insert, select
+
+from extensions import db
+from models import Team, TeamMember, Equipment
+from dashboard_stats import record_bulk_inserts
+from employee_codes import allocate_employee_codes
+from validators import is_valid_email, is_valid_phone
+
+# Rows validated and inserted per transaction
+IMPORT_BATCH_SIZE = 500
+# Per-row errors kept in the report; the count covers all of them
+MAX_REPORTED_ERRORS = 1000
+
+
+class ImportFileError(ValueError):
+    pass
+
+
+@dataclass
+class ImportReport:
+    rows: int = 0
+    created: int = 0
+    error_count: int = 0
+    errors: list = field(default_factory=list)
+
+    def add_error(self, row_number, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': row_number, 'message': message})
+
+    def to_dict(self):
+        return {
+            'rows': self.rows,
+            'created': self.created,
+            'error_count': self.error_count,
+            'errors': self.errors,
+        }
+
+
+def _normalize(header):
+    return (header or '').strip().lower().replace(' ', '_')
+
+
+def _csv_rows(stream):
+    reader = csv.reader(io.TextIOWrapper(stream, encoding='utf-8-sig', newline=''))
+    header = next(reader, None)
+    if not header:
+        raise ImportFileError('The file is empty')
+    columns = [_normalize(h) for h in header]
+    for values in reader:
+        if any(v.strip() for v in values):
+            yield dict(zip(columns, (v.strip() for v in values)))
+
+
+def _xlsx_rows(stream):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ImportFileError('Excel import needs the openpyxl package; upload a CSV instead')
+    # read_only mode streams rows instead of loading the whole sheet
+    sheet = load_workbook(stream, read_only=True, data_only=True).active
+    rows = sheet.iter_rows(values_only=True)
+    header = next(rows, None)
+    if not header:
+        raise ImportFileError('The file is empty')
+    columns = [_normalize(str(h) if h is not None else '') for h in header]
+    for values in rows:
+        cells = ['' if v is None else (v.date().isoformat() if isinstance(v, datetime) else str(v).strip())
+                 for v in values]
+        if any(cells):
+            yield dict(zip(columns, cells))
+
+
+def read_rows(stream, filename):
+    """Yield one dict per data row, keyed by normalized header, from CSV or .xlsx"""
+    extension = os.path.splitext(filename or '')[1].lower()
+    if extension == '.csv':
+        return _csv_rows(stream)
+    if extension in ('.xlsx', '.xlsm'):
+        return _xlsx_rows(stream)
+    raise ImportFileError('Unsupported file type, expected .csv or .xlsx')
+
+
+def _parse_date(value):
+    return datetime.strptime(value, '%Y-%m-%d').date() if value else None
+
+
+class _Importer:
+    """Validate rows against key sets preloaded once, then insert in chunks"""
+    model = None
+
+    def __init__(self):
+        teams = db.session.execute(select(Team.id, Team.name)).all()
+        self.team_ids = {team.id for team in teams}
+        self.team_names = {team.name.lower(): team.id for team in teams}
+
+    def resolve_team(self, value):
+        if not value:
+            return None
+        if value.isdigit() and int(value) in self.team_ids:
+            return int(value)
+        team_id = self.team_names.get(value.lower())
+        if team_id is None:
+            raise ValueError(f'Team "{value}" does not exist.')
+        return team_id
+
+    def insert(self, values):
+        db.session.execute(insert(self.model), values)
+        record_bulk_inserts(db.session.connection(), self.model, values)
+
+
+class MemberImporter(_Importer):
+    """Columns: name, email, team (id or name), phone, position, joining_date, status"""
+    model = TeamMember
+
+    def __init__(self):
+        super().__init__()
+        existing = db.session.execute(select(TeamMember.name, TeamMember.email, TeamMember.phone)).all()
+        self.names = {m.name for m in existing}
+        self.emails = {m.email for m in existing}
+        self.phones = {m.phone for m in existing if m.phone}
+
+    def validate(self, row):
+        """Row values ready to insert; raises ValueError with the form's messages"""
+        name = row.get('name', '')
+        email = row.get('email', '')
+        phone = row.get('phone', '')
+        errors = []
+        if not name:
+            errors.append('Name is required.')
+        elif name in self.names:
+            errors.append('A member with the same name already exists.')
+        if not email:
+            errors.append('Email is required.')
+        elif not is_valid_email(email):
+            errors.append('Enter a valid email address.')
+        elif email in self.emails:
+            errors.append('Email already exists. Please use a unique email.')
+        if phone and not is_valid_phone(phone):
+            errors.append('Phone number must be exactly 10 digits.')
+        elif phone and phone in self.phones:
+            errors.append('Phone number already exists. Please use a unique phone number.')
+        team_value = row.get('team') or row.get('team_id', '')
+        try:
+            team_id = self.resolve_team(team_value)
+            if team_id is None:
+                errors.append('Team selection is required.')
+        except ValueError as e:
+            errors.append(str(e))
+        try:
+            joining_date = _parse_date(row.get('joining_date'))
+        except ValueError:
+            errors.append('joining_date must be YYYY-MM-DD.')
+        if errors:
+            raise ValueError(' '.join(errors))
+
+        # Later rows of the same file must not repeat these either
+        self.names.add(name)
+        self.emails.add(email)
+        if phone:
+            self.phones.add(phone)
+        return {
+            'name': name,
+            'email': email,
+            'phone': phone or None,
+            'position': row.get('position') or None,
+            'team_id': team_id,
+            'status': row.get('status') or 'active',
+            'joining_date': joining_date,
+        }
+
+    def insert(self, values):
+        for row, code in zip(values, allocate_employee_codes(len(values))):
+            row['employee_id'] = code
+        super().insert(values)
+
+
+class EquipmentImporter(_Importer):
+    """Columns: name, category, company, location, maintenance_team (id or name),
+    employee (employee code), assigned_date, scrap_date, used_in_location,
+    work_center, description"""
+    model = Equipment
+
+    def __init__(self):
+        super().__init__()
+        self.names = set(db.session.execute(select(Equipment.name)).scalars())
+        self.employee_codes = dict(db.session.execute(
+            select(TeamMember.employee_id, TeamMember.id).where(TeamMember.employee_id.isnot(None))
+        ).all())
+
+    def validate(self, row):
+        """Row values ready to insert; raises ValueError with the form's messages"""
+        name = row.get('name', '')
+        errors = []
+        if not name:
+            errors.append('Equipment name is required.')
+        elif name in self.names:
+            errors.append('Equipment with this name already exists.')
+        try:
+            team_id = self.resolve_team(row.get('maintenance_team') or row.get('maintenance_team_id', ''))
+        except ValueError as e:
+            errors.append(str(e))
+        employee_code = row.get('employee', '')
+        employee_id = self.employee_codes.get(employee_code) if employee_code else None
+        if employee_code and employee_id is None:
+            errors.append(f'Employee "{employee_code}" does not exist.')
+        try:
+            assigned_date = _parse_date(row.get('assigned_date'))
+            scrap_date = _parse_date(row.get('scrap_date'))
+        except ValueError:
+            errors.append('Dates must be YYYY-MM-DD.')
+        if errors:
+            raise ValueError(' '.join(errors))
+
+        self.names.add(name)
+        return {
+            'name': name,
+            'category': row.get('category', ''),
+            'company': row.get('company', ''),
+            'location': row.get('location') or None,
+            'description': row.get('description', ''),
+            'maintenance_team_id': team_id,
+            'employee_id': employee_id,
+            'assigned_date': assigned_date,
+            'scrap_date': scrap_date,
+            'used_in_location': row.get('used_in_location', ''),
+            'work_center': row.get('work_center', ''),
+            'status': 'active',
+        }
+
+
+IMPORTERS = {
+    'members': MemberImporter,
+    'equipment': EquipmentImporter,
+}
+
+
+def import_rows(kind, rows, batch_size=IMPORT_BATCH_SIZE, on_progress=None):
+    """Validate and insert rows of the given kind, one transaction per batch.
+
+    Invalid rows are skipped and reported by their line number in the file
+    (the header is line 1); valid rows of a batch are inserted together.
+    on_progress(report) is called after every committed batch.
+    """
+    importer = IMPORTERS[kind]()
+    report = ImportReport()
+    numbered = enumerate(rows, start=2)
+    while True:
+        batch = list(islice(numbered, batch_size))
+        if not batch:
+            break
+        values, valid_rows = [], []
+        for row_number, row in batch:
+            try:
+                values.append(importer.validate(row))
+                valid_rows.append(row_number)
+            except ValueError as e:
+                report.add_error(row_number, str(e))
+        report.rows += len(batch)
+        if values:
+            try:
+                importer.insert(values)
+                db.session.commit()
+                report.created += len(values)
+            except Exception as e:
+                db.session.rollback()
+                print(f"Error importing {kind} rows {batch[0][0]}-{batch[-1][0]}: {e}")
+                for row_number in valid_rows:
+                    report.add_error(row_number, 'Batch could not be saved.')
+        if on_progress:
+            on_progress(report)
+    return report
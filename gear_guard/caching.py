@@ -0,0 +1,135 @@
+import hashlib
+import os
+from datetime import date
+from functools import wraps
+
+from flask import current_app, request
+from sqlalchemy import event, func, select
+
+from counters import bump
+from extensions import db
+from models import Equipment, Request, TableVersion, Team, TeamMember
+
+# Fingerprinted static assets never change under the same URL
+STATIC_MAX_AGE = 365 * 24 * 3600
+
+_static_versions = {}
+
+
+def static_version(filename):
+    """Short content hash of a static file, recomputed when its mtime changes"""
+    path = os.path.join(current_app.static_folder, filename)
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        return None
+    cached = _static_versions.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with open(path, 'rb') as f:
+        version = hashlib.md5(f.read()).hexdigest()[:10]
+    _static_versions[path] = (mtime, version)
+    return version
+
+
+def fingerprint_static_urls(endpoint, values):
+    """url_for('static', filename=...) gains ?v=<content hash>"""
+    if endpoint == 'static' and 'filename' in values and 'v' not in values:
+        version = static_version(values['filename'])
+        if version:
+            values['v'] = version
+
+
+def apply_cache_policy(response):
+    """Cache-Control for static files, and a default for everything else"""
+    if request.endpoint == 'static':
+        if request.args.get('v'):
+            response.cache_control.no_cache = None
+            response.cache_control.public = True
+            response.cache_control.max_age = STATIC_MAX_AGE
+            response.cache_control.immutable = True
+        else:
+            # Unversioned URL: revalidate with the ETag Flask already sends
+            response.cache_control.no_cache = True
+        return response
+    if 'Cache-Control' not in response.headers:
+        # Pages carry flash messages and session state
+        response.cache_control.no_store = True
+        response.cache_control.private = True
+    return response
+
+
+# Tables whose deletes bump their table_version row
+VERSIONED_MODELS = (Team, TeamMember, Equipment, Request)
+version_table = TableVersion.__table__
+
+
+def record_deletes(connection, models):
+    """Bump the table_version row of each model's table.
+
+    Deleting rows can leave max(updated_at) unchanged, so the validators
+    read this version instead of counting the table. ORM deletes bump it
+    through the after_delete events below; bulk deletes call it directly.
+    """
+    for model in models:
+        bump(connection, version_table, {'table_name': model.__table__.name}, {'version': 1})
+
+
+def _on_delete(mapper, connection, target):
+    record_deletes(connection, [mapper.class_])
+
+
+for model in VERSIONED_MODELS:
+    event.listen(model, 'after_delete', _on_delete)
+
+
+def validator_columns(models):
+    """Scalar subqueries of table_validators, each an index or primary key lookup"""
+    columns = []
+    for model in models:
+        columns.append(select(func.max(model.updated_at)).scalar_subquery())
+        columns.append(select(version_table.c.version)
+                       .where(version_table.c.table_name == model.__table__.name).scalar_subquery())
+        if model is Request:
+            columns.append(select(func.max(Request.overdue_changed_at)).scalar_subquery())
+    return columns
+
+
+def table_validators(models):
+    """(max updated_at, delete version) for each table, in one round trip.
+
+    Requests add max(overdue_changed_at): the overdue sweep flips flags
+    without touching updated_at.
+    """
+    return tuple(db.session.execute(select(*validator_columns(models))).one())
+
+
+def conditional_get(*models):
+    """Weak ETag for a GET view derived from the tables it reads.
+
+    The delete versions catch deletes that leave max(updated_at) unchanged,
+    and the current date is mixed in because serialized overdue flags change
+    at midnight. A matching If-None-Match short-circuits with 304 before the
+    view runs, so nothing is serialized. No Last-Modified is sent: a date
+    alone cannot tell that rows were deleted.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            validators = table_validators(models)
+            fingerprint = repr((request.full_path, date.today().isoformat(), validators))
+            etag = hashlib.md5(fingerprint.encode()).hexdigest()
+
+            if request.if_none_match.contains_weak(etag):
+                response = current_app.response_class(status=304)
+            else:
+                response = current_app.make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag, weak=True)
+            response.cache_control.private = True
+            response.cache_control.no_cache = True
+            return response
+        return decorated_function
+    return decorator
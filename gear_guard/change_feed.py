@@ -0,0 +1,143 @@
+import itertools
+import json
+import queue
+import threading
+from collections import deque
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from models import Request
+
+# Columns published with every request event (a subset of Request.to_dict())
+FEED_FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'status': 'status',
+    'type': 'type',
+    'priority': 'priority',
+    'dueDate': 'due_date',
+    'scheduledDate': 'scheduled_date',
+    'technicianId': 'technician_id',
+    'teamId': 'team_id',
+    'equipmentId': 'equipment_id',
+    'isOverdue': 'overdue',
+    'overdueChangedAt': 'overdue_changed_at',
+    'updatedAt': 'updated_at',
+}
+
+HEARTBEAT_SECONDS = 15
+
+
+class LocalBroker:
+    """In-process pub/sub fan-out for a single node.
+
+    Every subscriber gets its own bounded queue; a subscriber that falls too
+    far behind is dropped and has to reconnect (and replay from its last id).
+    Recent events are kept for replay via Last-Event-ID.
+    """
+
+    def __init__(self, history=500, queue_size=1000):
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._subscribers = set()
+        self._history = deque(maxlen=history)
+        self._queue_size = queue_size
+
+    def publish(self, kind, payload):
+        with self._lock:
+            item = (next(self._ids), kind, payload)
+            self._history.append(item)
+            subscribers = list(self._subscribers)
+        for q in subscribers:
+            try:
+                q.put_nowait(item)
+            except queue.Full:
+                # Too slow: drop its backlog and tell the stream to close
+                self.unsubscribe(q)
+                with q.mutex:
+                    q.queue.clear()
+                q.put_nowait(None)
+
+    def subscribe(self, last_event_id=None):
+        q = queue.Queue(maxsize=self._queue_size)
+        with self._lock:
+            if last_event_id is not None:
+                for item in self._history:
+                    if item[0] > last_event_id:
+                        q.put_nowait(item)
+            self._subscribers.add(q)
+        return q
+
+    def unsubscribe(self, q):
+        with self._lock:
+            self._subscribers.discard(q)
+
+
+broker = LocalBroker()
+
+
+def set_broker(new_broker):
+    """Swap in another broker exposing publish/subscribe/unsubscribe"""
+    global broker
+    broker = new_broker
+
+
+def serialize_request(values):
+    payload = {}
+    for key, value in values.items():
+        payload[key] = value.isoformat() if hasattr(value, 'isoformat') else value
+    return payload
+
+
+def request_payload(obj):
+    return serialize_request({key: getattr(obj, attr) for key, attr in FEED_FIELDS.items()})
+
+
+def queue_change(session, kind, payload):
+    """Publish an event once the session's transaction commits"""
+    session.info.setdefault('request_changes', []).append((kind, payload))
+
+
+@event.listens_for(Session, 'after_flush')
+def _capture_request_changes(session, flush_context):
+    for obj in session.new:
+        if isinstance(obj, Request):
+            queue_change(session, 'created', request_payload(obj))
+    for obj in session.dirty:
+        if isinstance(obj, Request) and session.is_modified(obj, include_collections=False):
+            moved = inspect(obj).attrs.status.history.has_changes()
+            queue_change(session, 'moved' if moved else 'updated', request_payload(obj))
+    for obj in session.deleted:
+        if isinstance(obj, Request):
+            queue_change(session, 'deleted', {'id': obj.id})
+
+
+@event.listens_for(Session, 'after_commit')
+def _publish_request_changes(session):
+    for kind, payload in session.info.pop('request_changes', []):
+        broker.publish(kind, payload)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_request_changes(session):
+    session.info.pop('request_changes', None)
+
+
+def event_stream(last_event_id=None):
+    """Server-Sent Events for request changes, with periodic heartbeats"""
+    q = broker.subscribe(last_event_id)
+    try:
+        yield 'retry: 3000\n\n'
+        while True:
+            try:
+                item = q.get(timeout=HEARTBEAT_SECONDS)
+            except queue.Empty:
+                yield ': heartbeat\n\n'
+                continue
+            if item is None:
+                return
+            event_id, kind, payload = item
+            yield f'id: {event_id}\nevent: {kind}\ndata: {json.dumps(payload)}\n\n'
+    finally:
+        broker.unsubscribe(q)
@@ -0,0 +1,80 @@
+from datetime import date
+
+from sqlalchemy import event
+
+from extensions import db
+
+# Delta maintenance shared by the materialized tables: dashboard_counter
+# (dashboard_stats.py), technician_load (workload.py) and reliability_rollup
+# (reliability.py). Each registers the attributes it depends on with
+# track_changes() and applies the old and new values of every flushed row
+# to its table with bump().
+
+# Stored in date key columns instead of NULL: a unique index never sees two
+# NULLs as duplicates, so NULL keys could not be upserted
+NO_DATE = date(1970, 1, 1)
+
+
+def tracked_values(target, attributes, old=False):
+    """{attribute: value} of target; with old, the values before its pending changes"""
+    values = {}
+    for name in attributes:
+        value = getattr(target, name)
+        if old:
+            history = db.inspect(target).attrs[name].history
+            if history.deleted:
+                value = history.deleted[0]
+        values[name] = value
+    return values
+
+
+def _load_previous_value(target, value, oldvalue, initiator):
+    pass
+
+
+def track_changes(model, attributes, on_change, events=('insert', 'update', 'delete')):
+    """Call on_change(connection, target, old_values, new_values) for every flushed change of model.
+
+    Values are dicts of attributes; old_values is None for an insert and
+    new_values None for a delete. Updates that leave attributes unchanged
+    are skipped.
+    """
+    def after_insert(mapper, connection, target):
+        on_change(connection, target, None, tracked_values(target, attributes))
+
+    def after_update(mapper, connection, target):
+        old_values = tracked_values(target, attributes, old=True)
+        new_values = tracked_values(target, attributes)
+        if old_values != new_values:
+            on_change(connection, target, old_values, new_values)
+
+    def after_delete(mapper, connection, target):
+        on_change(connection, target, tracked_values(target, attributes, old=True), None)
+
+    handlers = {'insert': after_insert, 'update': after_update, 'delete': after_delete}
+    for name in events:
+        event.listen(model, f'after_{name}', handlers[name])
+    # active_history makes the old value available even if it was expired
+    for attribute in attributes:
+        event.listen(getattr(model, attribute), 'set', _load_previous_value, active_history=True)
+
+
+def bump(connection, table, key, deltas):
+    """Add deltas ({column: amount}) to the row of table matching key ({column: value}).
+
+    The row is created with deltas as its values if it does not exist yet,
+    in one INSERT ... ON CONFLICT DO UPDATE: two transactions creating the
+    same row cannot both insert it. key must be the columns of a unique
+    index of table, none of them NULL.
+    """
+    if not any(deltas.values()):
+        return
+    if connection.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    statement = insert(table).values(**key, **deltas)
+    connection.execute(statement.on_conflict_do_update(
+        index_elements=list(key),
+        set_={name: table.c[name] + statement.excluded[name] for name in deltas},
+    ))
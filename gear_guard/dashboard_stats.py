@@ -0,0 +1,343 @@
+from collections import Counter
+from dataclasses import dataclass, asdict
+from datetime import date
+
+from sqlalchemy import and_, case, func, or_, select, true
+
+from counters import NO_DATE, bump, track_changes
+from extensions import db
+from models import Team, TeamMember, Equipment, Request, DashboardCounter
+
+# Status groups used by the dashboard counters
+OPEN_STATUSES = ['NEW_REQUEST', 'IN_PROGRESS']
+CRITICAL_EQUIPMENT_STATUSES = ['critical', 'maintenance', 'under_repair']
+
+
+@dataclass(frozen=True)
+class DashboardStats:
+    """Snapshot of every counter shown on the dashboard"""
+    total_teams: int = 0
+    total_members: int = 0
+    active_members: int = 0
+    total_equipment: int = 0
+    critical_equipment: int = 0
+    available_equipment: int = 0
+    in_use_equipment: int = 0
+    pending_requests: int = 0
+    corrective_requests: int = 0
+    preventive_requests: int = 0
+    overdue_requests: int = 0
+
+    @property
+    def tech_load(self):
+        """Pending requests per active member, as a capped percentage"""
+        if self.active_members <= 0:
+            return 0
+        return min(int((self.pending_requests / self.active_members) * 100), 100)
+
+    def to_dict(self):
+        data = asdict(self)
+        data['tech_load'] = self.tech_load
+        return data
+
+
+def _count_if(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def compute_dashboard_stats(today=None):
+    """Compute all dashboard counters in a single round trip.
+
+    Each table is scanned once with conditional aggregation and the
+    per-table aggregates are cross joined into one result row.
+    """
+    today = today or date.today()
+
+    teams = select(func.count(Team.id).label('total_teams')).subquery()
+    members = select(
+        func.count(TeamMember.id).label('total_members'),
+        _count_if(TeamMember.status == 'active').label('active_members'),
+    ).subquery()
+    equipment = select(
+        func.count(Equipment.id).label('total_equipment'),
+        _count_if(Equipment.status.in_(CRITICAL_EQUIPMENT_STATUSES)).label('critical_equipment'),
+        _count_if(Equipment.status == 'available').label('available_equipment'),
+        _count_if(Equipment.status == 'in_use').label('in_use_equipment'),
+    ).subquery()
+    requests = select(
+        _count_if(Request.status == 'NEW_REQUEST').label('pending_requests'),
+        _count_if(Request.type == 'CORRECTIVE').label('corrective_requests'),
+        _count_if(Request.type == 'PREVENTIVE').label('preventive_requests'),
+        _count_if((Request.due_date < today) & Request.status.in_(OPEN_STATUSES)).label('overdue_requests'),
+    ).subquery()
+
+    stmt = select(teams, members, equipment, requests).select_from(
+        teams.join(members, true()).join(equipment, true()).join(requests, true())
+    )
+    row = db.session.execute(stmt).mappings().one()
+    return DashboardStats(**{key: int(value or 0) for key, value in row.items()})
+
+
+# ---------------------------------------------------------------------------
+# Materialized counters
+#
+# Requests are counted per (status, type, priority, team). Open requests are
+# additionally bucketed by due date so the overdue count can be maintained
+# without rescanning: buckets older than the last rollover date are folded
+# into a single 'request_overdue' row once per day.
+# ---------------------------------------------------------------------------
+
+KEY_COLUMNS = ('status', 'type', 'priority', 'team_id', 'bucket_date')
+# Stored for key columns a counter does not use or a request leaves empty
+KEY_DEFAULTS = {'status': '', 'type': '', 'priority': '', 'team_id': 0, 'bucket_date': NO_DATE}
+counter_table = DashboardCounter.__table__
+
+
+def _stored_key(kind, key):
+    """Full counter key, with KEY_DEFAULTS for missing or None values"""
+    stored = {'kind': kind}
+    for column in KEY_COLUMNS:
+        value = key.get(column)
+        stored[column] = KEY_DEFAULTS[column] if value is None else value
+    return stored
+
+
+def _bump(connection, kind, delta, **key):
+    bump(connection, counter_table, _stored_key(kind, key), {'count': delta})
+
+
+def _rollover_date(connection=None):
+    """Date of the last rollover, or None if counters were never built.
+
+    Without a connection the SELECT goes through db.session, which routes
+    it like the view's other reads (to the replica under @read_replica).
+    """
+    return (connection or db.session).execute(
+        select(counter_table.c.bucket_date).where(counter_table.c.kind == 'rollover')
+    ).scalar()
+
+
+def _request_contributions(values, rollover_date):
+    """Counter keys a single request row contributes to"""
+    keys = [('request', {
+        'status': values['status'],
+        'type': values['type'],
+        'priority': values['priority'],
+        'team_id': values['team_id'],
+    })]
+    due_date = values['due_date']
+    if due_date and values['status'] in OPEN_STATUSES:
+        if due_date < rollover_date:
+            keys.append(('request_overdue', {}))
+        else:
+            keys.append(('request_due', {'bucket_date': due_date}))
+    return keys
+
+
+# Attributes whose previous value is needed to move a row between counters
+TRACKED_ATTRIBUTES = {
+    Request: ('status', 'type', 'priority', 'team_id', 'due_date'),
+    Equipment: ('status',),
+    TeamMember: ('status',),
+}
+
+
+def _apply(connection, target, values, delta):
+    if isinstance(target, Request):
+        rollover_date = _rollover_date(connection)
+        if rollover_date is None:
+            return
+        for kind, key in _request_contributions(values, rollover_date):
+            _bump(connection, kind, delta, **key)
+    elif isinstance(target, Equipment):
+        if _rollover_date(connection) is not None:
+            _bump(connection, 'equipment', delta, status=values['status'])
+    elif isinstance(target, TeamMember):
+        if _rollover_date(connection) is not None:
+            _bump(connection, 'member', delta, status=values['status'])
+
+
+def _on_change(connection, target, old_values, new_values):
+    if old_values:
+        _apply(connection, target, old_values, -1)
+    if new_values:
+        _apply(connection, target, new_values, 1)
+
+
+def record_request_changes(connection, changes):
+    """Adjust counters for request rows changed outside the ORM unit of work.
+
+    changes is an iterable of (old_values, new_values) dicts keyed by the
+    tracked Request attributes, with None for the missing side of an insert
+    or delete; deltas are summed so each counter row is touched once.
+    """
+    rollover_date = _rollover_date(connection)
+    if rollover_date is None:
+        return
+    deltas = Counter()
+    for old_values, new_values in changes:
+        if old_values:
+            for kind, key in _request_contributions(old_values, rollover_date):
+                deltas[(kind, tuple(sorted(key.items())))] -= 1
+        if new_values:
+            for kind, key in _request_contributions(new_values, rollover_date):
+                deltas[(kind, tuple(sorted(key.items())))] += 1
+    for (kind, key), delta in deltas.items():
+        _bump(connection, kind, delta, **dict(key))
+
+
+# Counter kind for models counted by status only
+STATUS_COUNTER_KINDS = {
+    Equipment: 'equipment',
+    TeamMember: 'member',
+}
+
+
+def record_bulk_inserts(connection, model, rows):
+    """Adjust counters for equipment or member rows inserted in bulk.
+
+    Bulk INSERTs skip the mapper events, so the caller reports the inserted
+    values (dicts with a status key) here, in the same transaction.
+    """
+    if _rollover_date(connection) is None:
+        return
+    for status, delta in Counter(row['status'] for row in rows).items():
+        _bump(connection, STATUS_COUNTER_KINDS[model], delta, status=status)
+
+
+for model, attributes in TRACKED_ATTRIBUTES.items():
+    track_changes(model, attributes, _on_change)
+
+
+def rebuild_dashboard_counters(today=None):
+    """Recompute every materialized counter from the source tables"""
+    today = today or date.today()
+    rows = []
+
+    request_groups = db.session.query(
+        Request.status, Request.type, Request.priority, Request.team_id, func.count(Request.id)
+    ).group_by(Request.status, Request.type, Request.priority, Request.team_id)
+    for status, type_, priority, team_id, count in request_groups:
+        rows.append({'kind': 'request', 'status': status, 'type': type_,
+                     'priority': priority, 'team_id': team_id, 'count': count})
+
+    due_groups = db.session.query(Request.due_date, func.count(Request.id)).filter(
+        Request.status.in_(OPEN_STATUSES),
+        Request.due_date.isnot(None)
+    ).group_by(Request.due_date)
+    overdue = 0
+    for due_date, count in due_groups:
+        if due_date < today:
+            overdue += count
+        else:
+            rows.append({'kind': 'request_due', 'bucket_date': due_date, 'count': count})
+    rows.append({'kind': 'request_overdue', 'count': overdue})
+
+    for model, kind in ((Equipment, 'equipment'), (TeamMember, 'member')):
+        for status, count in db.session.query(model.status, func.count(model.id)).group_by(model.status):
+            rows.append({'kind': kind, 'status': status, 'count': count})
+
+    rows.append({'kind': 'rollover', 'bucket_date': today, 'count': 0})
+
+    db.session.execute(counter_table.delete())
+    db.session.execute(counter_table.insert(), [dict(_stored_key(row['kind'], row), count=row['count'])
+                                                for row in rows])
+    db.session.commit()
+    return len(rows)
+
+
+def rollover_dashboard_counters(today=None):
+    """Fold due-date buckets that are now in the past into the overdue count.
+
+    Reads never need this (see get_dashboard_stats); it keeps the bucket
+    rows few. Runs as the periodic rollover_dashboard_counters job or
+    'flask rollover-counters', always on the primary database. Returns
+    False if the counters have not been built yet.
+    """
+    today = today or date.today()
+    with db.engine.begin() as connection:
+        last_rollover = _rollover_date(connection)
+        if last_rollover is None:
+            return False
+        if last_rollover >= today:
+            return True
+
+        # Claim the rollover so concurrent workers do not fold the same buckets twice
+        claimed = connection.execute(
+            counter_table.update()
+            .where(counter_table.c.kind == 'rollover', counter_table.c.bucket_date == last_rollover)
+            .values(bucket_date=today)
+        ).rowcount
+        if not claimed:
+            return True
+
+        # The deleted rows' counts, including bumps committed while the DELETE waited for them
+        expired = (counter_table.c.kind == 'request_due') & (counter_table.c.bucket_date < today)
+        newly_overdue = sum(connection.execute(
+            counter_table.delete().where(expired).returning(counter_table.c['count'])
+        ).scalars())
+        _bump(connection, 'request_overdue', newly_overdue)
+    return True
+
+
+def request_counter_groups(**values):
+    """(status, type, priority, team_id, count) rows of the request counters.
+
+    values narrows any of those columns to a list of allowed values, e.g.
+    status=['NEW_REQUEST']. Returns None if the counters have not been built.
+    """
+    if _rollover_date() is None:
+        return None
+    names = ('status', 'type', 'priority', 'team_id')
+    query = select(*[counter_table.c[name] for name in names], counter_table.c['count']).where(
+        counter_table.c.kind == 'request', counter_table.c['count'] != 0)
+    for name, allowed in values.items():
+        if allowed:
+            query = query.where(counter_table.c[name].in_(allowed))
+    return [(*[None if value == KEY_DEFAULTS[name] else value for name, value in zip(names, row)], row[-1])
+            for row in db.session.execute(query)]
+
+
+def get_dashboard_stats(today=None):
+    """Read the dashboard snapshot from the materialized counters.
+
+    Read-only, so it can run on a replica: due-date buckets that passed
+    since the last rollover are counted as overdue here. Falls back to the
+    aggregated query if the counters were never built.
+    """
+    today = today or date.today()
+    if _rollover_date() is None:
+        return compute_dashboard_stats(today)
+
+    totals = Counter()
+    counters = db.session.query(
+        DashboardCounter.kind, DashboardCounter.status, DashboardCounter.type, DashboardCounter.count
+    ).filter(or_(
+        DashboardCounter.kind.in_(['request', 'request_overdue', 'equipment', 'member']),
+        and_(DashboardCounter.kind == 'request_due', DashboardCounter.bucket_date < today),
+    ))
+    for kind, status, type_, count in counters:
+        if kind == 'request':
+            if status == 'NEW_REQUEST':
+                totals['pending_requests'] += count
+            if type_ == 'CORRECTIVE':
+                totals['corrective_requests'] += count
+            elif type_ == 'PREVENTIVE':
+                totals['preventive_requests'] += count
+        elif kind in ('request_overdue', 'request_due'):
+            totals['overdue_requests'] += count
+        elif kind == 'equipment':
+            totals['total_equipment'] += count
+            if status in CRITICAL_EQUIPMENT_STATUSES:
+                totals['critical_equipment'] += count
+            elif status == 'available':
+                totals['available_equipment'] += count
+            elif status == 'in_use':
+                totals['in_use_equipment'] += count
+        elif kind == 'member':
+            totals['total_members'] += count
+            if status == 'active':
+                totals['active_members'] += count
+
+    totals['total_teams'] = db.session.query(func.count(Team.id)).scalar()
+    return DashboardStats(**totals)
@@ -0,0 +1,104 @@
+import random
+import sqlite3
+import time
+from functools import wraps
+
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.url import make_url
+from sqlalchemy.exc import OperationalError, DBAPIError
+
+from extensions import db
+
+# PRAGMAs applied to every new SQLite connection, filled by configure_engine()
+_sqlite_pragmas = []
+
+# SQLSTATEs worth retrying on PostgreSQL: serialization failure, deadlock, lock timeout
+TRANSIENT_SQLSTATES = {'40001', '40P01', '55P03'}
+
+
+@event.listens_for(Engine, 'connect')
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    for pragma in _sqlite_pragmas:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def engine_options(config):
+    """SQLALCHEMY_ENGINE_OPTIONS for the configured database URI"""
+    url = make_url(config['SQLALCHEMY_DATABASE_URI'])
+    if url.get_backend_name() == 'sqlite':
+        # The driver-level timeout is the busy handler for the first statement
+        return {'connect_args': {'timeout': config['SQLITE_BUSY_TIMEOUT_MS'] / 1000}}
+    return {
+        'pool_size': config['DB_POOL_SIZE'],
+        'max_overflow': config['DB_MAX_OVERFLOW'],
+        'pool_timeout': config['DB_POOL_TIMEOUT'],
+        'pool_recycle': config['DB_POOL_RECYCLE'],
+        'pool_pre_ping': config['DB_POOL_PRE_PING'],
+    }
+
+
+def configure_engine(app):
+    """Set pool options and SQLite PRAGMAs; call before db.init_app(app)"""
+    options = engine_options(app.config)
+    options.update(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+    _sqlite_pragmas[:] = [
+        # WAL lets readers proceed while one writer commits
+        f"PRAGMA journal_mode={app.config['SQLITE_JOURNAL_MODE']}",
+        f"PRAGMA synchronous={app.config['SQLITE_SYNCHRONOUS']}",
+        f"PRAGMA busy_timeout={int(app.config['SQLITE_BUSY_TIMEOUT_MS'])}",
+        # Negative cache_size is in KiB
+        f"PRAGMA cache_size=-{int(app.config['SQLITE_CACHE_SIZE_KB'])}",
+        f"PRAGMA mmap_size={int(app.config['SQLITE_MMAP_SIZE'])}",
+    ]
+
+
+def is_transient_error(exc):
+    """True for lock/serialization errors that succeed when the transaction is retried"""
+    if isinstance(exc, OperationalError) and isinstance(exc.orig, sqlite3.OperationalError):
+        message = str(exc.orig).lower()
+        return 'database is locked' in message or 'database is busy' in message
+    if isinstance(exc, DBAPIError):
+        return getattr(exc.orig, 'pgcode', None) in TRANSIENT_SQLSTATES
+    return False
+
+
+def retry_on_lock(f):
+    """Re-run a write path whose transaction failed on a transient lock error.
+
+    The session is rolled back before each retry, so the wrapped function
+    must redo all of its database work (views and unit-of-work helpers do).
+    Attempts and backoff come from DB_LOCK_RETRIES / DB_LOCK_BACKOFF_MS.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        retries = current_app.config['DB_LOCK_RETRIES']
+        backoff = current_app.config['DB_LOCK_BACKOFF_MS'] / 1000
+        for attempt in range(retries + 1):
+            try:
+                return f(*args, **kwargs)
+            except DBAPIError as e:
+                if attempt == retries or not is_transient_error(e):
+                    raise
+                db.session.rollback()
+                print(f"Transient database error in {f.__name__}, retrying ({attempt + 1}/{retries}): {e.orig}")
+                # Exponential backoff with jitter so competing workers spread out
+                time.sleep(backoff * (2 ** attempt) * (0.5 + random.random()))
+    return decorated_function
+
+
+def analyze_database():
+    """Refresh the planner statistics (ANALYZE) after bulk loads.
+
+    Without them SQLite assumes every index is selective and may pick a
+    status or type index, then sort most of the table, over walking an
+    index in the requested order.
+    """
+    with db.engine.begin() as connection:
+        connection.exec_driver_sql('ANALYZE')
@@ -0,0 +1,86 @@
+import re
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+
+from extensions import db
+from models import IdSequence, TeamMember
+
+EMPLOYEE_CODE_PREFIX = 'EMP'
+EMPLOYEE_SEQUENCE = 'employee_code'
+
+sequence_table = IdSequence.__table__
+
+
+def format_employee_code(number):
+    return f"{EMPLOYEE_CODE_PREFIX}{number:04d}"
+
+
+def _highest_existing_code():
+    """Largest EMPnnnn number in use; only needed once, to seed the sequence"""
+    codes = db.session.execute(
+        select(TeamMember.employee_id).where(TeamMember.employee_id.like(f'{EMPLOYEE_CODE_PREFIX}%'))
+    ).scalars()
+    numbers = []
+    for code in codes:
+        m = re.fullmatch(rf"{EMPLOYEE_CODE_PREFIX}(\d+)", code.strip())
+        if m:
+            numbers.append(int(m.group(1)))
+    return max(numbers, default=0)
+
+
+def _increment(step):
+    """Atomically bump the sequence row, returning the new value or None if missing"""
+    return db.session.execute(
+        update(sequence_table)
+        .where(sequence_table.c.name == EMPLOYEE_SEQUENCE)
+        .values(value=sequence_table.c.value + step)
+        .returning(sequence_table.c.value)
+    ).scalar()
+
+
+def _take_numbers(count):
+    last = _increment(count)
+    if last is None:
+        # First allocation: seed from the codes already in use
+        try:
+            with db.session.begin_nested():
+                db.session.execute(sequence_table.insert().values(
+                    name=EMPLOYEE_SEQUENCE, value=_highest_existing_code()))
+        except IntegrityError:
+            pass  # seeded concurrently
+        last = _increment(count)
+    return range(last - count + 1, last + 1)
+
+
+def allocate_employee_codes(count):
+    """Take the next count employee codes inside the caller's transaction.
+
+    The UPDATE ... RETURNING holds the sequence row's write lock until the
+    caller commits, so concurrent adds serialize on it instead of racing to
+    the same code; a rolled-back insert gives its numbers back.
+    """
+    codes = []
+    while len(codes) < count:
+        candidates = [format_employee_code(n) for n in _take_numbers(count - len(codes))]
+        # Codes typed in by hand on the edit form may already sit ahead of the sequence
+        taken = set(db.session.execute(
+            select(TeamMember.employee_id).where(TeamMember.employee_id.in_(candidates))
+        ).scalars())
+        codes.extend(code for code in candidates if code not in taken)
+    return codes
+
+
+def allocate_employee_code():
+    """Take the next employee code inside the caller's transaction"""
+    return allocate_employee_codes(1)[0]
+
+
+def preview_employee_code():
+    """The code the next add will most likely get; does not consume a number"""
+    value = db.session.execute(
+        select(sequence_table.c.value).where(sequence_table.c.name == EMPLOYEE_SEQUENCE)
+    ).scalar()
+    if value is None:
+        value = _highest_existing_code()
+    return format_employee_code(value + 1)
@@ -0,0 +1,50 @@
+import json
+
+from sqlalchemy import select, union
+
+from models import Equipment, Request
+from queries import request_query
+
+# Rows fetched from the database cursor per round trip
+EXPORT_BATCH_SIZE = 1000
+
+
+def export_query(model, since=None):
+    """Rows of model ordered by (updated_at, id), optionally from since onwards.
+
+    The since bound is inclusive so rows sharing the boundary timestamp of a
+    previous pull are not missed; consumers should upsert by id. Requests
+    whose overdue flag the sweep changed since then are included too (their
+    overdueChangedAt, not updatedAt, is past since).
+    """
+    query = request_query('serialize') if model is Request else model.query
+    if since:
+        changed = model.updated_at >= since
+        if model is Request:
+            # A union of two index ranges; an OR would walk all of ix_request_updated_at_id
+            changed = Request.id.in_(union(select(Request.id).where(changed),
+                                           select(Request.id).where(Request.overdue_changed_at >= since)))
+        query = query.filter(changed)
+    return query.order_by(model.updated_at, model.id).yield_per(EXPORT_BATCH_SIZE)
+
+
+def stream_ndjson(query):
+    """One JSON document per line"""
+    for row in query:
+        yield json.dumps(row.to_dict()) + '\n'
+
+
+def stream_json_array(query, key):
+    """A single {key: [...]} document, emitted element by element"""
+    yield '{"%s":[' % key
+    first = True
+    for row in query:
+        yield ('' if first else ',') + json.dumps(row.to_dict())
+        first = False
+    yield ']}'
+
+
+EXPORTS = {
+    'requests': Request,
+    'equipment': Equipment,
+}
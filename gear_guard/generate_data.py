@@ -0,0 +1,303 @@
+"""
+Generate a large, realistic GearGuard dataset for load and performance testing
+
+    python generate_data.py --teams 50 --members 2000 --equipment 50000 --requests 1000000 --years 3 --seed 7
+
+Rows are written with bulk INSERTs in chunked transactions and the same seed
+always produces the same data. Existing data is cleared first unless
+--append is given. populate_db.py stays the small hand-written demo dataset.
+"""
+import argparse
+import random
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import delete, func, insert, select
+
+from app import app, db
+from models import (Team, TeamMember, Equipment, Request, MaintenanceHistory, MaintenancePlan, IdSequence,
+                    DashboardCounter, TechnicianLoad, ReliabilityRollup, Job, Notification)
+from dashboard_stats import rebuild_dashboard_counters
+from workload import rebuild_workload_index
+from reliability import rebuild_reliability_rollups
+from overdue import sweep_overdue
+from database import analyze_database
+from caching import VERSIONED_MODELS, record_deletes
+from employee_codes import allocate_employee_codes
+
+# Rows per INSERT ... executemany and per transaction
+CHUNK_SIZE = 10000
+
+DEPARTMENTS = ['Maintenance', 'Facilities', 'Production', 'Utilities', 'Quality']
+COMPANIES = ['Adani', 'Adani Green', 'Adani Ports', 'Adani Power']
+TRADES = ['Electrical', 'Mechanical', 'HVAC', 'Hydraulics', 'Instrumentation', 'Civil', 'IT', 'Safety']
+POSITIONS = [('Technician', 50), ('Senior Technician', 20), ('Mechanic', 15), ('Lead Mechanic', 5),
+             ('Specialist', 7), ('Supervisor', 3)]
+FIRST_NAMES = ['Rajesh', 'Priya', 'Amit', 'Sunita', 'Mohammed', 'Anita', 'Vikram', 'Neha', 'Suresh', 'Kavita',
+               'Arjun', 'Pooja', 'Rahul', 'Deepa', 'Sanjay', 'Meera', 'Imran', 'Lakshmi', 'Karan', 'Farah']
+LAST_NAMES = ['Kumar', 'Sharma', 'Patel', 'Verma', 'Ali', 'Singh', 'Gupta', 'Reddy', 'Nair', 'Iyer',
+              'Joshi', 'Mehta', 'Khan', 'Das', 'Rao', 'Bose', 'Shah', 'Menon', 'Pillai', 'Chopra']
+MEMBER_STATUSES = [('active', 92), ('on-leave', 5), ('inactive', 3)]
+
+CATEGORIES = [('Manufacturing', 30), ('Electrical', 20), ('HVAC', 15), ('Vehicles', 10), ('IT', 10),
+              ('Hydraulics', 10), ('Safety', 5)]
+EQUIPMENT_STATUSES = [('in_use', 55), ('available', 30), ('maintenance', 8), ('under_repair', 4), ('critical', 3)]
+
+REQUEST_TYPES = [('PREVENTIVE', 60), ('CORRECTIVE', 40)]
+PRIORITIES = [('LOW', 25), ('MEDIUM', 45), ('HIGH', 22), ('URGENT', 8)]
+# Status by request age: recent requests are mostly open, old ones closed
+RECENT_STATUSES = [('NEW_REQUEST', 45), ('IN_PROGRESS', 35), ('UNDER_REVIEW', 10), ('COMPLETED', 8), ('CANCELLED', 2)]
+OLD_STATUSES = [('COMPLETED', 88), ('CANCELLED', 7), ('IN_PROGRESS', 3), ('NEW_REQUEST', 2)]
+RECENT_DAYS = 30
+# Request descriptions: "<symptom> on <component>", enough vocabulary for search benchmarks
+SYMPTOMS = ['Oil leak', 'Abnormal vibration', 'Overheating', 'Bearing noise', 'Pressure drop', 'Belt slipping',
+            'Intermittent fault', 'Corrosion', 'Calibration drift', 'Seal failure', 'Tripped breaker',
+            'Low flow', 'Worn coupling', 'Sensor error', 'Filter clogged', 'Loose wiring']
+COMPONENTS = ['drive motor', 'gearbox', 'hydraulic pump', 'compressor', 'conveyor belt', 'control panel',
+              'cooling fan', 'spindle', 'valve actuator', 'heat exchanger', 'PLC module', 'air handler',
+              'transformer', 'chiller', 'forklift mast', 'UPS battery']
+# History action recorded when a request is completed, by request type
+HISTORY_ACTIONS = {
+    'CORRECTIVE': [('REPAIR', 80), ('REPLACEMENT', 20)],
+    'PREVENTIVE': [('INSPECTION', 75), ('CALIBRATION', 25)],
+}
+
+
+def weighted(rng, choices):
+    values, weights = zip(*choices)
+    return rng.choices(values, weights)[0]
+
+
+def insert_chunked(model, rows, label):
+    """Bulk insert an iterable of dicts, committing every CHUNK_SIZE rows"""
+    table = model.__table__
+    total = 0
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == CHUNK_SIZE:
+            db.session.execute(insert(table), chunk)
+            db.session.commit()
+            total += len(chunk)
+            chunk = []
+            print(f"  {label}: {total}")
+    if chunk:
+        db.session.execute(insert(table), chunk)
+        db.session.commit()
+        total += len(chunk)
+    print(f"  {label}: {total} done")
+    return total
+
+
+def clear_data():
+    """Delete everything but the user accounts, referencing tables first"""
+    for model in (Notification, MaintenanceHistory, Request, MaintenancePlan, Equipment, TechnicianLoad,
+                  TeamMember, Team, IdSequence, DashboardCounter, ReliabilityRollup, Job):
+        db.session.execute(delete(model.__table__))
+    record_deletes(db.session.connection(), VERSIONED_MODELS)
+    db.session.commit()
+
+
+def next_id(model):
+    return (db.session.execute(select(func.max(model.id))).scalar() or 0) + 1
+
+
+def team_rows(rng, first_id, count):
+    for team_id in range(first_id, first_id + count):
+        trade = TRADES[team_id % len(TRADES)]
+        yield {
+            'id': team_id,
+            'name': f"{trade} Team {team_id}",
+            'description': f"{trade} maintenance crew",
+            'department': rng.choice(DEPARTMENTS),
+            'company': rng.choice(COMPANIES),
+        }
+
+
+def member_rows(rng, first_id, team_ids, codes):
+    for offset, code in enumerate(codes):
+        member_id = first_id + offset
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        yield {
+            'id': member_id,
+            'name': f"{first} {last} {member_id}",
+            'email': f"{first.lower()}.{last.lower()}.{member_id}@example.com",
+            'phone': f"{9000000000 + member_id}",
+            'position': weighted(rng, POSITIONS),
+            'team_id': rng.choice(team_ids),
+            'employee_id': code,
+            'status': weighted(rng, MEMBER_STATUSES),
+            'joining_date': date.today() - timedelta(days=rng.randint(30, 3650)),
+        }
+
+
+def equipment_rows(rng, first_id, count, team_ids, members_by_team, start):
+    span = (date.today() - start).days
+    for equipment_id in range(first_id, first_id + count):
+        category = weighted(rng, CATEGORIES)
+        team_id = rng.choice(team_ids)
+        crew = members_by_team.get(team_id) or [None]
+        status = weighted(rng, EQUIPMENT_STATUSES)
+        yield {
+            'id': equipment_id,
+            'name': f"{category} Asset #{equipment_id}",
+            'category': category,
+            'location': f"Site {rng.randint(1, 12)} / Bay {rng.randint(1, 40)}",
+            'status': status,
+            'company': rng.choice(COMPANIES),
+            'maintenance_team_id': team_id,
+            'technician_id': rng.choice(crew),
+            'employee_id': rng.choice(crew),
+            'assigned_date': start + timedelta(days=rng.randint(0, max(span, 0))),
+            'work_center': f"Line {rng.randint(1, 30)}",
+            'description': f"{category} equipment",
+        }
+
+
+def request_rows(rng, count, equipment, members_by_team, start):
+    """Requests spread over [start, today], growing towards the present.
+
+    A few assets account for most of the breakdowns: picking index
+    n * random()**3 skews corrective requests towards low equipment ids.
+    """
+    now = datetime.utcnow()
+    span_seconds = int((now - datetime.combine(start, datetime.min.time())).total_seconds())
+    today = now.date()
+    for _ in range(count):
+        request_type = weighted(rng, REQUEST_TYPES)
+        if request_type == 'CORRECTIVE':
+            equipment_id, team_id = equipment[int(len(equipment) * rng.random() ** 3)]
+        else:
+            equipment_id, team_id = rng.choice(equipment)
+        # sqrt skews creation towards recent dates (a growing fleet)
+        created_at = now - timedelta(seconds=int(span_seconds * (1 - rng.random() ** 0.5)))
+        age_days = (now - created_at).days
+        status = weighted(rng, RECENT_STATUSES if age_days <= RECENT_DAYS else OLD_STATUSES)
+        scheduled_date = created_at.date() + timedelta(days=rng.randint(0, 14))
+        due_date = scheduled_date + timedelta(days=rng.randint(1, 10))
+        estimated_hours = round(rng.uniform(0.5, 16), 1)
+        completed_date = None
+        actual_hours = None
+        if status == 'COMPLETED':
+            finished = min(due_date + timedelta(days=rng.randint(-5, 5)), today)
+            completed_date = datetime.combine(max(finished, created_at.date()), datetime.min.time()) \
+                + timedelta(hours=rng.randint(8, 18))
+            actual_hours = round(estimated_hours * rng.uniform(0.6, 1.8), 1)
+        crew = members_by_team.get(team_id)
+        yield {
+            'title': f"{request_type} Maintenance - Asset #{equipment_id}",
+            'description': f"{rng.choice(SYMPTOMS)} on {rng.choice(COMPONENTS)}, "
+                           f"site ticket {rng.randint(1000, 99999)}",
+            'equipment_id': equipment_id,
+            'technician_id': rng.choice(crew) if crew else None,
+            'team_id': team_id,
+            'status': status,
+            'type': request_type,
+            'priority': weighted(rng, PRIORITIES),
+            'due_date': due_date,
+            'scheduled_date': scheduled_date,
+            'completed_date': completed_date,
+            'estimated_hours': estimated_hours,
+            'actual_hours': actual_hours,
+            'created_at': created_at,
+            'updated_at': max(completed_date or created_at, created_at),
+        }
+
+
+def history_rows(rng):
+    """One history row per completed request, read back in id chunks.
+
+    Corrective work takes the equipment down for longer and costs parts on
+    top of labour, which gives the reliability reports something to rank.
+    Requests that already have history (--append) are skipped.
+    """
+    last_id = db.session.execute(select(func.max(MaintenanceHistory.request_id))).scalar() or 0
+    while True:
+        chunk = db.session.execute(
+            select(Request.id, Request.equipment_id, Request.type, Request.technician_id,
+                   Request.completed_date, Request.actual_hours, Request.description)
+            .where(Request.status == 'COMPLETED', Request.id > last_id)
+            .order_by(Request.id).limit(CHUNK_SIZE)
+        ).all()
+        if not chunk:
+            return
+        last_id = chunk[-1].id
+        for request_id, equipment_id, request_type, technician_id, completed_date, hours, description in chunk:
+            action_type = weighted(rng, HISTORY_ACTIONS.get(request_type, HISTORY_ACTIONS['PREVENTIVE']))
+            hours = hours or 1.0
+            corrective = action_type in ('REPAIR', 'REPLACEMENT')
+            parts = round(rng.uniform(50, 5000 if action_type == 'REPLACEMENT' else 800), 2) if corrective else 0
+            yield {
+                'equipment_id': equipment_id,
+                'request_id': request_id,
+                'action_type': action_type,
+                'description': description,
+                'performed_by': technician_id,
+                'performed_date': completed_date,
+                'cost': round(hours * rng.uniform(40, 90) + parts, 2),
+                'downtime_hours': round(hours * rng.uniform(1, 4) if corrective else hours * 0.5, 1),
+                'created_at': completed_date,
+            }
+
+
+def generate(teams, members, equipment, requests, years, seed, append=False):
+    rng = random.Random(seed)
+    start = date.today() - timedelta(days=int(365 * years))
+    started = time.perf_counter()
+    with app.app_context():
+        if not append:
+            print("Clearing existing data...")
+            clear_data()
+
+        first_team = next_id(Team)
+        insert_chunked(Team, team_rows(rng, first_team, teams), 'teams')
+        team_ids = list(db.session.execute(select(Team.id)).scalars())
+
+        # Employee codes come from the same sequence as the add form
+        codes = []
+        while len(codes) < members:
+            codes.extend(allocate_employee_codes(min(CHUNK_SIZE, members - len(codes))))
+        db.session.commit()
+        insert_chunked(TeamMember, member_rows(rng, next_id(TeamMember), team_ids, codes), 'members')
+
+        members_by_team = {}
+        for member_id, team_id in db.session.execute(
+                select(TeamMember.id, TeamMember.team_id).where(TeamMember.status == 'active')):
+            members_by_team.setdefault(team_id, []).append(member_id)
+
+        insert_chunked(Equipment, equipment_rows(rng, next_id(Equipment), equipment, team_ids, members_by_team,
+                                                 start), 'equipment')
+        fleet = db.session.execute(select(Equipment.id, Equipment.maintenance_team_id)
+                                   .order_by(Equipment.id)).all()
+        if requests and not fleet:
+            raise SystemExit("Cannot generate requests without equipment")
+
+        insert_chunked(Request, request_rows(rng, requests, fleet, members_by_team, start), 'requests')
+        insert_chunked(MaintenanceHistory, history_rows(rng), 'history')
+
+        print("Rebuilding dashboard counters, the technician load index and reliability rollups...")
+        rebuild_dashboard_counters()
+        rebuild_workload_index()
+        rebuild_reliability_rollups()
+        # Historical requests are flagged overdue silently, not alerted on
+        sweep_overdue(notify=False)
+        print("Updating planner statistics...")
+        analyze_database()
+    print(f"Done in {time.perf_counter() - started:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--teams', type=int, default=10)
+    parser.add_argument('--members', type=int, default=200)
+    parser.add_argument('--equipment', type=int, default=2000)
+    parser.add_argument('--requests', type=int, default=50000)
+    parser.add_argument('--years', type=float, default=2, help='history length ending today')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--append', action='store_true', help='keep existing data and add to it')
+    args = parser.parse_args()
+    generate(args.teams, args.members, args.equipment, args.requests, args.years, args.seed, args.append)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+import contextvars
+import os
+import random
+import signal
+import socket
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import select, update
+from sqlalchemy.exc import DBAPIError
+
+from database import is_transient_error
+from extensions import db
+from models import Job
+
+# Registered task functions by name, see task()
+TASKS = {}
+# Job statuses; queued and running jobs are still pending
+JOB_STATUSES = ('queued', 'running', 'succeeded', 'failed')
+# Redis list the Redis broker pushes job ids onto
+REDIS_QUEUE_KEY = 'gearguard:jobs'
+
+# Id of the job the current worker thread is running, for report_progress()
+_current_job = contextvars.ContextVar('current_job', default=None)
+
+
+class JobFailed(Exception):
+    """Raised by a task to fail its job without retrying (bad input, not a glitch)"""
+
+
+def task(name, max_attempts=3, every=None):
+    """Register a function as a background task runnable by enqueue(name, ...).
+
+    The function is called with the job payload as keyword arguments inside
+    an app context, and its return value (JSON-serializable) becomes the
+    job result. Tasks that are not safe to run twice use max_attempts=1.
+    every names the config setting with the seconds between runs of a
+    periodic task, which workers then queue by themselves (0 turns it off).
+    """
+    def decorator(f):
+        f.max_attempts = max_attempts
+        f.every = every
+        TASKS[name] = f
+        return f
+    return decorator
+
+
+def enqueue(name, payload=None, delay=0, max_attempts=None):
+    """Queue a task for the worker and return its Job.
+
+    Commits the current session, so the job is visible to workers as soon as
+    the broker wakes them. With JOBS_INLINE the job runs right here instead,
+    which keeps development and tests free of a worker process.
+    """
+    if name not in TASKS:
+        raise ValueError(f'Unknown task: {name}')
+    job = Job(name=name, payload=payload or {}, status='queued',
+              max_attempts=max_attempts or TASKS[name].max_attempts,
+              run_at=datetime.utcnow() + timedelta(seconds=delay))
+    db.session.add(job)
+    db.session.commit()
+    if current_app.config.get('JOBS_INLINE'):
+        worker_id = f'inline:{os.getpid()}'
+        if claim_job(worker_id, job.id):
+            run_job(job.id, worker_id)
+        db.session.refresh(job)
+    else:
+        current_app.extensions['gearguard_jobs'].notify(job.id)
+    return job
+
+
+def report_progress(progress):
+    """Store progress (JSON-serializable) on the running job for /api/jobs/<id>.
+
+    Written on its own connection so it is visible while the task's own
+    transaction is still open; outside a job this does nothing.
+    """
+    job_id = _current_job.get()
+    if job_id is None:
+        return
+    with db.engine.begin() as connection:
+        connection.execute(update(Job).where(Job.id == job_id)
+                           .values(progress=progress, updated_at=datetime.utcnow()))
+
+
+def claim_job(worker_id, job_id=None):
+    """Lock the oldest due job (or the given one) for this worker; its id or None.
+
+    The UPDATE only matches while the job is still queued, so of two workers
+    racing for the same row exactly one wins. PostgreSQL skips rows another
+    worker has locked instead of waiting on them.
+    """
+    now = datetime.utcnow()
+    candidates = select(Job.id).where(Job.status == 'queued')
+    if job_id is None:
+        candidates = candidates.where(Job.run_at <= now).order_by(Job.run_at, Job.id).limit(1)
+    else:
+        candidates = candidates.where(Job.id == job_id)
+    try:
+        with db.engine.begin() as connection:
+            job_id = connection.execute(candidates.with_for_update(skip_locked=True)).scalar()
+            if job_id is None:
+                return None
+            claimed = connection.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.status == 'queued')
+                .values(status='running', locked_by=worker_id, locked_at=now,
+                        attempts=Job.attempts + 1, updated_at=now)
+            ).rowcount
+    except DBAPIError as e:
+        if not is_transient_error(e):
+            raise
+        # Another worker holds the write lock; try again on the next poll
+        return None
+    return job_id if claimed else None
+
+
+def retry_delay(attempts):
+    """Seconds before retrying a job that failed its attempts-th try"""
+    base = current_app.config['JOB_RETRY_BASE_SECONDS']
+    ceiling = current_app.config['JOB_RETRY_MAX_SECONDS']
+    # Exponential backoff with jitter so a failing batch does not retry in lockstep
+    return min(base * 2 ** (attempts - 1), ceiling) * random.uniform(0.8, 1.2)
+
+
+def _finish(job_id, worker_id, **values):
+    now = datetime.utcnow()
+    values.setdefault('finished_at', now)
+    with db.engine.begin() as connection:
+        connection.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == 'running', Job.locked_by == worker_id)
+            .values(locked_by=None, locked_at=None, updated_at=now, **values)
+        )
+
+
+def run_job(job_id, worker_id):
+    """Run a claimed job and record its result, or schedule its retry"""
+    job = db.session.get(Job, job_id, populate_existing=True)
+    name, payload, attempts, max_attempts = job.name, job.payload or {}, job.attempts, job.max_attempts
+    db.session.rollback()
+    token = _current_job.set(job_id)
+    try:
+        f = TASKS.get(name)
+        if f is None:
+            raise JobFailed(f'Unknown task: {name}')
+        result = f(**payload)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        error = str(e) if isinstance(e, JobFailed) else traceback.format_exc()
+        if isinstance(e, JobFailed) or attempts >= max_attempts:
+            print(f"Job {job_id} ({name}) failed after {attempts} attempt(s): {e}")
+            _finish(job_id, worker_id, status='failed', error=error)
+        else:
+            delay = retry_delay(attempts)
+            print(f"Job {job_id} ({name}) failed, retrying in {delay:.0f}s ({attempts}/{max_attempts}): {e}")
+            _finish(job_id, worker_id, status='queued', error=error, finished_at=None,
+                    run_at=datetime.utcnow() + timedelta(seconds=delay))
+    else:
+        _finish(job_id, worker_id, status='succeeded', result=result, error=None)
+    finally:
+        _current_job.reset(token)
+
+
+def requeue_stale_jobs(timeout=None):
+    """Put back jobs whose worker died mid-run; those out of attempts fail instead.
+
+    A job counts as stale once it has been running for longer than timeout
+    seconds (JOB_STALE_SECONDS), so that must exceed the slowest task.
+    """
+    timeout = timeout or current_app.config['JOB_STALE_SECONDS']
+    now = datetime.utcnow()
+    stale = (Job.status == 'running', Job.locked_at < now - timedelta(seconds=timeout))
+    with db.engine.begin() as connection:
+        failed = connection.execute(
+            update(Job).where(*stale, Job.attempts >= Job.max_attempts)
+            .values(status='failed', error='Worker stopped while running the job', locked_by=None,
+                    locked_at=None, finished_at=now, updated_at=now)
+        ).rowcount
+        requeued = connection.execute(
+            update(Job).where(*stale)
+            .values(status='queued', run_at=now, locked_by=None, locked_at=None, updated_at=now)
+        ).rowcount
+    return requeued, failed
+
+
+def enqueue_scheduled_tasks():
+    """Queue every periodic task that is due; returns their names.
+
+    The job table is the schedule: a task is due once none of its jobs is
+    pending and the newest was created more than its interval ago, so all
+    workers share one schedule and it survives restarts.
+    """
+    now = datetime.utcnow()
+    queued = []
+    for name, f in TASKS.items():
+        seconds = current_app.config.get(f.every) if f.every else None
+        if not seconds:
+            continue
+        last = db.session.execute(
+            select(Job.status, Job.created_at).where(Job.name == name).order_by(Job.id.desc()).limit(1)
+        ).first()
+        if last and (last.status in ('queued', 'running') or last.created_at > now - timedelta(seconds=seconds)):
+            continue
+        enqueue(name)
+        queued.append(name)
+    return queued
+
+
+class DatabaseBroker:
+    """Workers find jobs by polling the job table; nothing to notify"""
+
+    def __init__(self, url=None):
+        pass
+
+    def notify(self, job_id):
+        pass
+
+    def wait(self, timeout):
+        time.sleep(timeout)
+
+
+class RedisBroker:
+    """Wakes an idle worker through a Redis list as soon as a job is queued.
+
+    The job table stays the source of truth: a lost or duplicate wake-up only
+    means a worker claims on its next poll, or finds nothing to claim.
+    """
+
+    def __init__(self, url):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError('JOB_BROKER_URL points at Redis, which needs the redis package')
+        self.client = redis.Redis.from_url(url)
+
+    def notify(self, job_id):
+        try:
+            self.client.lpush(REDIS_QUEUE_KEY, job_id)
+        except Exception as e:
+            # The job is committed either way; workers still find it by polling
+            print(f"Could not notify the job broker: {e}")
+
+    def wait(self, timeout):
+        try:
+            self.client.brpop(REDIS_QUEUE_KEY, timeout=max(int(timeout), 1))
+        except Exception as e:
+            print(f"Job broker unavailable, polling instead: {e}")
+            time.sleep(timeout)
+
+
+# Broker classes by JOB_BROKER_URL scheme
+BROKERS = {
+    'redis': RedisBroker,
+    'rediss': RedisBroker,
+}
+
+
+def make_broker(url):
+    if not url:
+        return DatabaseBroker()
+    scheme = url.split(':', 1)[0]
+    if scheme not in BROKERS:
+        raise RuntimeError(f'Unsupported JOB_BROKER_URL scheme: {scheme}')
+    return BROKERS[scheme](url)
+
+
+def init_jobs(app):
+    """Set up the job broker from JOB_BROKER_URL; call after db.init_app(app)"""
+    app.extensions['gearguard_jobs'] = make_broker(app.config.get('JOB_BROKER_URL'))
+
+
+def run_worker(app, threads=None, poll_interval=None, burst=False):
+    """Claim and run jobs on a thread pool until SIGINT/SIGTERM.
+
+    Jobs already running when the signal arrives are finished first. With
+    burst the worker exits once no job is due, which suits cron and tests.
+    Periodic tasks are queued on start and checked about once a minute.
+    """
+    threads = threads or app.config['JOB_WORKER_THREADS']
+    poll_interval = poll_interval or app.config['JOB_POLL_SECONDS']
+    broker = app.extensions['gearguard_jobs']
+    worker_id = f'{socket.gethostname()}:{os.getpid()}'
+    stopping = threading.Event()
+    slots = threading.Semaphore(threads)
+
+    def stop(signum, frame):
+        print("Stopping the worker after the running jobs finish")
+        stopping.set()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, stop)
+
+    def work(job_id):
+        try:
+            with app.app_context():
+                run_job(job_id, worker_id)
+        finally:
+            slots.release()
+
+    with app.app_context():
+        requeued, failed = requeue_stale_jobs()
+        enqueue_scheduled_tasks()
+    if requeued or failed:
+        print(f"Requeued {requeued} stale jobs, failed {failed}")
+    last_sweep = time.monotonic()
+    with ThreadPoolExecutor(max_workers=threads, thread_name_prefix='job') as pool:
+        while not stopping.is_set():
+            if time.monotonic() - last_sweep > poll_interval * 60:
+                with app.app_context():
+                    requeue_stale_jobs()
+                    enqueue_scheduled_tasks()
+                last_sweep = time.monotonic()
+            # Only claim a job once a thread is free to run it
+            if not slots.acquire(timeout=poll_interval):
+                continue
+            with app.app_context():
+                job_id = claim_job(worker_id)
+            if job_id is not None:
+                pool.submit(work, job_id)
+                continue
+            slots.release()
+            if burst:
+                break
+            broker.wait(poll_interval)
+    print("Worker stopped")
@@ -0,0 +1,142 @@
+from collections import defaultdict
+from datetime import date, datetime
+
+from sqlalchemy import and_, case, func, or_, select, update
+
+from extensions import db
+from models import CLOSED_STATUSES, Request
+from dashboard_stats import TRACKED_ATTRIBUTES, record_request_changes
+from workload import WORKLOAD_ATTRIBUTES, record_workload_changes
+from change_feed import queue_change
+from overdue import raise_overdue_alerts
+
+MAX_BATCH_SIZE = 500
+# Columns read before a move so counters and the load index can be adjusted
+MOVE_ATTRIBUTES = tuple(dict.fromkeys(TRACKED_ATTRIBUTES[Request] + WORKLOAD_ATTRIBUTES))
+
+
+class InvalidMoves(ValueError):
+    pass
+
+
+def parse_moves(data):
+    """Validate a batch payload; later moves of the same task win"""
+    moves = data.get('moves') if isinstance(data, dict) else None
+    if not isinstance(moves, list) or not moves:
+        raise InvalidMoves('Expected a non-empty "moves" list')
+    if len(moves) > MAX_BATCH_SIZE:
+        raise InvalidMoves(f'At most {MAX_BATCH_SIZE} moves per batch')
+
+    parsed = {}
+    for move in moves:
+        if not isinstance(move, dict):
+            raise InvalidMoves('Each move must be an object')
+        try:
+            task_id = int(move.get('taskId'))
+        except (TypeError, ValueError):
+            raise InvalidMoves('Each move needs an integer taskId')
+        new_status = move.get('newStatus')
+        if not new_status or not isinstance(new_status, str) or len(new_status) > 20:
+            raise InvalidMoves(f'Invalid newStatus for task {task_id}')
+        expected = move.get('expectedUpdatedAt')
+        if expected:
+            try:
+                expected = datetime.fromisoformat(expected)
+            except (TypeError, ValueError):
+                raise InvalidMoves(f'Invalid expectedUpdatedAt for task {task_id}')
+        parsed[task_id] = (new_status, expected)
+    return parsed
+
+
+def apply_moves(moves):
+    """Apply {task_id: (new_status, expected_updated_at)} in one transaction.
+
+    A move conflicts when the row's updated_at differs from the expected
+    value the client last saw. Accepted moves are written with one
+    UPDATE ... WHERE id IN (...) per target status, guarded by each row's
+    checked updated_at, so a row changed by someone else after the version
+    check is not overwritten.
+    Returns one result dict per task. Lock errors propagate so the calling
+    view's @retry_on_lock can re-run the whole batch.
+    """
+    columns = [getattr(Request, name) for name in MOVE_ATTRIBUTES]
+    rows = db.session.execute(
+        select(Request.id, Request.updated_at, Request.overdue, *columns).where(Request.id.in_(list(moves)))
+    ).all()
+    current = {row.id: row for row in rows}
+
+    results = {}
+    by_status = defaultdict(list)
+    for task_id, (new_status, expected) in moves.items():
+        row = current.get(task_id)
+        if row is None:
+            results[task_id] = {'taskId': task_id, 'result': 'not_found'}
+        elif expected and row.updated_at != expected:
+            results[task_id] = _conflict(task_id, row)
+        else:
+            by_status[new_status].append(row)
+
+    now = datetime.utcnow()
+    today = date.today()
+    connection = db.session.connection()
+    for new_status, group in by_status.items():
+        versions = {row.id: row.updated_at for row in group if row.updated_at is not None}
+        unversioned = [row.id for row in group if row.updated_at is None]
+        # updated_at = CASE id WHEN ... END keeps the per-row version check
+        # in one statement driven by the primary key
+        version_check = Request.updated_at == case(versions, value=Request.id) if versions else False
+        connection.execute(
+            update(Request)
+            .where(
+                Request.id.in_([row.id for row in group]),
+                or_(version_check, and_(Request.id.in_(unversioned), Request.updated_at.is_(None))),
+            )
+            .values(status=new_status, updated_at=now,
+                    # Closing a request clears its overdue flag and reopening one
+                    # recomputes it from the due date, as the ORM does (overdue.py)
+                    overdue=False if new_status in CLOSED_STATUSES
+                    else func.coalesce(Request.due_date < today, False))
+        )
+
+    # Rows that changed between the version check and the UPDATE were skipped
+    moved_ids = [row.id for group in by_status.values() for row in group]
+    applied = {}
+    if moved_ids:
+        applied = dict(db.session.execute(
+            select(Request.id, Request.overdue).where(Request.id.in_(moved_ids), Request.updated_at == now)
+        ).all())
+
+    changes = []
+    for new_status, group in by_status.items():
+        for row in group:
+            if row.id in applied:
+                old_values = {name: getattr(row, name) for name in MOVE_ATTRIBUTES}
+                changes.append((old_values, dict(old_values, status=new_status)))
+                results[row.id] = {'taskId': row.id, 'result': 'ok', 'status': new_status,
+                                   'updatedAt': now.isoformat()}
+                queue_change(db.session, 'moved', {'id': row.id, 'status': new_status,
+                                                   'isOverdue': applied[row.id],
+                                                   'updatedAt': now.isoformat()})
+    record_request_changes(connection, changes)
+    record_workload_changes(connection, changes)
+    raise_overdue_alerts(connection, [row.id for row in current.values()
+                                      if applied.get(row.id) and not row.overdue])
+    db.session.commit()
+
+    # Report the winning state for anything that lost a race
+    lost = [row.id for row in current.values() if row.id not in applied and row.id not in results]
+    if lost:
+        for row in db.session.execute(
+            select(Request.id, Request.status, Request.updated_at).where(Request.id.in_(lost))
+        ):
+            results[row.id] = _conflict(row.id, row)
+    return [results[task_id] for task_id in moves if task_id in results]
+
+
+def _conflict(task_id, row):
+    return {
+        'taskId': task_id,
+        'result': 'conflict',
+        'status': row.status,
+        'updatedAt': row.updated_at.isoformat() if row.updated_at else None,
+    }
@@ -0,0 +1,234 @@
+import calendar
+import math
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import or_, select, update
+
+from extensions import db
+from models import REQUEST_PRIORITIES, Equipment, MaintenancePlan, Request, TeamMember
+from dashboard_stats import TRACKED_ATTRIBUTES, record_request_changes
+from workload import WORKLOAD_ATTRIBUTES, record_workload_changes
+
+PLAN_RULES = ('interval', 'weekly', 'monthly', 'usage')
+DEFAULT_HORIZON_DAYS = 365
+# Largest accepted plan values
+MAX_INTERVAL = 3650
+MAX_DUE_AFTER_DAYS = 365
+MAX_ESTIMATED_HOURS = 1000
+# Plans expanded, inserted and committed together
+PLAN_BATCH_SIZE = 2000
+
+request_table = Request.__table__
+
+
+class InvalidPlan(ValueError):
+    pass
+
+
+def _step_days(plan):
+    if plan.rule == 'usage':
+        # No meter readings are stored, so usage plans run on the expected daily usage
+        return max(1, round(plan.interval / plan.daily_usage_hours))
+    if plan.rule == 'weekly':
+        return 7 * plan.interval
+    return plan.interval
+
+
+def _add_months(day, months, day_of_month):
+    month_index = day.month - 1 + months
+    year, month = day.year + month_index // 12, month_index % 12 + 1
+    return date(year, month, min(day_of_month, calendar.monthrange(year, month)[1]))
+
+
+def plan_occurrences(plan, first, last):
+    """Scheduled dates of plan between first and last (inclusive)"""
+    first = max(first, plan.start_date)
+    if plan.end_date:
+        last = min(last, plan.end_date)
+    if first > last:
+        return
+    if plan.rule == 'monthly':
+        day_of_month = plan.day_of_month or plan.start_date.day
+        months = 0
+        occurrence = _add_months(plan.start_date, 0, day_of_month)
+        while occurrence <= last:
+            if occurrence >= first:
+                yield occurrence
+            months += plan.interval
+            occurrence = _add_months(plan.start_date, months, day_of_month)
+        return
+    anchor = plan.start_date
+    if plan.rule == 'weekly':
+        anchor += timedelta(days=(plan.weekday - anchor.weekday()) % 7)
+    step = _step_days(plan)
+    # Jump straight to the first occurrence on or after first
+    skipped = max(0, -(-(first - anchor).days // step))
+    occurrence = anchor + timedelta(days=skipped * step)
+    while occurrence <= last:
+        yield occurrence
+        occurrence += timedelta(days=step)
+
+
+def _number(data, name, parse, default=None, low=None, high=None):
+    """data[name] as an int or float within [low, high], default if missing; raises InvalidPlan"""
+    value = data.get(name)
+    if value is None or value == '':
+        return default
+    try:
+        # bool is an int, and int() truncates 2.5; neither is a valid count
+        if isinstance(value, bool) or (parse is int and isinstance(value, float) and not value.is_integer()):
+            raise ValueError
+        value = parse(value)
+        if not math.isfinite(value):
+            raise ValueError
+    except (TypeError, ValueError):
+        raise InvalidPlan(f"{name} must be {'a whole number' if parse is int else 'a number'}")
+    if (low is not None and value < low) or (high is not None and value > high):
+        raise InvalidPlan(f"{name} must be between {low} and {high}" if high is not None
+                          else f"{name} must be at least {low}")
+    return value
+
+
+def _date(data, name, default=None):
+    value = data.get(name)
+    if not value:
+        return default
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        raise InvalidPlan(f'{name} must be a date (YYYY-MM-DD)')
+
+
+def _text(data, name, max_length=None):
+    value = data.get(name)
+    if value is None:
+        return None
+    if not isinstance(value, str):
+        raise InvalidPlan(f'{name} must be text')
+    value = value.strip()
+    if max_length and len(value) > max_length:
+        raise InvalidPlan(f'{name} must be at most {max_length} characters')
+    return value or None
+
+
+def validate_plan(data):
+    """MaintenancePlan column values from a JSON payload; raises InvalidPlan"""
+    rule = data.get('rule', 'interval')
+    if rule not in PLAN_RULES:
+        raise InvalidPlan(f"rule must be one of {', '.join(PLAN_RULES)}")
+    start_date = _date(data, 'start_date', date.today())
+    end_date = _date(data, 'end_date')
+    if end_date and end_date < start_date:
+        raise InvalidPlan('end_date must not be before start_date')
+    priority = data.get('priority') or 'MEDIUM'
+    if priority not in REQUEST_PRIORITIES:
+        raise InvalidPlan(f"priority must be one of {', '.join(REQUEST_PRIORITIES)}")
+    technician_id = _number(data, 'technician_id', int, low=1)
+    if technician_id is not None and db.session.get(TeamMember, technician_id) is None:
+        raise InvalidPlan(f'technician_id {technician_id} is not a team member')
+    values = {
+        'rule': rule,
+        'interval': _number(data, 'interval', int, default=1, low=1, high=MAX_INTERVAL),
+        'start_date': start_date,
+        'end_date': end_date,
+        'title': _text(data, 'title', max_length=100),
+        'description': _text(data, 'description'),
+        'priority': priority,
+        'estimated_hours': _number(data, 'estimated_hours', float, low=0, high=MAX_ESTIMATED_HOURS),
+        'due_after_days': _number(data, 'due_after_days', int, default=7, low=0, high=MAX_DUE_AFTER_DAYS),
+        'technician_id': technician_id,
+    }
+    if rule == 'weekly':
+        values['weekday'] = _number(data, 'weekday', int, default=start_date.weekday(), low=0, high=6)
+    if rule == 'monthly':
+        values['day_of_month'] = _number(data, 'day_of_month', int, default=start_date.day, low=1, high=31)
+    if rule == 'usage':
+        values['daily_usage_hours'] = _number(data, 'daily_usage_hours', float, low=0, high=24)
+        if not values['daily_usage_hours'] or values['daily_usage_hours'] <= 0:
+            raise InvalidPlan('usage plans need daily_usage_hours > 0')
+    return values
+
+
+def _insert_ignoring_duplicates(connection):
+    """INSERT that skips rows already generated for the same plan occurrence"""
+    if connection.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(request_table).on_conflict_do_nothing(
+        index_elements=['equipment_id', 'plan_id', 'scheduled_date'])
+
+
+def _plan_rows(plan, first, last, now):
+    title = plan.title or f"PREVENTIVE Maintenance - {plan.equipment_name}"
+    for scheduled_date in plan_occurrences(plan, first, last):
+        yield {
+            'title': title[:100],
+            'description': plan.description,
+            'equipment_id': plan.equipment_id,
+            'technician_id': plan.technician_id or plan.equipment_technician_id,
+            'team_id': plan.maintenance_team_id,
+            'status': 'NEW_REQUEST',
+            'type': 'PREVENTIVE',
+            'priority': plan.priority or 'MEDIUM',
+            'scheduled_date': scheduled_date,
+            'due_date': scheduled_date + timedelta(days=plan.due_after_days or 0),
+            'estimated_hours': plan.estimated_hours,
+            'plan_id': plan.id,
+            'created_at': now,
+            'updated_at': now,
+        }
+
+
+def generate_plan_requests(horizon_days=DEFAULT_HORIZON_DAYS, today=None, plan_ids=None):
+    """Expand active plans into NEW_REQUEST rows up to today + horizon_days.
+
+    Each plan continues from its generated_until date, and the unique
+    (equipment_id, plan_id, scheduled_date) index makes re-runs insert
+    nothing twice even if a previous run stopped half way. Plans are
+    handled in batches: one multi-row INSERT ... ON CONFLICT DO NOTHING
+    and one commit per batch. Returns the number of requests created.
+    """
+    today = today or date.today()
+    end = today + timedelta(days=horizon_days)
+    query = (
+        select(MaintenancePlan.id, MaintenancePlan.equipment_id, MaintenancePlan.title,
+               MaintenancePlan.description, MaintenancePlan.rule, MaintenancePlan.interval,
+               MaintenancePlan.weekday, MaintenancePlan.day_of_month, MaintenancePlan.daily_usage_hours,
+               MaintenancePlan.start_date, MaintenancePlan.end_date, MaintenancePlan.priority,
+               MaintenancePlan.estimated_hours, MaintenancePlan.due_after_days,
+               MaintenancePlan.technician_id, MaintenancePlan.generated_until,
+               Equipment.name.label('equipment_name'), Equipment.maintenance_team_id,
+               Equipment.technician_id.label('equipment_technician_id'))
+        .join(Equipment, Equipment.id == MaintenancePlan.equipment_id)
+        .where(MaintenancePlan.active.is_(True),
+               or_(MaintenancePlan.generated_until.is_(None), MaintenancePlan.generated_until < end))
+        .order_by(MaintenancePlan.id)
+    )
+    if plan_ids is not None:
+        query = query.where(MaintenancePlan.id.in_(plan_ids))
+    plans = db.session.execute(query).all()
+
+    tracked = [request_table.c[name] for name in dict.fromkeys(TRACKED_ATTRIBUTES[Request] + WORKLOAD_ATTRIBUTES)]
+    now = datetime.utcnow()
+    created = 0
+    for offset in range(0, len(plans), PLAN_BATCH_SIZE):
+        batch = plans[offset:offset + PLAN_BATCH_SIZE]
+        rows = []
+        for plan in batch:
+            first = plan.generated_until + timedelta(days=1) if plan.generated_until else today
+            rows.extend(_plan_rows(plan, max(first, today), end, now))
+        connection = db.session.connection()
+        if rows:
+            inserted = connection.execute(_insert_ignoring_duplicates(connection).returning(*tracked), rows).all()
+            changes = [(None, row._asdict()) for row in inserted]
+            record_request_changes(connection, changes)
+            record_workload_changes(connection, changes)
+            created += len(inserted)
+        connection.execute(
+            update(MaintenancePlan.__table__)
+            .where(MaintenancePlan.id.in_([plan.id for plan in batch]))
+            .values(generated_until=end)
+        )
+        db.session.commit()
+    return created
@@ -0,0 +1,112 @@
+"""full text search
+
+Revision ID: 15df61acc269
+Revises: d7f61dbc5ff8
+Create Date: 2026-10-18 20:06:35.773729
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '15df61acc269'
+down_revision = 'd7f61dbc5ff8'
+branch_labels = None
+depends_on = None
+
+# (kind code, table, title, body, columns that change the document), as in search.py.
+# {row} is NEW/OLD inside triggers and the table name in the backfill.
+KIND_SPAN = 2 ** 40
+SOURCES = [
+    (3, 'request', "{row}.title", "coalesce({row}.description, '')",
+     ['title', 'description']),
+    (2, 'equipment', "{row}.name",
+     "coalesce({row}.category, '') || ' ' || coalesce({row}.location, '') || ' ' || coalesce({row}.description, '')",
+     ['name', 'category', 'location', 'description']),
+    (1, 'maintenance_history', "coalesce({row}.action_type, '')",
+     "coalesce({row}.description, '') || ' ' || coalesce({row}.notes, '') || ' ' || coalesce({row}.parts_replaced, '')",
+     ['action_type', 'description', 'notes', 'parts_replaced']),
+]
+
+
+def _sqlite_upgrade():
+    # rowid = kind code * 2^40 + source id: triggers address documents by rowid
+    # and each kind is one rowid range
+    op.execute("CREATE VIRTUAL TABLE search_index USING fts5("
+               "title, body, tokenize='unicode61', prefix='2 3 4 5')")
+    # Title matches weigh ten times more than body matches
+    op.execute("INSERT INTO search_index(search_index, rank) VALUES ('rank', 'bm25(10.0, 1.0)')")
+    for code, table, title, body, columns in SOURCES:
+        new_title, new_body = title.format(row='NEW'), body.format(row='NEW')
+        op.execute(f"""
+            CREATE TRIGGER search_index_{table}_insert AFTER INSERT ON {table} BEGIN
+                INSERT INTO search_index (rowid, title, body) VALUES ({code} * {KIND_SPAN} + NEW.id, {new_title}, {new_body});
+            END""")
+        op.execute(f"""
+            CREATE TRIGGER search_index_{table}_update AFTER UPDATE OF {', '.join(columns)} ON {table} BEGIN
+                UPDATE search_index SET title = {new_title}, body = {new_body} WHERE rowid = {code} * {KIND_SPAN} + NEW.id;
+            END""")
+        op.execute(f"""
+            CREATE TRIGGER search_index_{table}_delete AFTER DELETE ON {table} BEGIN
+                DELETE FROM search_index WHERE rowid = {code} * {KIND_SPAN} + OLD.id;
+            END""")
+        op.execute(f"INSERT INTO search_index (rowid, title, body) "
+                   f"SELECT {code} * {KIND_SPAN} + id, {title.format(row=table)}, {body.format(row=table)} FROM {table}")
+    op.execute("INSERT INTO search_index(search_index) VALUES ('optimize')")
+
+
+def _postgresql_upgrade():
+    op.execute("""
+        CREATE TABLE search_index (
+            kind SMALLINT NOT NULL,
+            ref_id INTEGER NOT NULL,
+            title TEXT,
+            body TEXT,
+            document TSVECTOR GENERATED ALWAYS AS (
+                setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+                setweight(to_tsvector('simple', coalesce(body, '')), 'B')
+            ) STORED,
+            PRIMARY KEY (kind, ref_id)
+        )""")
+    op.execute("CREATE INDEX ix_search_index_document ON search_index USING GIN (document)")
+    for code, table, title, body, columns in SOURCES:
+        op.execute(f"""
+            CREATE FUNCTION search_index_{table}() RETURNS trigger LANGUAGE plpgsql AS $$
+            BEGIN
+                IF TG_OP = 'DELETE' THEN
+                    DELETE FROM search_index WHERE kind = {code} AND ref_id = OLD.id;
+                ELSE
+                    INSERT INTO search_index (kind, ref_id, title, body)
+                    VALUES ({code}, NEW.id, {title.format(row='NEW')}, {body.format(row='NEW')})
+                    ON CONFLICT (kind, ref_id) DO UPDATE SET title = EXCLUDED.title, body = EXCLUDED.body;
+                END IF;
+                RETURN NULL;
+            END $$""")
+        op.execute(f"""
+            CREATE TRIGGER search_index_{table}
+            AFTER INSERT OR DELETE OR UPDATE OF {', '.join(columns)} ON {table}
+            FOR EACH ROW EXECUTE FUNCTION search_index_{table}()""")
+        op.execute(f"INSERT INTO search_index (kind, ref_id, title, body) "
+                   f"SELECT {code}, id, {title.format(row=table)}, {body.format(row=table)} FROM {table}")
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        _sqlite_upgrade()
+    elif dialect == 'postgresql':
+        _postgresql_upgrade()
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    for code, table, title, body, columns in SOURCES:
+        if dialect == 'sqlite':
+            for action in ('insert', 'update', 'delete'):
+                op.execute(f"DROP TRIGGER IF EXISTS search_index_{table}_{action}")
+        elif dialect == 'postgresql':
+            op.execute(f"DROP TRIGGER IF EXISTS search_index_{table} ON {table}")
+            op.execute(f"DROP FUNCTION IF EXISTS search_index_{table}()")
+    if dialect in ('sqlite', 'postgresql'):
+        op.execute("DROP TABLE IF EXISTS search_index")
@@ -0,0 +1,27 @@
+"""overdue changed at
+
+Revision ID: 1937a2c1f441
+Revises: 54c2c51de2c3
+Create Date: 2026-10-18 21:32:48.662092
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1937a2c1f441'
+down_revision = '54c2c51de2c3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # In place, not in batch mode, so SQLite keeps the request search triggers
+    op.add_column('request', sa.Column('overdue_changed_at', sa.DateTime(), nullable=True))
+    op.create_index('ix_request_overdue_changed_at_id', 'request', ['overdue_changed_at', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_request_overdue_changed_at_id', table_name='request')
+    op.drop_column('request', 'overdue_changed_at')
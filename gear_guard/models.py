@@ -53,8 +53,40 @@ class Equipment(db.Model):
     technician_member = db.relationship('TeamMember', foreign_keys=[technician_id], backref='equipment_maintained')
     responsible_member = db.relationship('TeamMember', foreign_keys=[employee_id], backref='equipment_responsible')
     
+    __table_args__ = (
+        # Keyset pagination order
+        db.Index('ix_equipment_name_id', 'name', 'id'),
+        # Incremental exports (?since=)
+        db.Index('ix_equipment_updated_at_id', 'updated_at', 'id'),
+        # Status counts and team equipment lookups
+        db.Index('ix_equipment_status', 'status'),
+        db.Index('ix_equipment_maintenance_team_id', 'maintenance_team_id'),
+        # Asset counts per category for the reliability reports
+        db.Index('ix_equipment_category', 'category'),
+    )
+    
     def __repr__(self):
         return f'<Equipment {self.name}>'
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'category': self.category,
+            'location': self.location,
+            'status': self.status,
+            'maintenance_team_id': self.maintenance_team_id,
+            'technician_id': self.technician_id,
+            'employee_id': self.employee_id,
+            'updatedAt': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+# Every request status, in workflow order: the kanban columns (templates/kanban.html), then the closed ones
+REQUEST_STATUSES = ('NEW', 'NEW_REQUEST', 'IN_PROGRESS', 'UNDER_REVIEW', 'REQUIRED', 'SCRAP', 'COMPLETED', 'CANCELLED')
+REQUEST_TYPES = ('CORRECTIVE', 'PREVENTIVE')
+REQUEST_PRIORITIES = ('LOW', 'MEDIUM', 'HIGH', 'URGENT')
+# Request statuses that can no longer become overdue
+CLOSED_STATUSES = ('COMPLETED', 'CANCELLED')
 
 # request.py
 class Request(db.Model):
@@ -72,6 +104,9 @@ class Request(db.Model):
     completed_date = db.Column(db.DateTime)
     estimated_hours = db.Column(db.Float)
     actual_hours = db.Column(db.Float)
+    plan_id = db.Column(db.Integer, db.ForeignKey('maintenance_plan.id'))  # set on requests generated from a plan
+    overdue = db.Column(db.Boolean, nullable=False, default=False)  # set on save and by the overdue sweep, see overdue.py
+    overdue_changed_at = db.Column(db.DateTime)  # last flip by the overdue sweep, which leaves updated_at alone
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -80,15 +115,48 @@ class Request(db.Model):
     technician = db.relationship('TeamMember', foreign_keys=[technician_id], backref='assigned_requests')
     assigned_team = db.relationship('Team', foreign_keys=[team_id], backref='team_requests')
     
+    __table_args__ = (
+        # Calendar window lookups (/api/requests?start=&end=)
+        db.Index('ix_request_scheduled_date_status', 'scheduled_date', 'status'),
+        db.Index('ix_request_due_date_status', 'due_date', 'status'),
+        # Keyset pagination order
+        db.Index('ix_request_created_at_id', 'created_at', 'id'),
+        # Incremental exports (?since=)
+        db.Index('ix_request_updated_at_id', 'updated_at', 'id'),
+        db.Index('ix_request_overdue_changed_at_id', 'overdue_changed_at', 'id'),
+        # Open/overdue lookups (status IN (...) AND due_date < today)
+        db.Index('ix_request_status_due_date', 'status', 'due_date'),
+        # /requests stat cards group by (type, status)
+        db.Index('ix_request_type_status', 'type', 'status'),
+        # Calendar filters and per-technician / per-team workload
+        db.Index('ix_request_technician_id_status', 'technician_id', 'status'),
+        db.Index('ix_request_team_id_status', 'team_id', 'status'),
+        # Requests page filtered by team, newest first (request_listing.py)
+        db.Index('ix_request_team_id_created_at_id', 'team_id', 'created_at', 'id'),
+        # Equipment timeline, newest first, optionally by status (timeline.py)
+        db.Index('ix_request_equipment_id_created_at_id', 'equipment_id', 'created_at', 'id'),
+        db.Index('ix_request_equipment_id_status_created_at_id', 'equipment_id', 'status', 'created_at', 'id'),
+        # One generated request per plan occurrence (re-runs insert nothing twice)
+        db.Index('ux_request_equipment_plan_scheduled', 'equipment_id', 'plan_id', 'scheduled_date', unique=True),
+        # Overdue sweeper: open requests not yet flagged, by due date; flagged ones leave the index
+        db.Index('ix_request_overdue_candidates', 'due_date',
+                 sqlite_where=status.notin_(CLOSED_STATUSES) & (overdue == False),
+                 postgresql_where=status.notin_(CLOSED_STATUSES) & (overdue == False)),
+        # Flagged requests, by due date and newest first. Both cover the requests
+        # page facets (whichever the planner scans) and the first also the
+        # check for flags that no longer apply
+        db.Index('ix_request_overdue', 'due_date', 'status', 'type', 'priority', 'team_id',
+                 sqlite_where=overdue == True, postgresql_where=overdue == True),
+        db.Index('ix_request_overdue_created_at_id', 'created_at', 'id', 'status', 'type', 'priority', 'team_id',
+                 sqlite_where=overdue == True, postgresql_where=overdue == True),
+    )
+    
     def __repr__(self):
         return f'<Request {self.title}>'
     
     def is_overdue(self):
-        """Check if request is overdue"""
-        from datetime import date
-        if self.due_date and self.status not in ['COMPLETED', 'CANCELLED']:
-            return self.due_date < date.today()
-        return False
+        """Check if request is overdue (as of its last save or overdue sweep)"""
+        return bool(self.overdue)
     
     def to_dict(self):
         return {
@@ -106,8 +174,11 @@ class Request(db.Model):
             'technicianName': self.technician.name if self.technician else None,
             'teamId': self.team_id,
             'teamName': self.assigned_team.name if self.assigned_team else None,
-            'isOverdue': self.is_overdue(),
-            'createdAt': self.created_at.isoformat() if self.created_at else None
+            'isOverdue': bool(self.overdue),
+            'overdueChangedAt': self.overdue_changed_at.isoformat() if self.overdue_changed_at else None,
+            'planId': self.plan_id,
+            'createdAt': self.created_at.isoformat() if self.created_at else None,
+            'updatedAt': self.updated_at.isoformat() if self.updated_at else None
         }
 
 # maintenance_history.py
@@ -131,8 +202,84 @@ class MaintenanceHistory(db.Model):
     request = db.relationship('Request', backref='history_records')
     technician = db.relationship('TeamMember', backref='maintenance_actions')
     
+    __table_args__ = (
+        # Equipment timeline, newest first, optionally by action type (timeline.py)
+        db.Index('ix_maintenance_history_equipment_id_performed_date', 'equipment_id', 'performed_date', 'id'),
+        db.Index('ix_maintenance_history_equipment_id_action_type_date',
+                 'equipment_id', 'action_type', 'performed_date', 'id'),
+    )
+    
     def __repr__(self):
         return f'<MaintenanceHistory {self.action_type} for Equipment {self.equipment_id}>'
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'equipmentId': self.equipment_id,
+            'requestId': self.request_id,
+            'actionType': self.action_type,
+            'description': self.description,
+            'performedBy': self.performed_by,
+            'performedDate': self.performed_date.isoformat() if self.performed_date else None,
+            'cost': self.cost,
+            'downtimeHours': self.downtime_hours,
+            'partsReplaced': self.parts_replaced,
+            'notes': self.notes,
+        }
+
+# maintenance_plan.py
+class MaintenancePlan(db.Model):
+    """Recurring preventive maintenance for one piece of equipment, see maintenance_plans.py"""
+    __tablename__ = 'maintenance_plan'
+    id = db.Column(db.Integer, primary_key=True)
+    equipment_id = db.Column(db.Integer, db.ForeignKey('equipment.id'), nullable=False)
+    title = db.Column(db.String(100))
+    description = db.Column(db.Text)
+    rule = db.Column(db.String(20), nullable=False, default='interval')  # interval, weekly, monthly, usage
+    interval = db.Column(db.Integer, nullable=False, default=30)  # days, weeks, months or usage hours, per rule
+    weekday = db.Column(db.Integer)  # weekly: 0 = Monday
+    day_of_month = db.Column(db.Integer)  # monthly: 1-28, later days clamp to the month end
+    daily_usage_hours = db.Column(db.Float)  # usage: expected run hours per day
+    start_date = db.Column(db.Date, nullable=False)
+    end_date = db.Column(db.Date)
+    priority = db.Column(db.String(20), default='MEDIUM')
+    estimated_hours = db.Column(db.Float)
+    due_after_days = db.Column(db.Integer, default=7)
+    technician_id = db.Column(db.Integer, db.ForeignKey('team_member.id'))  # defaults to the equipment's technician
+    active = db.Column(db.Boolean, nullable=False, default=True)
+    generated_until = db.Column(db.Date)  # requests exist up to this date
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    equipment = db.relationship('Equipment', backref='maintenance_plans')
+    
+    __table_args__ = (
+        db.Index('ix_maintenance_plan_equipment_id', 'equipment_id'),
+    )
+    
+    def __repr__(self):
+        return f'<MaintenancePlan {self.rule}/{self.interval} for Equipment {self.equipment_id}>'
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'equipment_id': self.equipment_id,
+            'title': self.title,
+            'description': self.description,
+            'rule': self.rule,
+            'interval': self.interval,
+            'weekday': self.weekday,
+            'day_of_month': self.day_of_month,
+            'daily_usage_hours': self.daily_usage_hours,
+            'start_date': self.start_date.isoformat() if self.start_date else None,
+            'end_date': self.end_date.isoformat() if self.end_date else None,
+            'priority': self.priority,
+            'estimated_hours': self.estimated_hours,
+            'due_after_days': self.due_after_days,
+            'technician_id': self.technician_id,
+            'active': self.active,
+            'generated_until': self.generated_until.isoformat() if self.generated_until else None,
+        }
 
 # team.py
 class Team(db.Model):
@@ -147,6 +294,11 @@ class Team(db.Model):
     # Relationship with team members
     members = db.relationship('TeamMember', backref='team', lazy=True, cascade='all, delete-orphan')
     
+    __table_args__ = (
+        # max(updated_at) for the conditional GET validators
+        db.Index('ix_team_updated_at_id', 'updated_at', 'id'),
+    )
+    
     def __repr__(self):
         return f'<Team {self.name}>'
 
@@ -165,5 +317,164 @@ class TeamMember(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        # Keyset pagination order
+        db.Index('ix_team_member_name_id', 'name', 'id'),
+        # Active technician lists ordered by name, team rosters
+        db.Index('ix_team_member_status_name', 'status', 'name'),
+        db.Index('ix_team_member_team_id', 'team_id'),
+        # max(updated_at) for the conditional GET validators
+        db.Index('ix_team_member_updated_at_id', 'updated_at', 'id'),
+    )
+    
     def __repr__(self):
         return f'<TeamMember {self.name}>'
+
+# dashboard_counter.py
+class DashboardCounter(db.Model):
+    """Materialized dashboard counts, kept current by the events in dashboard_stats.py"""
+    __tablename__ = 'dashboard_counter'
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(20), nullable=False)  # request, request_due, request_overdue, equipment, member, rollover
+    # Key columns a kind does not use hold '', 0 or 1970-01-01 rather than NULL (see dashboard_stats.KEY_DEFAULTS)
+    status = db.Column(db.String(20), nullable=False, default='')
+    type = db.Column(db.String(20), nullable=False, default='')
+    priority = db.Column(db.String(20), nullable=False, default='')
+    team_id = db.Column(db.Integer, nullable=False, default=0)
+    bucket_date = db.Column(db.Date, nullable=False)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        db.Index('ux_dashboard_counter_key', 'kind', 'status', 'type', 'priority', 'team_id', 'bucket_date',
+                 unique=True),
+    )
+    
+    def __repr__(self):
+        return f'<DashboardCounter {self.kind} {self.count}>'
+
+# id_sequence.py
+class IdSequence(db.Model):
+    """Named counters for human-readable codes, see employee_codes.py"""
+    __tablename__ = 'id_sequence'
+    name = db.Column(db.String(50), primary_key=True)
+    value = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<IdSequence {self.name}={self.value}>'
+
+# table_version.py
+class TableVersion(db.Model):
+    """Per-table delete counters for the conditional GET validators, see caching.py"""
+    __tablename__ = 'table_version'
+    table_name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<TableVersion {self.table_name}={self.version}>'
+
+# technician_load.py
+class TechnicianLoad(db.Model):
+    """Open estimated hours per technician and day, kept current by the events in workload.py"""
+    __tablename__ = 'technician_load'
+    id = db.Column(db.Integer, primary_key=True)
+    technician_id = db.Column(db.Integer, nullable=False)
+    day = db.Column(db.Date, nullable=False)  # scheduled date, else due date; 1970-01-01 for unscheduled work
+    hours = db.Column(db.Float, nullable=False, default=0)
+    open_requests = db.Column(db.Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        db.Index('ux_technician_load_technician_id_day', 'technician_id', 'day', unique=True),
+    )
+    
+    def __repr__(self):
+        return f'<TechnicianLoad {self.technician_id} {self.day} {self.hours}h>'
+
+# reliability_rollup.py
+class ReliabilityRollup(db.Model):
+    """Maintenance history totals per period, kept current by the events in reliability.py"""
+    __tablename__ = 'reliability_rollup'
+    id = db.Column(db.Integer, primary_key=True)
+    grain = db.Column(db.String(5), nullable=False)  # day, month
+    period = db.Column(db.Date, nullable=False)  # the day, or the first day of the month
+    dimension = db.Column(db.String(10), nullable=False)  # all, equipment, category, team
+    dimension_key = db.Column(db.String(100), nullable=False, default='')  # equipment id, category, team id; '' for all
+    events = db.Column(db.Integer, nullable=False, default=0)
+    failures = db.Column(db.Integer, nullable=False, default=0)
+    downtime_hours = db.Column(db.Float, nullable=False, default=0)
+    failure_downtime_hours = db.Column(db.Float, nullable=False, default=0)
+    cost = db.Column(db.Float, nullable=False, default=0)
+    
+    __table_args__ = (
+        # Row key and trend of one key; every key of a dimension over a period range
+        db.Index('ux_reliability_rollup_key_period', 'grain', 'dimension', 'dimension_key', 'period', unique=True),
+        db.Index('ix_reliability_rollup_period', 'grain', 'dimension', 'period'),
+    )
+    
+    def __repr__(self):
+        return f'<ReliabilityRollup {self.grain} {self.period} {self.dimension}={self.dimension_key}>'
+
+# job.py
+class Job(db.Model):
+    """Background work for the worker process, see jobs.py"""
+    __tablename__ = 'job'
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(50), nullable=False)  # registered task name
+    payload = db.Column(db.JSON)  # task keyword arguments
+    status = db.Column(db.String(10), nullable=False, default='queued')  # queued, running, succeeded, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=3)
+    run_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)  # earliest start, pushed back on retry
+    locked_by = db.Column(db.String(100))  # worker running the job
+    locked_at = db.Column(db.DateTime)
+    progress = db.Column(db.JSON)
+    result = db.Column(db.JSON)
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    finished_at = db.Column(db.DateTime)
+    
+    __table_args__ = (
+        # Workers claim the oldest due job; stale running jobs are found by status too
+        db.Index('ix_job_status_run_at', 'status', 'run_at'),
+        # Latest job of a task, which the periodic schedule is read from
+        db.Index('ix_job_name_id', 'name', 'id'),
+    )
+    
+    def __repr__(self):
+        return f'<Job {self.id} {self.name} {self.status}>'
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'status': self.status,
+            'attempts': self.attempts,
+            'maxAttempts': self.max_attempts,
+            'runAt': self.run_at.isoformat() if self.run_at else None,
+            'progress': self.progress,
+            'result': self.result,
+            'error': self.error,
+            'createdAt': self.created_at.isoformat() if self.created_at else None,
+            'finishedAt': self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+# notification.py
+class Notification(db.Model):
+    """Alert waiting for delivery to the configured sinks, see notifications.py"""
+    id = db.Column(db.Integer, primary_key=True)
+    event = db.Column(db.String(30), nullable=False)  # request_overdue
+    request_id = db.Column(db.Integer, db.ForeignKey('request.id'))
+    dedupe_key = db.Column(db.String(100), nullable=False)  # one alert per event occurrence
+    payload = db.Column(db.JSON)
+    status = db.Column(db.String(10), nullable=False, default='pending')  # pending, sent
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime)
+    
+    __table_args__ = (
+        db.Index('ux_notification_dedupe_key', 'dedupe_key', unique=True),
+        # Delivery reads pending alerts in insertion order
+        db.Index('ix_notification_status_id', 'status', 'id'),
+    )
+    
+    def __repr__(self):
+        return f'<Notification {self.dedupe_key} {self.status}>'
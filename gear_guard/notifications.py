@@ -0,0 +1,95 @@
+import json
+import os
+import smtplib
+import urllib.request
+from datetime import datetime
+from email.message import EmailMessage
+
+from flask import current_app
+from sqlalchemy import select, update
+
+from extensions import db
+from models import Notification
+
+
+def _log_sink(notifications):
+    """Append one JSON line per alert to NOTIFY_LOG_PATH"""
+    path = current_app.config.get('NOTIFY_LOG_PATH') or os.path.join(current_app.instance_path, 'notifications.log')
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as f:
+        for notification in notifications:
+            f.write(json.dumps(notification) + '\n')
+
+
+def _webhook_sink(notifications):
+    """POST the batch as {"notifications": [...]} to NOTIFY_WEBHOOK_URL"""
+    url = current_app.config.get('NOTIFY_WEBHOOK_URL')
+    if not url:
+        raise RuntimeError('NOTIFY_SINKS includes webhook, but NOTIFY_WEBHOOK_URL is not set')
+    body = json.dumps({'notifications': notifications}).encode()
+    http_request = urllib.request.Request(url, data=body, headers={'Content-Type': 'application/json'})
+    # urlopen raises on 4xx/5xx, which leaves the batch pending for a retry
+    with urllib.request.urlopen(http_request, timeout=10):
+        pass
+
+
+def _email_sink(notifications):
+    """Send the batch as one digest email through NOTIFY_SMTP_HOST"""
+    config = current_app.config
+    message = EmailMessage()
+    message['Subject'] = f'GearGuard: {len(notifications)} maintenance alert(s)'
+    message['From'] = config['NOTIFY_EMAIL_FROM']
+    message['To'] = config['NOTIFY_EMAIL_TO']
+    message.set_content('\n'.join(notification['message'] for notification in notifications))
+    with smtplib.SMTP(config['NOTIFY_SMTP_HOST'], config['NOTIFY_SMTP_PORT'], timeout=10) as smtp:
+        smtp.send_message(message)
+
+
+# Delivery sinks by NOTIFY_SINKS name; each takes a batch of payload dicts
+SINKS = {
+    'log': _log_sink,
+    'webhook': _webhook_sink,
+    'email': _email_sink,
+}
+
+
+def configured_sinks():
+    names = [name.strip() for name in current_app.config['NOTIFY_SINKS'].split(',') if name.strip()]
+    unknown = [name for name in names if name not in SINKS]
+    if unknown:
+        raise RuntimeError(f"Unknown NOTIFY_SINKS entries: {', '.join(unknown)}")
+    return [SINKS[name] for name in names]
+
+
+def deliver_notifications(batch_size=None):
+    """Send pending notifications to every configured sink, one batch at a time.
+
+    A batch is marked sent once all sinks accepted it; if one fails the
+    batch stays pending for the job's retry, so delivery is at least once.
+    Returns the number of notifications sent.
+    """
+    batch_size = batch_size or current_app.config['NOTIFY_BATCH_SIZE']
+    sinks = configured_sinks()
+    sent = 0
+    while True:
+        batch = db.session.execute(
+            select(Notification.id, Notification.event, Notification.payload, Notification.created_at)
+            .where(Notification.status == 'pending')
+            .order_by(Notification.id)
+            .limit(batch_size)
+        ).all()
+        if not batch:
+            break
+        notifications = [dict(row.payload or {}, id=row.id, event=row.event,
+                              createdAt=row.created_at.isoformat() if row.created_at else None)
+                         for row in batch]
+        for sink in sinks:
+            sink(notifications)
+        db.session.execute(
+            update(Notification)
+            .where(Notification.id.in_([row.id for row in batch]), Notification.status == 'pending')
+            .values(status='sent', sent_at=datetime.utcnow())
+        )
+        db.session.commit()
+        sent += len(batch)
+    return sent
@@ -0,0 +1,148 @@
+from datetime import date, datetime
+
+from flask import current_app
+from sqlalchemy import and_, bindparam, event, func, not_, select, update
+
+from change_feed import queue_change, serialize_request
+from extensions import db
+from jobs import enqueue
+from models import CLOSED_STATUSES, Equipment, Job, Notification, Request, Team, TeamMember
+
+OVERDUE_EVENT = 'request_overdue'
+
+
+def _open():
+    # Rendered inline: SQLite only uses a partial index when the query
+    # repeats the index's WHERE terms, and a bound parameter does not
+    closed = bindparam('closed_statuses', CLOSED_STATUSES, expanding=True, literal_execute=True)
+    return Request.status.notin_(closed)
+
+
+def overdue_candidates(today):
+    """Open, unflagged requests past their due date (ix_request_overdue_candidates)"""
+    return and_(_open(), Request.overdue == False, Request.due_date < today)
+
+
+def stale_overdue_flags(today):
+    """Flagged requests that are closed or no longer past due (ix_request_overdue)"""
+    return and_(Request.overdue == True, not_(and_(_open(), func.coalesce(Request.due_date < today, False))))
+
+
+def _insert_ignoring_duplicates(connection):
+    """INSERT that skips alerts already raised for the same dedupe key"""
+    if connection.dialect.name == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(Notification.__table__).on_conflict_do_nothing(index_elements=['dedupe_key'])
+
+
+def _overdue_notifications(connection, request_ids, now):
+    rows = connection.execute(
+        select(Request.id, Request.title, Request.priority, Request.due_date,
+               Equipment.name.label('equipment_name'), TeamMember.name.label('technician_name'),
+               Team.name.label('team_name'))
+        .outerjoin(Equipment, Equipment.id == Request.equipment_id)
+        .outerjoin(TeamMember, TeamMember.id == Request.technician_id)
+        .outerjoin(Team, Team.id == Request.team_id)
+        .where(Request.id.in_(request_ids))
+        .order_by(Request.due_date, Request.id)
+    )
+    for row in rows:
+        due_date = row.due_date.isoformat()
+        yield {
+            'event': OVERDUE_EVENT,
+            'request_id': row.id,
+            # A new due date that passes again is a new alert; re-flagging the same one is not
+            'dedupe_key': f'{OVERDUE_EVENT}:{row.id}:{due_date}',
+            'payload': {
+                'requestId': row.id,
+                'title': row.title,
+                'priority': row.priority,
+                'dueDate': due_date,
+                'equipmentName': row.equipment_name,
+                'technicianName': row.technician_name,
+                'teamName': row.team_name,
+                'message': f'Request #{row.id} "{row.title}" ({row.equipment_name or "no equipment"}) '
+                           f'was due {due_date}',
+            },
+            'status': 'pending',
+            'created_at': now,
+        }
+
+
+def sweep_overdue(today=None, notify=True):
+    """Flag requests that became overdue and queue one alert per request and due date.
+
+    Requests written through the ORM are flagged as they are saved (see
+    _set_overdue); the sweep catches due dates passing in between and runs
+    as the periodic sweep_overdue job. Newly overdue requests are flagged in
+    one UPDATE over the ix_request_overdue_candidates partial index, which
+    only holds open, unflagged requests. Flags that no longer apply are
+    cleared first. Alerts are inserted in batches and sent by a
+    deliver_notifications job, along with those raised on save.
+    Returns (flagged, cleared, alerts queued).
+    """
+    today = today or date.today()
+    now = datetime.utcnow()
+    connection = db.session.connection()
+    # The flag follows from the date and is not an edit: updated_at is set to
+    # itself so its onupdate does not fire and kanban moves see no conflict.
+    # overdue_changed_at records the flip for exports, the change feed and
+    # the conditional GET validators instead
+    cleared = connection.execute(
+        update(Request)
+        .where(stale_overdue_flags(today))
+        .values(overdue=False, overdue_changed_at=now, updated_at=Request.updated_at)
+        .returning(Request.id)
+    ).scalars().all()
+    flagged = connection.execute(
+        update(Request)
+        .where(overdue_candidates(today))
+        .values(overdue=True, overdue_changed_at=now, updated_at=Request.updated_at)
+        .returning(Request.id)
+    ).scalars().all()
+    for request_ids, overdue in ((cleared, False), (flagged, True)):
+        for request_id in request_ids:
+            queue_change(db.session, 'updated', serialize_request(
+                {'id': request_id, 'isOverdue': overdue, 'overdueChangedAt': now}))
+
+    queued = 0
+    if notify:
+        batch_size = current_app.config['NOTIFY_BATCH_SIZE']
+        for offset in range(0, len(flagged), batch_size):
+            rows = list(_overdue_notifications(connection, flagged[offset:offset + batch_size], now))
+            queued += len(connection.execute(
+                _insert_ignoring_duplicates(connection).returning(Notification.id), rows).all())
+    db.session.commit()
+
+    # One queued delivery job drains every pending alert, so do not stack them
+    pending = queued or Notification.query.filter_by(status='pending').first()
+    if pending and not Job.query.filter_by(name='deliver_notifications', status='queued').first():
+        enqueue('deliver_notifications')
+    return len(flagged), len(cleared), queued
+
+
+def raise_overdue_alerts(connection, request_ids):
+    """Raise the alerts of requests flagged outside the ORM; the next sweep queues their delivery"""
+    if not request_ids:
+        return
+    rows = list(_overdue_notifications(connection, request_ids, datetime.utcnow()))
+    if rows:
+        connection.execute(_insert_ignoring_duplicates(connection), rows)
+
+
+@event.listens_for(Request, 'before_insert')
+@event.listens_for(Request, 'before_update')
+def _set_overdue(mapper, connection, target):
+    """A saved request is flagged, or stops being overdue, at once"""
+    target.overdue = (target.status not in CLOSED_STATUSES and target.due_date is not None
+                      and target.due_date < date.today())
+
+
+@event.listens_for(Request, 'after_insert')
+@event.listens_for(Request, 'after_update')
+def _alert_overdue(mapper, connection, target):
+    """Raise the alert of a request flagged on save; the next sweep queues its delivery"""
+    if target.overdue and db.inspect(target).attrs.overdue.history.added:
+        raise_overdue_alerts(connection, [target.id])
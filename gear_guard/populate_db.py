@@ -1,17 +1,23 @@
 """
 Script to populate the GearGuard database with sample data for testing
 """
-from app import app, db, Team, TeamMember, Equipment, Request
+from app import app, db, Team, TeamMember, Equipment, Request, IdSequence, Notification
+from caching import VERSIONED_MODELS, record_deletes
+from dashboard_stats import rebuild_dashboard_counters
+from workload import rebuild_workload_index
 from datetime import datetime, timedelta, date
 
 def populate_database():
     with app.app_context():
         # Clear existing data (optional - comment out if you want to keep existing data)
         print("Clearing existing data...")
+        Notification.query.delete()
         Request.query.delete()
         Equipment.query.delete()
         TeamMember.query.delete()
         Team.query.delete()
+        IdSequence.query.delete()
+        record_deletes(db.session.connection(), VERSIONED_MODELS)
         
         # Create Teams
         print("Creating teams...")
@@ -185,6 +191,14 @@ def populate_database():
         db.session.add_all(requests)
         db.session.commit()
         
+        # Bulk deletes above bypass the counter events, so rebuild from scratch
+        print("Rebuilding dashboard counters...")
+        rebuild_dashboard_counters()
+        rebuild_workload_index()
+        # Sample requests are flagged overdue as they are saved; drop their alerts
+        Notification.query.delete()
+        db.session.commit()
+        
         print("\n" + "="*60)
         print("✅ DATABASE POPULATED SUCCESSFULLY!")
         print("="*60)
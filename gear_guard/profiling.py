@@ -0,0 +1,128 @@
+import heapq
+import itertools
+import json
+import logging
+import threading
+import time
+from datetime import datetime
+
+from flask import before_render_template, current_app, g, has_request_context, request, template_rendered
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger('gear_guard.profile')
+
+
+class SlowestRequests:
+    """Thread-safe ring of the N slowest requests seen since startup"""
+
+    def __init__(self, size):
+        self.size = size
+        self._heap = []
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+
+    def add(self, profile):
+        item = (profile['total_ms'], next(self._order), profile)
+        with self._lock:
+            if len(self._heap) < self.size:
+                heapq.heappush(self._heap, item)
+            elif item[0] > self._heap[0][0]:
+                heapq.heapreplace(self._heap, item)
+
+    def snapshot(self):
+        with self._lock:
+            return [profile for _, _, profile in sorted(self._heap, reverse=True)]
+
+
+slowest_requests = SlowestRequests(50)
+
+
+# SQL timing hooks. They are registered on the Engine class so every engine
+# (and bind) is covered; statements run outside a request are ignored.
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = (time.perf_counter() - conn.info['query_start'].pop()) * 1000
+    if not has_request_context() or 'profile' not in g:
+        return
+    profile = g.profile
+    profile['statements'] += 1
+    profile['db_ms'] += elapsed
+    slow = profile['slow_statements']
+    item = (elapsed, profile['statements'], statement)
+    if len(slow) < profile['keep']:
+        heapq.heappush(slow, item)
+    elif elapsed > slow[0][0]:
+        heapq.heapreplace(slow, item)
+
+
+def _before_render(sender, template, context, **extra):
+    if 'profile' in g:
+        g.profile['render_started'] = time.perf_counter()
+
+
+def _rendered(sender, template, context, **extra):
+    if 'profile' in g and g.profile.get('render_started'):
+        g.profile['template_ms'] += (time.perf_counter() - g.profile.pop('render_started')) * 1000
+
+
+def _start_profile():
+    if request.endpoint == 'static':
+        return
+    g.profile = {
+        'started': time.perf_counter(),
+        'statements': 0,
+        'db_ms': 0.0,
+        'template_ms': 0.0,
+        'slow_statements': [],
+        'keep': current_app.config['PROFILE_SLOW_STATEMENTS'],
+    }
+
+
+def _finish_profile(response):
+    profile = g.pop('profile', None)
+    if profile is None:
+        return response
+    total_ms = (time.perf_counter() - profile['started']) * 1000
+    summary = {
+        'time': datetime.utcnow().isoformat(timespec='seconds'),
+        'method': request.method,
+        'path': request.full_path.rstrip('?'),
+        'endpoint': request.endpoint,
+        'status': response.status_code,
+        'total_ms': round(total_ms, 2),
+        'db_ms': round(profile['db_ms'], 2),
+        'template_ms': round(profile['template_ms'], 2),
+        'statements': profile['statements'],
+        'slow_statements': [
+            {'ms': round(ms, 2), 'sql': sql}
+            for ms, _, sql in sorted(profile['slow_statements'], reverse=True)
+        ],
+    }
+    response.headers.add('Server-Timing', ', '.join([
+        f'db;dur={summary["db_ms"]};desc="{summary["statements"]} statements"',
+        f'tpl;dur={summary["template_ms"]}',
+        f'total;dur={summary["total_ms"]}',
+    ]))
+    slow_request = total_ms >= current_app.config['PROFILE_SLOW_REQUEST_MS']
+    logger.log(logging.WARNING if slow_request else logging.INFO, json.dumps(summary))
+    slowest_requests.add(summary)
+    return response
+
+
+def init_profiling(app):
+    """Per-request SQL and template timings: Server-Timing header, log line, slowest-N ring"""
+    app.config.setdefault('PROFILE_SLOW_STATEMENTS', 5)
+    app.config.setdefault('PROFILE_SLOW_REQUEST_MS', 500)
+    app.config.setdefault('PROFILE_RING_SIZE', 50)
+    slowest_requests.size = app.config['PROFILE_RING_SIZE']
+    app.before_request(_start_profile)
+    app.after_request(_finish_profile)
+    before_render_template.connect(_before_render, app)
+    template_rendered.connect(_rendered, app)
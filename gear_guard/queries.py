@@ -0,0 +1,69 @@
+from sqlalchemy.orm import joinedload, load_only, raiseload
+
+from models import Team, TeamMember, Equipment, Request, MaintenanceHistory
+
+# Eager-loading presets for Request queries, one per view.
+# Every relationship a view touches is loaded in the same SELECT, and
+# anything else raises instead of silently issuing a lazy load per row.
+REQUEST_LOAD_OPTIONS = {
+    # Request.to_dict(): equipment, technician and team names
+    'serialize': (
+        joinedload(Request.equipment).load_only(Equipment.id, Equipment.name),
+        joinedload(Request.technician).load_only(TeamMember.id, TeamMember.name),
+        joinedload(Request.assigned_team).load_only(Team.id, Team.name),
+        raiseload('*'),
+    ),
+    # requests.html table: technician and equipment names
+    'list': (
+        joinedload(Request.equipment).load_only(Equipment.id, Equipment.name),
+        joinedload(Request.technician).load_only(TeamMember.id, TeamMember.name),
+        raiseload('*'),
+    ),
+    # Dashboard recent requests: plain columns only
+    'summary': (
+        load_only(Request.id, Request.title, Request.type, Request.status,
+                  Request.scheduled_date, Request.due_date, Request.created_at),
+        raiseload('*'),
+    ),
+    # Equipment maintenance timeline: technician name
+    'timeline': (
+        load_only(Request.id, Request.title, Request.type, Request.status, Request.priority,
+                  Request.due_date, Request.completed_date, Request.created_at),
+        joinedload(Request.technician).load_only(TeamMember.id, TeamMember.name),
+        raiseload('*'),
+    ),
+    # Kanban cards: plain columns only
+    'kanban': (
+        load_only(Request.id, Request.title, Request.type, Request.status, Request.due_date,
+                  Request.updated_at),
+        raiseload('*'),
+    ),
+}
+
+
+def request_query(view):
+    """Request query with the eager-loading preset for the given view"""
+    return Request.query.options(*REQUEST_LOAD_OPTIONS[view])
+
+
+def equipment_query():
+    """Equipment with the maintenance team and responsible employee names"""
+    return Equipment.query.options(
+        joinedload(Equipment.maintenance_team).load_only(Team.id, Team.name),
+        joinedload(Equipment.responsible_member).load_only(TeamMember.id, TeamMember.name),
+    )
+
+
+def member_query():
+    """Team members with their team name"""
+    return TeamMember.query.options(
+        joinedload(TeamMember.team).load_only(Team.id, Team.name),
+    )
+
+
+def history_query():
+    """Maintenance history entries with the technician name"""
+    return MaintenanceHistory.query.options(
+        joinedload(MaintenanceHistory.technician).load_only(TeamMember.id, TeamMember.name),
+        raiseload('*'),
+    )
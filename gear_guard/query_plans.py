@@ -0,0 +1,88 @@
+import re
+from datetime import date, datetime, timedelta
+
+from extensions import db
+from models import Equipment, MaintenanceHistory, ReliabilityRollup, Request, Team, TeamMember
+from caching import validator_columns
+from queries import equipment_query, history_query, member_query, request_query
+from dashboard_stats import OPEN_STATUSES
+from exports import export_query
+from overdue import overdue_candidates, stale_overdue_flags
+from pagination import DEFAULT_PAGE_SIZE
+
+# A plan step that reads a whole table, directly or through one of its indexes
+FULL_SCAN = re.compile(r'^SCAN (?:TABLE )?(\w+)(?: USING (?:COVERING )?INDEX \w+)?$')
+# Route queries allowed to walk a whole index, and why that stays cheap. A
+# scan without any index always fails
+INDEX_SCANS_ALLOWED = {
+    'dashboard recent requests': 'reads the index in order and stops after 10 rows',
+    'requests page': 'reads the index in order and stops after one page',
+    'requests page overdue': 'reads the partial index in order and stops after one page',
+    'equipment page': 'reads the index in order and stops after one page',
+    'members page': 'reads the index in order and stops after one page',
+    'overdue flags to clear': 'the periodic sweep reads the partial index of flagged requests only',
+}
+
+
+def route_queries(today=None):
+    """The hot route queries, by name, as they are issued by the views"""
+    today = today or date.today()
+    window = (today.replace(day=1), today.replace(day=1) + timedelta(days=41))
+    page = DEFAULT_PAGE_SIZE + 1
+    return {
+        'dashboard recent requests': request_query('summary').order_by(Request.created_at.desc()).limit(10),
+        'dashboard technicians': TeamMember.query.filter_by(status='active').order_by(TeamMember.name),
+        'requests page': request_query('list').order_by(Request.created_at.desc(), Request.id.desc()).limit(page),
+        'requests page by team': request_query('list').filter(Request.team_id == 1)
+            .order_by(Request.created_at.desc(), Request.id.desc()).limit(page),
+        'requests page overdue': request_query('list').filter(Request.overdue == True)
+            .order_by(Request.created_at.desc(), Request.id.desc()).limit(page),
+        'open overdue requests': Request.query.filter(Request.status.in_(OPEN_STATUSES), Request.due_date < today),
+        'overdue sweep candidates': Request.query.filter(overdue_candidates(today)),
+        'overdue flags to clear': Request.query.filter(stale_overdue_flags(today)),
+        'equipment page': equipment_query().order_by(Equipment.name, Equipment.id).limit(page),
+        'equipment requests': Request.query.filter(Request.equipment_id == 1),
+        'team equipment': Equipment.query.filter(Equipment.maintenance_team_id == 1),
+        'equipment by status': Equipment.query.filter(Equipment.status == 'under_maintenance'),
+        'members page': member_query().order_by(TeamMember.name, TeamMember.id).limit(page),
+        'team members': TeamMember.query.filter_by(team_id=1),
+        'calendar window': request_query('serialize').filter(db.or_(
+            Request.scheduled_date.between(*window),
+            Request.due_date.between(*window),
+        )),
+        'calendar technician': request_query('serialize').filter(Request.technician_id == 1),
+        'calendar team': request_query('serialize').filter(Request.team_id == 1),
+        'requests export since': export_query(Request, datetime(today.year, 1, 1)),
+        'equipment timeline requests': request_query('timeline')
+            .filter(Request.equipment_id == 1, Request.status == 'COMPLETED')
+            .order_by(Request.created_at.desc(), Request.id.desc()).limit(page),
+        'equipment timeline history': history_query()
+            .filter(MaintenanceHistory.equipment_id == 1, MaintenanceHistory.performed_date < datetime(today.year, 1, 1))
+            .order_by(MaintenanceHistory.performed_date.desc(), MaintenanceHistory.id.desc()).limit(page),
+        'reliability trend': ReliabilityRollup.query.filter(
+            ReliabilityRollup.grain == 'month', ReliabilityRollup.dimension == 'category',
+            ReliabilityRollup.dimension_key == 'HVAC', ReliabilityRollup.period.between(*window)),
+        'conditional GET validators': db.session.query(*validator_columns((Team, TeamMember, Equipment, Request))),
+        'reliability assets per category': db.session.query(Equipment.category, db.func.count(Equipment.id))
+            .filter(Equipment.category.in_(['HVAC'])).group_by(Equipment.category),
+    }
+
+
+def explain(query):
+    """EXPLAIN QUERY PLAN detail lines for an ORM query (SQLite only)"""
+    connection = db.session.connection()
+    compiled = query.statement.compile(dialect=connection.dialect, compile_kwargs={'literal_binds': True})
+    rows = connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {compiled}').all()
+    return [row[-1] for row in rows]
+
+
+def full_scans(plan, index_scans_allowed=False):
+    """Tables a plan reads in full; with index_scans_allowed, only those read without an index"""
+    return [match.group(1) for match in map(FULL_SCAN.match, plan)
+            if match and not (index_scans_allowed and ' USING ' in match.group(0))]
+
+
+def check_query_plans(today=None):
+    """Return {name: (plan, fully scanned tables)} for every route query"""
+    return {name: (plan, full_scans(plan, name in INDEX_SCANS_ALLOWED))
+            for name, plan in ((name, explain(query)) for name, query in route_queries(today).items())}
@@ -0,0 +1,416 @@
+import calendar
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import case, cast, func, select, union_all
+
+from counters import bump, track_changes
+from extensions import db
+from models import Equipment, MaintenanceHistory, ReliabilityRollup, Team
+
+HISTORY_ACTIONS = ('REPAIR', 'INSPECTION', 'REPLACEMENT', 'CALIBRATION')
+# History actions that mean the equipment had failed; the rest is planned work
+FAILURE_ACTIONS = ('REPAIR', 'REPLACEMENT')
+
+GRAINS = ('day', 'month')
+DIMENSIONS = ('all', 'equipment', 'category', 'team')
+MEASURES = ('events', 'failures', 'downtime_hours', 'failure_downtime_hours', 'cost')
+BREAKDOWN_SORTS = ('cost', 'downtime_hours', 'failures', 'events')
+# Longest daily trend, in days
+MAX_DAILY_PERIODS = 366
+
+# MaintenanceHistory attributes the rollups depend on
+HISTORY_ATTRIBUTES = ('equipment_id', 'action_type', 'performed_date', 'cost', 'downtime_hours')
+# Equipment attributes a history row is attributed by
+ATTRIBUTION_ATTRIBUTES = ('category', 'maintenance_team_id')
+
+rollup_table = ReliabilityRollup.__table__
+
+
+class InvalidHistory(ValueError):
+    pass
+
+
+class InvalidReliabilityQuery(ValueError):
+    pass
+
+
+def validate_history(data):
+    """MaintenanceHistory column values from a JSON payload; raises InvalidHistory"""
+    action_type = (data.get('action_type') or '').upper()
+    if action_type not in HISTORY_ACTIONS:
+        raise InvalidHistory(f"action_type must be one of {', '.join(HISTORY_ACTIONS)}")
+    try:
+        performed_date = datetime.fromisoformat(data['performed_date']) if data.get('performed_date') \
+            else datetime.utcnow()
+        cost = float(data['cost']) if data.get('cost') is not None else None
+        downtime_hours = float(data['downtime_hours']) if data.get('downtime_hours') is not None else None
+    except (TypeError, ValueError):
+        raise InvalidHistory('performed_date must be an ISO date or datetime, cost and downtime_hours numbers')
+    if (cost or 0) < 0 or (downtime_hours or 0) < 0:
+        raise InvalidHistory('cost and downtime_hours cannot be negative')
+    return {
+        'action_type': action_type,
+        'performed_date': performed_date,
+        'cost': cost,
+        'downtime_hours': downtime_hours,
+        'request_id': data.get('request_id'),
+        'performed_by': data.get('performed_by'),
+        'description': (data.get('description') or '').strip() or None,
+        'parts_replaced': (data.get('parts_replaced') or '').strip() or None,
+        'notes': (data.get('notes') or '').strip() or None,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Rollups
+#
+# reliability_rollup holds event counts, downtime and cost per (grain,
+# period, dimension, key): every history row adds to its day and month for
+# the fleet ('all'), its equipment, and the equipment's current category and
+# maintenance team. Rows are adjusted by delta on every history change and
+# moved between keys when an equipment's category or team changes, so reads
+# sum a few rollup rows per period instead of scanning the history.
+# ---------------------------------------------------------------------------
+
+def _month_start(day):
+    return day.replace(day=1)
+
+
+def _month_end(day):
+    return day.replace(day=calendar.monthrange(day.year, day.month)[1])
+
+
+def _dimension_keys(equipment_id, category, team_id):
+    """(dimension, key) pairs a history row of this equipment counts towards"""
+    keys = [('all', ''), ('equipment', str(equipment_id))]
+    if category:
+        keys.append(('category', category))
+    if team_id:
+        keys.append(('team', str(team_id)))
+    return keys
+
+
+def _measures(values):
+    """Measure deltas of one history row, in MEASURES order"""
+    downtime = values['downtime_hours'] or 0.0
+    failure = values['action_type'] in FAILURE_ACTIONS
+    return (1, int(failure), downtime, downtime if failure else 0.0, values['cost'] or 0.0)
+
+
+def _bump(connection, grain, period, dimension, key, deltas):
+    bump(connection, rollup_table, {'grain': grain, 'period': period, 'dimension': dimension, 'dimension_key': key},
+         dict(zip(MEASURES, deltas)))
+
+
+def _attribution(connection, equipment_ids):
+    """{equipment id: (category, maintenance team id)}"""
+    if not equipment_ids:
+        return {}
+    rows = connection.execute(
+        select(Equipment.id, Equipment.category, Equipment.maintenance_team_id)
+        .where(Equipment.id.in_(equipment_ids))
+    )
+    return {equipment_id: (category, team_id) for equipment_id, category, team_id in rows}
+
+
+def record_history_changes(connection, changes):
+    """Adjust the rollups for history rows changed outside the ORM unit of work.
+
+    changes is an iterable of (old_values, new_values) dicts with the
+    HISTORY_ATTRIBUTES keys, None for the missing side of an insert or
+    delete. Deltas are summed so each rollup row is touched once.
+    """
+    changes = [(old_values, new_values) for old_values, new_values in changes]
+    equipment = _attribution(connection, {values['equipment_id'] for change in changes
+                                          for values in change if values})
+    deltas = defaultdict(lambda: [0] * len(MEASURES))
+    for old_values, new_values in changes:
+        for values, sign in ((old_values, -1), (new_values, 1)):
+            if not values or not values['performed_date'] or not values['equipment_id']:
+                continue
+            day = values['performed_date']
+            day = day.date() if isinstance(day, datetime) else day
+            category, team_id = equipment.get(values['equipment_id'], (None, None))
+            measures = _measures(values)
+            for dimension, key in _dimension_keys(values['equipment_id'], category, team_id):
+                for grain, period in (('day', day), ('month', _month_start(day))):
+                    delta = deltas[(grain, period, dimension, key)]
+                    for index, value in enumerate(measures):
+                        delta[index] += sign * value
+    for (grain, period, dimension, key), delta in deltas.items():
+        _bump(connection, grain, period, dimension, key, delta)
+
+
+def _move_equipment(connection, equipment_id, old_values, new_values):
+    """Move an equipment's rollups to its new category and team"""
+    moves = [(dimension, old_key, new_key) for dimension, old_key, new_key in (
+        ('category', old_values['category'], new_values['category']),
+        ('team', old_values['maintenance_team_id'], new_values['maintenance_team_id']),
+    ) if old_key != new_key]
+    if not moves:
+        return
+    rows = connection.execute(
+        select(rollup_table.c.grain, rollup_table.c.period, *[rollup_table.c[name] for name in MEASURES])
+        .where(rollup_table.c.dimension == 'equipment', rollup_table.c.dimension_key == str(equipment_id))
+    ).all()
+    for grain, period, *measures in rows:
+        for dimension, old_key, new_key in moves:
+            if old_key:
+                _bump(connection, grain, period, dimension, str(old_key), [-value for value in measures])
+            if new_key:
+                _bump(connection, grain, period, dimension, str(new_key), measures)
+
+
+def _history_changed(connection, target, old_values, new_values):
+    record_history_changes(connection, [(old_values, new_values)])
+
+
+def _equipment_changed(connection, target, old_values, new_values):
+    _move_equipment(connection, target.id, old_values, new_values)
+
+
+track_changes(MaintenanceHistory, HISTORY_ATTRIBUTES, _history_changed)
+track_changes(Equipment, ATTRIBUTION_ATTRIBUTES, _equipment_changed, events=('update',))
+
+
+def rebuild_reliability_rollups(batch_size=10000):
+    """Recompute reliability_rollup from the maintenance history"""
+    day = func.date(MaintenanceHistory.performed_date, type_=db.Date)
+    failure = MaintenanceHistory.action_type.in_(FAILURE_ACTIONS)
+    downtime = func.coalesce(MaintenanceHistory.downtime_hours, 0)
+    groups = (
+        select(
+            day, MaintenanceHistory.equipment_id, Equipment.category, Equipment.maintenance_team_id,
+            func.count(MaintenanceHistory.id),
+            func.sum(case((failure, 1), else_=0)),
+            func.sum(downtime),
+            func.sum(case((failure, downtime), else_=0)),
+            func.sum(func.coalesce(MaintenanceHistory.cost, 0)),
+        )
+        .join(Equipment, Equipment.id == MaintenanceHistory.equipment_id)
+        .where(MaintenanceHistory.performed_date.isnot(None))
+        .group_by(day, MaintenanceHistory.equipment_id, Equipment.category, Equipment.maintenance_team_id)
+        .execution_options(yield_per=batch_size)
+    )
+    totals = defaultdict(lambda: [0] * len(MEASURES))
+    for day_value, equipment_id, category, team_id, *measures in db.session.execute(groups):
+        for dimension, key in _dimension_keys(equipment_id, category, team_id):
+            for grain, period in (('day', day_value), ('month', _month_start(day_value))):
+                total = totals[(grain, period, dimension, key)]
+                for index, value in enumerate(measures):
+                    total[index] += value or 0
+
+    db.session.execute(rollup_table.delete())
+    rows = [dict(grain=grain, period=period, dimension=dimension, dimension_key=key, **dict(zip(MEASURES, total)))
+            for (grain, period, dimension, key), total in totals.items()]
+    for offset in range(0, len(rows), batch_size):
+        db.session.execute(rollup_table.insert(), rows[offset:offset + batch_size])
+    db.session.commit()
+    return len(rows)
+
+
+# ---------------------------------------------------------------------------
+# Reports
+#
+# MTTR is failure downtime per failure. MTBF is uptime per failure, where
+# uptime is the calendar hours of the window (up to today) times the number
+# of assets, minus all recorded downtime. Assets are the current equipment
+# of the dimension, so a fleet that grew inside the window reads slightly low.
+# ---------------------------------------------------------------------------
+
+def _window_hours(start, end, today):
+    """Calendar hours from start to end inclusive, stopping at today"""
+    end = min(end, today)
+    return max((end - start).days + 1, 0) * 24
+
+
+def _metrics(totals, assets, hours):
+    events, failures, downtime, failure_downtime, cost = totals
+    exposure = assets * hours
+    uptime = max(exposure - downtime, 0)
+    return {
+        'events': events,
+        'failures': failures,
+        'downtime_hours': round(downtime, 2),
+        'cost': round(cost, 2),
+        'mttr_hours': round(failure_downtime / failures, 2) if failures else None,
+        'mtbf_hours': round(uptime / failures, 2) if failures else None,
+        'availability': round(uptime / exposure * 100, 2) if exposure else None,
+    }
+
+
+def _asset_counts(dimension, keys):
+    """{key: number of equipment} for keys of a dimension"""
+    if dimension == 'equipment':
+        return dict.fromkeys(keys, 1)
+    if dimension == 'all':
+        return {'': db.session.query(func.count(Equipment.id)).scalar()}
+    column = Equipment.category if dimension == 'category' else Equipment.maintenance_team_id
+    values = keys if dimension == 'category' else [int(key) for key in keys]
+    rows = db.session.query(column, func.count(Equipment.id)).filter(column.in_(values)).group_by(column)
+    return {str(value): count for value, count in rows}
+
+
+def _key_names(dimension, keys):
+    """Display names for equipment and team keys"""
+    if dimension == 'equipment':
+        model = Equipment
+    elif dimension == 'team':
+        model = Team
+    else:
+        return {key: key for key in keys}
+    rows = db.session.query(model.id, model.name).filter(model.id.in_([int(key) for key in keys]))
+    return {str(model_id): name for model_id, name in rows}
+
+
+def _check(dimension, key=None):
+    if dimension not in DIMENSIONS:
+        raise InvalidReliabilityQuery(f"dimension must be one of {', '.join(DIMENSIONS)}")
+    if key is None:
+        return ''
+    if dimension == 'all':
+        return ''
+    key = str(key).strip()
+    if not key:
+        raise InvalidReliabilityQuery(f"key is required for the {dimension} dimension")
+    if dimension in ('equipment', 'team') and not key.isdigit():
+        raise InvalidReliabilityQuery(f"key must be a {dimension} id")
+    return key
+
+
+def reliability_trend(dimension='all', key=None, grain='month', start=None, end=None, today=None):
+    """Metrics per day or month of [start, end] for one key of a dimension.
+
+    Month trends widen start and end to whole months. The default window
+    is the last 12 months, or the last 30 days for daily trends.
+    """
+    key = _check(dimension, key if key is not None else '')
+    if grain not in GRAINS:
+        raise InvalidReliabilityQuery(f"grain must be one of {', '.join(GRAINS)}")
+    today = today or date.today()
+    end = end or today
+    if grain == 'month':
+        end = _month_end(end)
+        if start is None:
+            months = end.year * 12 + end.month - 12
+            start = date(months // 12, months % 12 + 1, 1)
+        start = _month_start(start)
+    else:
+        start = start or end - timedelta(days=29)
+        if (end - start).days >= MAX_DAILY_PERIODS:
+            raise InvalidReliabilityQuery(f"daily trends cover at most {MAX_DAILY_PERIODS} days")
+    if start > end:
+        raise InvalidReliabilityQuery('start must not be after end')
+
+    rows = db.session.execute(
+        select(rollup_table.c.period, *[func.sum(rollup_table.c[name]) for name in MEASURES])
+        .where(rollup_table.c.grain == grain, rollup_table.c.dimension == dimension,
+               rollup_table.c.dimension_key == key, rollup_table.c.period.between(start, end))
+        .group_by(rollup_table.c.period)
+    )
+    by_period = {period: measures for period, *measures in rows}
+    assets = _asset_counts(dimension, [key]).get(key, 0)
+
+    periods = []
+    totals = [0] * len(MEASURES)
+    period = start
+    while period <= end:
+        period_end = _month_end(period) if grain == 'month' else period
+        measures = by_period.get(period, [0] * len(MEASURES))
+        totals = [total + (value or 0) for total, value in zip(totals, measures)]
+        metrics = _metrics([value or 0 for value in measures], assets, _window_hours(period, period_end, today))
+        periods.append(dict(period=period.isoformat(), **metrics))
+        period = period_end + timedelta(days=1)
+    return {
+        'dimension': dimension,
+        'key': key or None,
+        'grain': grain,
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'assets': assets,
+        'totals': _metrics(totals, assets, _window_hours(start, end, today)),
+        'periods': periods,
+    }
+
+
+def _period_segments(start, end):
+    """(grain, first, last) rollup ranges covering [start, end]: whole months, plus days at partial month edges"""
+    months_from = start if start.day == 1 else _month_end(start) + timedelta(days=1)
+    months_to = end if end == _month_end(end) else _month_start(end) - timedelta(days=1)
+    if months_from > months_to:
+        return [('day', start, end)]
+    segments = [('month', months_from, months_to)]
+    if start < months_from:
+        segments.append(('day', start, months_from - timedelta(days=1)))
+    if end > months_to:
+        segments.append(('day', months_to + timedelta(days=1), end))
+    return segments
+
+
+def _segment_rows(dimension, segments, filters):
+    """Rollup rows of a dimension for (grain, first, last) segments, as a subquery.
+
+    One SELECT per segment rather than an OR, so each one can use the
+    (grain, dimension, dimension_key, period) index when keys are filtered.
+    """
+    return union_all(*[
+        select(rollup_table.c.dimension_key, *[rollup_table.c[name] for name in MEASURES])
+        .where(rollup_table.c.grain == grain, rollup_table.c.dimension == dimension,
+               rollup_table.c.period.between(first, last), *filters)
+        for grain, first, last in segments
+    ]).subquery()
+
+
+def reliability_breakdown(dimension, start=None, end=None, sort='cost', limit=20, category=None, team_id=None,
+                          today=None):
+    """Keys of a dimension ranked by a measure over [start, end] (default: last 365 days).
+
+    Equipment rankings can be narrowed to one category or maintenance team,
+    which reads the rollups of that equipment only; a fleet-wide equipment
+    ranking has to sum one rollup row per equipment and month of the window.
+    """
+    _check(dimension)
+    if dimension == 'all':
+        raise InvalidReliabilityQuery('breakdowns need the equipment, category or team dimension')
+    if (category or team_id) and dimension != 'equipment':
+        raise InvalidReliabilityQuery('category and team_id only narrow equipment breakdowns')
+    if sort not in BREAKDOWN_SORTS:
+        raise InvalidReliabilityQuery(f"sort must be one of {', '.join(BREAKDOWN_SORTS)}")
+    today = today or date.today()
+    end = end or today
+    start = start or end - timedelta(days=364)
+    if start > end:
+        raise InvalidReliabilityQuery('start must not be after end')
+
+    scope = []
+    if category:
+        scope.append(Equipment.category == category)
+    if team_id:
+        scope.append(Equipment.maintenance_team_id == team_id)
+    if scope:
+        scope = [rollup_table.c.dimension_key.in_(select(cast(Equipment.id, db.String)).where(*scope))]
+    source = _segment_rows(dimension, _period_segments(start, end), scope)
+    rows = db.session.execute(
+        select(source.c.dimension_key, *[func.sum(source.c[name]) for name in MEASURES])
+        .group_by(source.c.dimension_key)
+        # Rows emptied by deletes and equipment moves stay behind at zero
+        .having(func.sum(source.c.events) > 0)
+        .order_by(func.sum(source.c[sort]).desc(), source.c.dimension_key)
+        .limit(limit)
+    ).all()
+    keys = [row[0] for row in rows]
+    assets = _asset_counts(dimension, keys)
+    names = _key_names(dimension, keys)
+    hours = _window_hours(start, end, today)
+    return {
+        'dimension': dimension,
+        'start': start.isoformat(),
+        'end': end.isoformat(),
+        'sort': sort,
+        'category': category or None,
+        'team_id': team_id or None,
+        'items': [dict(key=key, name=names.get(key), assets=assets.get(key, 0),
+                       **_metrics([value or 0 for value in measures], assets.get(key, 0), hours))
+                  for key, *measures in rows],
+    }
@@ -0,0 +1,204 @@
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func
+
+from extensions import db
+from models import REQUEST_PRIORITIES, REQUEST_STATUSES, REQUEST_TYPES, Request
+from dashboard_stats import request_counter_groups
+from pagination import DEFAULT_PAGE_SIZE, Page, decode_cursor, encode_cursor, keyset_paginate
+from queries import request_query
+
+# Columns a start/end range can apply to
+DATE_FIELDS = {
+    'created': Request.created_at,
+    'due': Request.due_date,
+    'scheduled': Request.scheduled_date,
+}
+# Listing orders: (keyset columns, descending); the last column is unique
+REQUEST_SORTS = {
+    'newest': ((Request.created_at, Request.id), True),
+    'oldest': ((Request.created_at, Request.id), False),
+    'due': ((Request.due_date, Request.id), False),
+    'updated': ((Request.updated_at, Request.id), True),
+}
+# Columns the facet counts are grouped by
+FACETS = ('status', 'type', 'priority', 'team_id')
+
+
+class InvalidRequestFilter(ValueError):
+    pass
+
+
+def _values(args, name, allowed):
+    """Values of a repeated and/or comma separated argument, checked against allowed"""
+    values = list(dict.fromkeys(v.strip() for arg in args.getlist(name) for v in arg.split(',') if v.strip()))
+    unknown = [v for v in values if v not in allowed]
+    if unknown:
+        raise InvalidRequestFilter(f"Unknown {name}: {', '.join(unknown)}")
+    return values
+
+
+def _id(args, name):
+    value = args.get(name)
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise InvalidRequestFilter(f"Invalid '{name}', expected an id")
+
+
+def _date(args, name):
+    value = args.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except ValueError:
+        raise InvalidRequestFilter(f"Invalid '{name}' date, expected YYYY-MM-DD")
+
+
+@dataclass
+class RequestFilters:
+    """Filters and order of the requests listing, as given in its URL"""
+    statuses: list = field(default_factory=list)
+    types: list = field(default_factory=list)
+    priorities: list = field(default_factory=list)
+    technician_id: int = None
+    team_id: int = None
+    equipment_id: int = None
+    date_field: str = 'created'
+    start: date = None
+    end: date = None
+    overdue: bool = False
+    sort: str = 'newest'
+
+    @classmethod
+    def from_args(cls, args):
+        """Parse ?status=&type=&priority=&technician_id=&team_id=&equipment_id=
+        &date_field=&start=&end=&overdue=1&sort=; raises InvalidRequestFilter"""
+        date_field = args.get('date_field') or 'created'
+        sort = args.get('sort') or 'newest'
+        if date_field not in DATE_FIELDS:
+            raise InvalidRequestFilter(f'Unknown date_field: {date_field}')
+        if sort not in REQUEST_SORTS:
+            raise InvalidRequestFilter(f'Unknown sort: {sort}')
+        return cls(
+            statuses=_values(args, 'status', REQUEST_STATUSES),
+            types=_values(args, 'type', REQUEST_TYPES),
+            priorities=_values(args, 'priority', REQUEST_PRIORITIES),
+            technician_id=_id(args, 'technician_id'),
+            team_id=_id(args, 'team_id'),
+            equipment_id=_id(args, 'equipment_id'),
+            date_field=date_field,
+            start=_date(args, 'start'),
+            end=_date(args, 'end'),
+            overdue=args.get('overdue') == '1',
+            sort=sort,
+        )
+
+    @property
+    def counted(self):
+        """True if the materialized request counters can answer the facets"""
+        return not (self.technician_id or self.equipment_id or self.start or self.end or self.overdue)
+
+    @property
+    def active(self):
+        return bool(self.statuses or self.types or self.priorities or self.technician_id or self.team_id
+                    or self.equipment_id or self.start or self.end or self.overdue)
+
+    def clauses(self):
+        clauses = []
+        if self.statuses:
+            clauses.append(Request.status.in_(self.statuses))
+        if self.types:
+            clauses.append(Request.type.in_(self.types))
+        if self.priorities:
+            clauses.append(Request.priority.in_(self.priorities))
+        for column, value in ((Request.technician_id, self.technician_id), (Request.team_id, self.team_id),
+                              (Request.equipment_id, self.equipment_id)):
+            if value:
+                clauses.append(column == value)
+        column = DATE_FIELDS[self.date_field]
+        # created_at is a timestamp, so its range ends before the day after end
+        if self.start:
+            clauses.append(column >= (datetime.combine(self.start, datetime.min.time())
+                                      if self.date_field == 'created' else self.start))
+        if self.end:
+            clauses.append(column < datetime.combine(self.end + timedelta(days=1), datetime.min.time())
+                           if self.date_field == 'created' else column <= self.end)
+        if self.overdue:
+            clauses.append(Request.overdue == True)
+        return clauses
+
+
+def _by_due_date(query, cursor, limit):
+    """Page ordered by due date, then the requests without one by id.
+
+    Keyset comparisons never match NULL, so the undated requests are a
+    second range read once the dated ones run out; their cursors carry a
+    null due date.
+    """
+    dated = query.filter(Request.due_date.isnot(None))
+    undated = query.filter(Request.due_date.is_(None))
+    if cursor:
+        due_date, after_id = decode_cursor(cursor, 2)
+        if due_date is not None:
+            page = keyset_paginate(dated, REQUEST_SORTS['due'][0], cursor=cursor, limit=limit)
+            if page.next_cursor:
+                return page
+            items, after_id = page.items, 0
+        else:
+            items = []
+    else:
+        page = keyset_paginate(dated, REQUEST_SORTS['due'][0], limit=limit)
+        if page.next_cursor:
+            return page
+        items, after_id = page.items, 0
+
+    remaining = limit - len(items)
+    if remaining == 0:
+        more = undated.filter(Request.id > after_id).enable_eagerloads(False).first() is not None
+        return Page(items=items, next_cursor=encode_cursor([None, after_id]) if more else None)
+    rest = keyset_paginate(undated, [Request.id], cursor=encode_cursor([after_id]), limit=remaining)
+    items = items + rest.items
+    return Page(items=items, next_cursor=encode_cursor([None, items[-1].id]) if rest.next_cursor else None)
+
+
+def list_requests(filters, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """One page of the requests matching filters, in filters.sort order"""
+    query = request_query('list').filter(*filters.clauses())
+    if filters.sort == 'due':
+        return _by_due_date(query, cursor, limit)
+    columns, descending = REQUEST_SORTS[filters.sort]
+    return keyset_paginate(query, columns, cursor=cursor, limit=limit, descending=descending)
+
+
+def request_facets(filters):
+    """Counts of the matching requests per status, type, priority and team, plus the total.
+
+    Filters on those four columns alone are answered from the materialized
+    dashboard counters, a few rows per team; any other filter groups the
+    matching requests in one query.
+    """
+    rows = None
+    if filters.counted:
+        rows = request_counter_groups(status=filters.statuses, type=filters.types, priority=filters.priorities,
+                                      team_id=[filters.team_id] if filters.team_id else None)
+    if rows is None:
+        rows = db.session.query(Request.status, Request.type, Request.priority, Request.team_id,
+                                func.count(Request.id)) \
+            .filter(*filters.clauses()) \
+            .group_by(Request.status, Request.type, Request.priority, Request.team_id).all()
+
+    facets = {name: Counter() for name in FACETS}
+    total = 0
+    for row in rows:
+        *key, count = row
+        for name, value in zip(FACETS, key):
+            facets[name][value] += count
+        total += count
+    facets['total'] = total
+    return facets
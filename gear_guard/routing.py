@@ -0,0 +1,84 @@
+import sqlite3
+import time
+from functools import wraps
+
+from flask import current_app, g, has_request_context, request, session
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.engine.url import make_url
+
+# Bind key of the read replica in SQLALCHEMY_BINDS
+REPLICA_BIND = 'replica'
+
+
+class RoutingSession(Session):
+    """db.session that sends SELECTs of replica-routed requests to the replica bind.
+
+    Everything else (flushes, Core writes, explicit connection() calls) stays
+    on the primary, as do requests that were not routed with @read_replica.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (bind is None and not self._flushing and has_request_context() and g.get('use_replica')
+                and getattr(clause, 'is_select', False) and REPLICA_BIND in self._db.engines):
+            return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _remember_write(db_session):
+    if has_request_context():
+        g.wrote_primary = True
+
+
+def _recently_wrote():
+    return session.get('primary_until', 0) > time.time()
+
+
+def read_replica(f):
+    """Serve a read-only GET view from the replica, if one is configured.
+
+    A client that committed a write in the last REPLICA_STICKY_SECONDS
+    (e.g. POST then redirect) keeps reading from the primary, so it sees
+    its own change despite replication lag.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if request.method in ('GET', 'HEAD') and not _recently_wrote():
+            g.use_replica = True
+        return f(*args, **kwargs)
+    return decorated_function
+
+
+def _stick_to_primary(response):
+    if g.get('wrote_primary') and REPLICA_BIND in current_app.config.get('SQLALCHEMY_BINDS', {}):
+        session['primary_until'] = time.time() + current_app.config['REPLICA_STICKY_SECONDS']
+    return response
+
+
+def init_routing(app):
+    """Register the read-your-writes hook; call after db.init_app(app)"""
+    app.config.setdefault('REPLICA_STICKY_SECONDS', 5)
+    app.after_request(_stick_to_primary)
+
+
+def _sqlite_path(engine):
+    url = make_url(str(engine.url))
+    if url.get_backend_name() != 'sqlite' or not url.database or url.database == ':memory:':
+        raise ValueError('sync-replica only copies file-based SQLite databases')
+    return url.database
+
+
+def sync_sqlite_replica(db):
+    """Copy the primary SQLite database over the replica file (local testing only)"""
+    primary = _sqlite_path(db.engines[None])
+    replica = _sqlite_path(db.engines[REPLICA_BIND])
+    db.engines[REPLICA_BIND].dispose()
+    source = sqlite3.connect(primary)
+    target = sqlite3.connect(replica)
+    try:
+        # The backup API takes a consistent snapshot even while the app writes
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
@@ -0,0 +1,283 @@
+import re
+
+from sqlalchemy import bindparam, select, text
+
+from extensions import db
+from models import MaintenanceHistory
+
+# Indexed document kinds and their codes in search_index. The index itself,
+# and the triggers that keep it in sync with every insert, update and delete
+# (ORM or bulk), are created by the full text search migration: an FTS5 table
+# on SQLite, a tsvector column with a GIN index on PostgreSQL.
+SEARCH_KINDS = {'request': 3, 'equipment': 2, 'history': 1}
+KIND_NAMES = {code: kind for kind, code in SEARCH_KINDS.items()}
+# FTS5 rowid = code * KIND_SPAN + source id: each kind is one rowid range,
+# which FTS5 can seek to when results are filtered by kind
+KIND_SPAN = 2 ** 40
+
+# Source table, title and body of each kind; {row} is the table name
+SEARCH_SOURCES = {
+    'request': ('request', "{row}.title", "coalesce({row}.description, '')"),
+    'equipment': ('equipment', "{row}.name",
+                  "coalesce({row}.category, '') || ' ' || coalesce({row}.location, '') || ' ' || "
+                  "coalesce({row}.description, '')"),
+    'history': ('maintenance_history', "coalesce({row}.action_type, '')",
+                "coalesce({row}.description, '') || ' ' || coalesce({row}.notes, '') || ' ' || "
+                "coalesce({row}.parts_replaced, '')"),
+}
+
+MAX_RESULTS = 50
+MAX_QUERY_TERMS = 8
+# bm25 and ts_rank read each term's whole posting list, so above this many
+# matches results are ordered title matches first, newest first instead
+RANKED_MATCH_LIMIT = 1000
+# Prefix lengths with an FTS5 prefix index (prefix='2 3 4 5' in the migration).
+# Longer prefixes are matched on their indexed part and checked in Python,
+# an unindexed prefix query would merge the posting lists of every term.
+MIN_PREFIX_LENGTH = 2
+INDEXED_PREFIX_LENGTH = 5
+TERM_PATTERN = re.compile(r'[^\W_]+')
+
+
+def search_terms(q):
+    """Lower-cased word tokens of a user query; punctuation and operators are dropped"""
+    return TERM_PATTERN.findall((q or '').lower())[:MAX_QUERY_TERMS]
+
+
+# SQLite / FTS5
+
+_FTS5_RANKED = """
+    SELECT rowid FROM search_index
+    WHERE search_index MATCH :match AND rowid IN :rowids
+    ORDER BY rank LIMIT :limit
+"""
+
+_FTS5_NEWEST = """
+    SELECT rowid FROM search_index
+    WHERE search_index MATCH :match AND rowid BETWEEN :low AND :high
+    ORDER BY rowid DESC LIMIT :limit
+"""
+
+_FTS5_WINDOW = """
+    SELECT rowid FROM search_index
+    WHERE search_index MATCH :match AND rowid BETWEEN :low AND :high
+"""
+
+_FTS5_ROWS = """
+    SELECT rowid, title, body, snippet(search_index, 1, '', '', '...', 12) AS snippet
+    FROM search_index
+    WHERE search_index MATCH :match AND rowid IN :rowids
+"""
+
+
+def _fts5_match(terms, prefix, title_only=False):
+    # Quoting plain word tokens keeps user input from being read as query syntax
+    parts = [f'"{term}"' for term in terms]
+    if prefix:
+        parts[-1] = f'"{terms[-1][:INDEXED_PREFIX_LENGTH]}"*'
+    expression = ' '.join(parts)
+    return f'title : ({expression})' if title_only else expression
+
+
+def _kind_range(code):
+    return (code * KIND_SPAN, (code + 1) * KIND_SPAN - 1) if code else (0, len(SEARCH_KINDS) * 2 * KIND_SPAN)
+
+
+def _fts5_newest(match, low, high, limit):
+    return db.session.execute(
+        text(_FTS5_NEWEST), {'match': match, 'low': low, 'high': high, 'limit': limit}
+    ).scalars().all()
+
+
+def _fts5_title_first(terms, prefix, newest, count):
+    # Title matches are looked up among the newest matches only, so a query
+    # whose words are rarely in titles does not scan whole posting lists.
+    # The window is read in ascending order: a descending FTS5 scan does not
+    # stop at the lower rowid bound.
+    in_title = db.session.execute(text(_FTS5_WINDOW), {
+        'match': _fts5_match(terms, prefix, title_only=True), 'low': newest[-1], 'high': newest[0],
+    }).scalars().all()
+    return list(dict.fromkeys(sorted(in_title, reverse=True)[:count] + newest))[:count]
+
+
+def _fts5_candidates(terms, prefix, code, count):
+    match = _fts5_match(terms, prefix)
+    newest = _fts5_newest(match, *_kind_range(code), RANKED_MATCH_LIMIT + 1)
+    if not newest:
+        return []
+    if len(newest) > RANKED_MATCH_LIMIT:
+        rowids = _fts5_title_first(terms, prefix, newest, count)
+    else:
+        # bm25 reads the whole posting list of each term for its document
+        # frequency. Terms matching more than RANKED_MATCH_LIMIT documents add
+        # little to the order, so only the rarer ones are scored; the rowid
+        # list still requires every term.
+        last = len(terms) - 1
+        rare = [i for i, term in enumerate(terms)
+                if len(_fts5_newest(_fts5_match([term], prefix and i == last), *_kind_range(None),
+                                    RANKED_MATCH_LIMIT + 1)) <= RANKED_MATCH_LIMIT]
+        if rare:
+            rowids = db.session.execute(
+                text(_FTS5_RANKED).bindparams(bindparam('rowids', expanding=True)),
+                {'match': _fts5_match([terms[i] for i in rare], prefix and last in rare),
+                 'rowids': newest, 'limit': count}
+            ).scalars().all()
+        else:
+            rowids = _fts5_title_first(terms, prefix, newest, count)
+    return [divmod(rowid, KIND_SPAN) for rowid in rowids]
+
+
+def _fts5_rows(terms, prefix, keys):
+    rows = db.session.execute(
+        text(_FTS5_ROWS).bindparams(bindparam('rowids', expanding=True)),
+        {'match': _fts5_match(terms, prefix), 'rowids': [code * KIND_SPAN + ref_id for code, ref_id in keys]}
+    )
+    return {divmod(row.rowid, KIND_SPAN): row for row in rows}
+
+
+# PostgreSQL / tsvector
+
+_TSQUERY_RANKED = """
+    SELECT kind, ref_id FROM search_index, to_tsquery('simple', :match) AS query
+    WHERE document @@ query {kind_filter}
+    ORDER BY ts_rank(document, query) DESC LIMIT :limit
+"""
+
+_TSQUERY_MATCHES = """
+    SELECT kind, ref_id FROM search_index
+    WHERE document @@ to_tsquery('simple', :match) {kind_filter}
+    {order} LIMIT :limit
+"""
+
+_TSQUERY_ROWS = """
+    SELECT kind, ref_id, title, body,
+           ts_headline('simple', body, to_tsquery('simple', :match),
+                       'StartSel="",StopSel="",MaxWords=12,MinWords=4') AS snippet
+    FROM search_index
+    WHERE (kind, ref_id) IN (SELECT * FROM unnest(CAST(:kinds AS SMALLINT[]), CAST(:ref_ids AS INTEGER[])))
+"""
+
+
+def _tsquery_match(terms, prefix, title_only=False):
+    # Weight A is the title, see the generated document column
+    weight = 'A' if title_only else ''
+    parts = [f'{term}:{weight}' if weight else term for term in terms]
+    if prefix:
+        parts[-1] = f'{terms[-1]}:*{weight}'
+    return ' & '.join(parts)
+
+
+def _tsquery_execute(sql, code, order='', **params):
+    statement = text(sql.format(kind_filter='AND kind = :code' if code else '', order=order))
+    if code:
+        params['code'] = code
+    return [(row.kind, row.ref_id) for row in db.session.execute(statement, params)]
+
+
+def _tsquery_candidates(terms, prefix, code, count):
+    match = _tsquery_match(terms, prefix)
+    matches = _tsquery_execute(_TSQUERY_MATCHES, code, match=match, limit=RANKED_MATCH_LIMIT + 1)
+    if len(matches) <= RANKED_MATCH_LIMIT:
+        # ts_rank has no document frequencies to read, every term is scored
+        return _tsquery_execute(_TSQUERY_RANKED, code, match=match, limit=count)
+    newest = 'ORDER BY kind DESC, ref_id DESC'
+    in_title = _tsquery_execute(_TSQUERY_MATCHES, code, order=newest,
+                                match=_tsquery_match(terms, prefix, title_only=True), limit=count)
+    others = _tsquery_execute(_TSQUERY_MATCHES, code, order=newest, match=match, limit=count)
+    return list(dict.fromkeys(in_title + others))[:count]
+
+
+def _tsquery_rows(terms, prefix, keys):
+    rows = db.session.execute(text(_TSQUERY_ROWS), {
+        'match': _tsquery_match(terms, prefix),
+        'kinds': [code for code, _ in keys],
+        'ref_ids': [ref_id for _, ref_id in keys],
+    })
+    return {(row.kind, row.ref_id): row for row in rows}
+
+
+def _has_prefix(row, prefix):
+    return any(word.startswith(prefix) for word in TERM_PATTERN.findall(f'{row.title} {row.body}'.lower()))
+
+
+def search(q, kind=None, limit=20, prefix=True):
+    """Best matches for q across requests, equipment and maintenance history.
+
+    Every word must match; with prefix the last one may be the start of a
+    longer word (search-as-you-type). Small result sets are ranked by
+    relevance (bm25 / ts_rank, titles weigh more), large ones list title
+    matches first, newest first. Returns dicts with kind, id, title and
+    snippet, plus equipment_id for history entries.
+    """
+    terms = search_terms(q)
+    if not terms:
+        return []
+    prefix = prefix and len(terms[-1]) >= MIN_PREFIX_LENGTH
+    limit = min(limit, MAX_RESULTS)
+    code = SEARCH_KINDS[kind] if kind else None
+    if db.session.get_bind().dialect.name == 'postgresql':
+        candidates, fetch_rows = _tsquery_candidates, _tsquery_rows
+        check_prefix = False
+    else:
+        candidates, fetch_rows = _fts5_candidates, _fts5_rows
+        check_prefix = prefix and len(terms[-1]) > INDEXED_PREFIX_LENGTH
+
+    # A truncated prefix can match words the full one does not, so take a
+    # longer candidate list and keep the rows that really contain it
+    keys = candidates(terms, prefix, code, RANKED_MATCH_LIMIT if check_prefix else limit)
+    results = []
+    for offset in range(0, len(keys), MAX_RESULTS):
+        chunk = keys[offset:offset + MAX_RESULTS]
+        rows = fetch_rows(terms, prefix, chunk)
+        for key in chunk:
+            row = rows.get(key)
+            if row is None or (check_prefix and not _has_prefix(row, terms[-1])):
+                continue
+            results.append({'kind': KIND_NAMES[key[0]], 'id': key[1], 'title': row.title, 'snippet': row.snippet})
+        if len(results) >= limit:
+            break
+    results = results[:limit]
+
+    history_ids = [result['id'] for result in results if result['kind'] == 'history']
+    if history_ids:
+        equipment_ids = dict(db.session.execute(
+            select(MaintenanceHistory.id, MaintenanceHistory.equipment_id)
+            .where(MaintenanceHistory.id.in_(history_ids))
+        ).all())
+        for result in results:
+            if result['kind'] == 'history':
+                result['equipment_id'] = equipment_ids.get(result['id'])
+    return results
+
+
+def suggest(q, limit=10):
+    """Distinct titles for the words typed so far, best match first"""
+    suggestions = []
+    for result in search(q, limit=limit * 2):
+        if result['title'] and result['title'] not in suggestions:
+            suggestions.append(result['title'])
+    return suggestions[:limit]
+
+
+def rebuild_search_index():
+    """Re-index every request, equipment and history row (e.g. after a restore)"""
+    dialect = db.session.get_bind().dialect.name
+    db.session.execute(text("DELETE FROM search_index"))
+    for kind, (table, title, body) in SEARCH_SOURCES.items():
+        code = SEARCH_KINDS[kind]
+        title, body = title.format(row=table), body.format(row=table)
+        if dialect == 'postgresql':
+            db.session.execute(text(f"INSERT INTO search_index (kind, ref_id, title, body) "
+                                    f"SELECT {code}, id, {title}, {body} FROM {table}"))
+        else:
+            db.session.execute(text(f"INSERT INTO search_index (rowid, title, body) "
+                                    f"SELECT {code} * {KIND_SPAN} + id, {title}, {body} FROM {table}"))
+    if dialect == 'sqlite':
+        db.session.execute(text("INSERT INTO search_index(search_index) VALUES ('optimize')"))
+    db.session.commit()
+    return db.session.execute(text("SELECT count(*) FROM search_index")).scalar()
+
+
+def include_schema_name(name, type_, parent_names):
+    """Keep autogenerate away from the search tables it has no model for"""
+    return not (type_ == 'table' and name.startswith('search_index'))
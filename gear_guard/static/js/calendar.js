@@ -6,6 +6,8 @@ let currentDate = new Date();
 let globalTasks = [];
 let selectedDate = null;
 let technicians = [];
+// Requests per month, keyed by "YYYY-MM"; values are fetch promises
+const monthCache = {};
 
 // Initialize Calendar
 document.addEventListener('DOMContentLoaded', function() {
@@ -13,6 +15,7 @@ document.addEventListener('DOMContentLoaded', function() {
     loadTasks();
     renderCalendar();
     setupFormHandlers();
+    connectChangeFeed();
 });
 
 // Load technicians for dropdown
@@ -43,18 +46,94 @@ function populateTechnicianDropdown() {
     });
 }
 
-// Load tasks from backend
+// Month helpers
+function monthKey(year, month) {
+    const d = new Date(year, month, 1);
+    return `${d.getFullYear()}-${String(d.getMonth() + 1).padStart(2, '0')}`;
+}
+
+// Fetch one month of requests (cached)
+function fetchMonth(year, month) {
+    const key = monthKey(year, month);
+    if (!monthCache[key]) {
+        const start = formatDate(new Date(year, month, 1));
+        const end = formatDate(new Date(year, month + 1, 0));
+        monthCache[key] = fetch(`/api/requests?start=${start}&end=${end}`)
+            .then(res => res.json())
+            .then(data => data.requests || [])
+            .catch(err => {
+                delete monthCache[key];
+                throw err;
+            });
+    }
+    return monthCache[key];
+}
+
+// Load tasks for the visible month and prefetch its neighbours
 function loadTasks() {
-    fetch('/api/requests')
-        .then(res => res.json())
-        .then(data => {
-            globalTasks = data.requests || [];
+    const year = currentDate.getFullYear();
+    const month = currentDate.getMonth();
+    const key = monthKey(year, month);
+    fetchMonth(year, month)
+        .then(tasks => {
+            // Ignore late responses after the user navigated away
+            if (monthKey(currentDate.getFullYear(), currentDate.getMonth()) !== key) return;
+            globalTasks = tasks;
             renderCalendar();
         })
         .catch(err => {
             console.error('Error loading tasks:', err);
             globalTasks = [];
         });
+    fetchMonth(year, month - 1).catch(() => {});
+    fetchMonth(year, month + 1).catch(() => {});
+}
+
+// Drop cached months so the next load hits the server
+function invalidateMonths() {
+    Object.keys(monthCache).forEach(key => delete monthCache[key]);
+}
+
+// Live updates: apply request changes from the server-sent change feed
+function taskDate(task) {
+    const value = task.scheduledDate || task.dueDate;
+    return value ? new Date(value) : null;
+}
+
+function applyChange(kind, change) {
+    const index = globalTasks.findIndex(t => t.id === change.id);
+    const merged = index >= 0 ? Object.assign({}, globalTasks[index], change) : change;
+    const date = kind === 'deleted' ? null : taskDate(merged);
+    const visible = !!date && date.getFullYear() === currentDate.getFullYear()
+        && date.getMonth() === currentDate.getMonth();
+
+    if (index >= 0 && !visible) {
+        globalTasks.splice(index, 1);
+    } else if (index >= 0) {
+        globalTasks[index] = merged;
+    } else if (visible && kind === 'created') {
+        globalTasks.push(merged);
+    } else if (visible) {
+        // A partial update moved an unknown task into view; refetch this month
+        invalidateMonths();
+        loadTasks();
+        return;
+    }
+    // Cached neighbouring months may be affected too
+    const current = monthKey(currentDate.getFullYear(), currentDate.getMonth());
+    Object.keys(monthCache).forEach(key => {
+        if (key !== current) delete monthCache[key];
+    });
+    monthCache[current] = Promise.resolve(globalTasks.slice());
+    renderCalendar();
+}
+
+function connectChangeFeed() {
+    if (!window.EventSource) return;
+    const source = new EventSource('/api/stream/requests');
+    ['created', 'updated', 'moved', 'deleted'].forEach(kind => {
+        source.addEventListener(kind, ev => applyChange(kind, JSON.parse(ev.data)));
+    });
 }
 
 // Render Calendar Grid
@@ -183,13 +262,19 @@ function formatDate(date) {
 
 // Navigation
 function previousMonth() {
+    currentDate.setDate(1);
     currentDate.setMonth(currentDate.getMonth() - 1);
+    globalTasks = [];
     renderCalendar();
+    loadTasks();
 }
 
 function nextMonth() {
+    currentDate.setDate(1);
     currentDate.setMonth(currentDate.getMonth() + 1);
+    globalTasks = [];
     renderCalendar();
+    loadTasks();
 }
 
 // Modal Management
@@ -280,6 +365,7 @@ function handleFormSubmit(e) {
         if (data.success) {
             showToast('Request Created Successfully!', 'success');
             closeCreateModal();
+            invalidateMonths();
             loadTasks(); // Reload tasks and re-render calendar
         } else {
             showToast('Error: ' + (data.message || 'Failed to create request'), 'error');
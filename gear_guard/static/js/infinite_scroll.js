@@ -0,0 +1,54 @@
+// Infinite scroll for keyset-paginated listings
+//
+// Markup: a container with data-next-cursor holding the first page, followed
+// by a .scroll-sentinel whose data-scroll-target is the container id. When the
+// sentinel scrolls into view the next page is fetched from the current URL
+// with ?partial=1&cursor=... and appended; the server returns the rendered
+// rows and the following cursor in the X-Next-Cursor header.
+
+function setupInfiniteScroll(sentinel) {
+	const container = document.getElementById(sentinel.dataset.scrollTarget);
+	if (!container) return;
+	let loading = false;
+
+	function loadMore() {
+		const cursor = container.dataset.nextCursor;
+		if (!cursor || loading) return;
+		loading = true;
+		const url = new URL(window.location.href);
+		url.searchParams.set('partial', '1');
+		url.searchParams.set('cursor', cursor);
+		fetch(url)
+			.then(res => {
+				if (!res.ok) throw new Error(`HTTP ${res.status}`);
+				container.dataset.nextCursor = res.headers.get('X-Next-Cursor') || '';
+				return res.text();
+			})
+			.then(html => {
+				container.insertAdjacentHTML('beforeend', html);
+				document.dispatchEvent(new CustomEvent('rows:loaded', { detail: { container } }));
+			})
+			.catch(err => {
+				console.error('Error loading more rows:', err);
+				container.dataset.nextCursor = '';
+			})
+			.finally(() => {
+				loading = false;
+				if (!container.dataset.nextCursor) {
+					observer.disconnect();
+				} else if (sentinel.getBoundingClientRect().top < window.innerHeight + 400) {
+					// Still in view: the observer will not fire again on its own
+					loadMore();
+				}
+			});
+	}
+
+	const observer = new IntersectionObserver(entries => {
+		if (entries.some(entry => entry.isIntersecting)) loadMore();
+	}, { rootMargin: '400px' });
+	observer.observe(sentinel);
+}
+
+document.addEventListener('DOMContentLoaded', () => {
+	document.querySelectorAll('.scroll-sentinel').forEach(setupInfiniteScroll);
+});
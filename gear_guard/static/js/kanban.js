@@ -21,23 +21,75 @@ function typeBadgeClass(task) {
 	return task.type === 'CORRECTIVE' ? 'badge orange' : 'badge purple';
 }
 
+// Moves are coalesced per task and sent in one batch after a short pause
+const MOVE_DEBOUNCE_MS = 400;
+
 // Simple store
 const store = {
 	tasks: (window.KANBAN_DATA && window.KANBAN_DATA.tasks) ? window.KANBAN_DATA.tasks.slice() : [],
+	pendingMoves: new Map(),
+	flushTimer: null,
 	moveTask(id, newStatus) {
 		const t = this.tasks.find(x => x.id === id);
 		if (!t) return;
 		t.status = newStatus; // optimistic update
-		// persist to server
-		fetch('/kanban/move', {
+		// Keep the version the server last confirmed; a later drag of the
+		// same card only replaces the target status
+		const pending = this.pendingMoves.get(id);
+		this.pendingMoves.set(id, {
+			taskId: id,
+			newStatus,
+			expectedUpdatedAt: pending ? pending.expectedUpdatedAt : t.updatedAt
+		});
+		clearTimeout(this.flushTimer);
+		this.flushTimer = setTimeout(() => this.flushMoves(), MOVE_DEBOUNCE_MS);
+		render();
+	},
+	flushMoves() {
+		if (!this.pendingMoves.size) return;
+		const moves = Array.from(this.pendingMoves.values());
+		this.pendingMoves.clear();
+		fetch('/kanban/move/batch', {
 			method: 'POST',
 			headers: { 'Content-Type': 'application/json' },
-			body: JSON.stringify({ taskId: id, newStatus })
-		}).catch(() => {/* ignore for now */});
+			body: JSON.stringify({ moves })
+		})
+			.then(res => res.json())
+			.then(data => {
+				if (!data.ok) throw new Error(data.error || 'Move failed');
+				this.applyResults(data.results || []);
+			})
+			.catch(err => console.error('Error saving moves:', err));
+	},
+	applyResults(results) {
+		let conflicts = 0;
+		results.forEach(r => {
+			const t = this.tasks.find(x => x.id === r.taskId);
+			if (!t) return;
+			if (r.result === 'not_found') {
+				this.tasks = this.tasks.filter(x => x.id !== r.taskId);
+				return;
+			}
+			// Someone else's newer move wins unless the user moved the card again
+			if (r.result === 'conflict') conflicts++;
+			t.updatedAt = r.updatedAt;
+			if (!this.pendingMoves.has(t.id)) t.status = r.status;
+		});
+		if (conflicts) {
+			console.warn(`${conflicts} card(s) were changed by someone else and have been refreshed`);
+		}
 		render();
 	}
 };
 
+// Do not lose a pending batch when leaving the page
+window.addEventListener('pagehide', () => {
+	if (!store.pendingMoves.size) return;
+	const moves = Array.from(store.pendingMoves.values());
+	store.pendingMoves.clear();
+	navigator.sendBeacon('/kanban/move/batch', new Blob([JSON.stringify({ moves })], { type: 'application/json' }));
+});
+
 // Drag & Drop setup
 let dragState = { draggingId: null };
 
@@ -109,7 +161,37 @@ function render() {
 	});
 }
 
-document.addEventListener('DOMContentLoaded', render);
+// Live updates: apply other users' changes from the server-sent change feed
+function applyChange(kind, change) {
+	const existing = store.tasks.find(x => x.id === change.id);
+	if (kind === 'deleted') {
+		store.tasks = store.tasks.filter(x => x.id !== change.id);
+	} else if (existing) {
+		// Keep the optimistic status of a card the user is still moving
+		const pending = store.pendingMoves.has(change.id);
+		const status = existing.status;
+		Object.assign(existing, change);
+		if (pending) existing.status = status;
+	} else if (kind === 'created') {
+		store.tasks.push(Object.assign({ status: 'NEW', type: 'CORRECTIVE' }, change));
+	} else {
+		return;
+	}
+	render();
+}
+
+function connectChangeFeed() {
+	if (!window.EventSource) return;
+	const source = new EventSource('/api/stream/requests');
+	['created', 'updated', 'moved', 'deleted'].forEach(kind => {
+		source.addEventListener(kind, ev => applyChange(kind, JSON.parse(ev.data)));
+	});
+}
+
+document.addEventListener('DOMContentLoaded', () => {
+	render();
+	connectChangeFeed();
+});
 
 // Expose for debugging
 window.KANBAN = { store, calculateTaskState };
@@ -0,0 +1,49 @@
+import os
+
+from bulk_import import ImportFileError, import_rows, read_rows
+from dashboard_stats import rollover_dashboard_counters
+from jobs import JobFailed, report_progress, task
+from maintenance_plans import generate_plan_requests
+from notifications import deliver_notifications
+from overdue import sweep_overdue
+
+
+# Not retried: a second run would import the rows created before the failure again
+@task('import_data', max_attempts=1)
+def import_data(kind, path, filename):
+    """Bulk import an upload saved by /api/import/<kind>; the report is the job result"""
+    try:
+        with open(path, 'rb') as f:
+            report = import_rows(kind, read_rows(f, filename),
+                                 on_progress=lambda report: report_progress(report.to_dict()))
+    except ImportFileError as e:
+        raise JobFailed(str(e))
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+    return report.to_dict()
+
+
+@task('deliver_notifications', max_attempts=5)
+def deliver_notifications_task():
+    """Send pending alerts to the NOTIFY_SINKS; a failed batch is retried with backoff"""
+    return {'sent': deliver_notifications()}
+
+
+@task('rollover_dashboard_counters', every='DASHBOARD_ROLLOVER_SECONDS')
+def rollover_dashboard_counters_task():
+    """Fold the due-date buckets that have passed into the overdue counter"""
+    return {'rolledOver': rollover_dashboard_counters()}
+
+
+@task('sweep_overdue', every='OVERDUE_SWEEP_SECONDS')
+def sweep_overdue_task():
+    """Flag requests whose due date passed since they were last saved and queue their alerts"""
+    flagged, cleared, queued = sweep_overdue()
+    return {'flagged': flagged, 'cleared': cleared, 'queued': queued}
+
+
+@task('generate_maintenance', every='MAINTENANCE_PLAN_SECONDS')
+def generate_maintenance_task():
+    """Create the preventive requests active maintenance plans have due within the horizon"""
+    return {'created': generate_plan_requests()}
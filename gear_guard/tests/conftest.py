@@ -0,0 +1,54 @@
+import os
+import shutil
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# config.py reads DATABASE_URL when the app is imported, so point it at a
+# scratch database first
+_tmp = tempfile.mkdtemp(prefix='gearguard-tests-')
+DATABASE_PATH = os.path.join(_tmp, 'test.db')
+os.environ['DATABASE_URL'] = f'sqlite:///{DATABASE_PATH}'
+
+from flask_migrate import upgrade  # noqa: E402
+
+from app import app as flask_app  # noqa: E402
+from extensions import db  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def migrated_database():
+    """A database file upgraded to head by the migrations, as `flask db upgrade` leaves it"""
+    with flask_app.app_context():
+        upgrade(directory=os.path.join(ROOT, 'migrations'))
+        db.engine.dispose()
+    template = os.path.join(_tmp, 'migrated.db')
+    shutil.copyfile(DATABASE_PATH, template)
+    yield template
+    shutil.rmtree(_tmp, ignore_errors=True)
+
+
+@pytest.fixture
+def app(migrated_database):
+    """The app on a fresh copy of the migrated database, running jobs inline"""
+    with flask_app.app_context():
+        db.engine.dispose()
+    for suffix in ('-wal', '-shm'):
+        if os.path.exists(DATABASE_PATH + suffix):
+            os.remove(DATABASE_PATH + suffix)
+    shutil.copyfile(migrated_database, DATABASE_PATH)
+    flask_app.config.update(TESTING=True, JOBS_INLINE=True,
+                            NOTIFY_LOG_PATH=os.path.join(_tmp, 'notifications.log'))
+    with flask_app.app_context():
+        yield flask_app
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
@@ -0,0 +1,37 @@
+from extensions import db
+from models import Equipment, Team, TeamMember
+
+
+def _add_team(size):
+    team = Team(name='Pumps team')
+    db.session.add(team)
+    db.session.flush()
+    for n in range(size):
+        db.session.add(TeamMember(name=f'Tech {n:02d}', email=f'tech{n}@example.com', team_id=team.id))
+        db.session.add(Equipment(name=f'Pump {n:02d}', category='Pumps', status='available',
+                                 maintenance_team_id=team.id))
+    db.session.commit()
+
+
+def test_members_api_keeps_the_bare_list_unless_paging_is_asked_for(client):
+    _add_team(5)
+    members = client.get('/api/members').get_json()
+    assert [m['name'] for m in members] == [f'Tech {n:02d}' for n in range(5)]
+
+    page = client.get('/api/members?limit=2').get_json()
+    assert [m['name'] for m in page['members']] == ['Tech 00', 'Tech 01']
+    rest = client.get(f"/api/members?limit=10&cursor={page['next_cursor']}").get_json()
+    assert [m['name'] for m in rest['members']] == ['Tech 02', 'Tech 03', 'Tech 04']
+    assert rest['next_cursor'] is None
+
+
+def test_equipment_api_returns_everything_unless_paging_is_asked_for(client):
+    _add_team(5)
+    equipment = client.get('/api/equipment').get_json()
+    assert 'next_cursor' not in equipment
+    assert [eq['name'] for eq in equipment['equipment']] == [f'Pump {n:02d}' for n in range(5)]
+
+    page = client.get('/api/equipment?limit=3').get_json()
+    assert [eq['name'] for eq in page['equipment']] == ['Pump 00', 'Pump 01', 'Pump 02']
+    assert page['next_cursor']
+    assert client.get('/api/equipment?cursor=bogus').status_code == 400
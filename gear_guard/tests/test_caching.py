@@ -0,0 +1,66 @@
+from datetime import date, timedelta
+
+from sqlalchemy import event, update
+
+from caching import table_validators
+from extensions import db
+from models import Equipment, Request, Team, TeamMember
+from overdue import sweep_overdue
+
+# Far in the future, so a Last-Modified comparison would always answer 304
+FUTURE = 'Sun, 01 Jan 2090 00:00:00 GMT'
+
+
+def _add_requests(count):
+    requests = [Request(title=f'Request {n}', type='CORRECTIVE', due_date=date.today() + timedelta(days=1))
+                for n in range(count)]
+    db.session.add_all(requests)
+    db.session.commit()
+    return requests
+
+
+def _revalidate(client, response):
+    """Status of a conditional GET with the validators a browser would send back"""
+    return client.get('/api/requests', headers={
+        'If-None-Match': response.headers['ETag'], 'If-Modified-Since': FUTURE}).status_code
+
+
+def test_unchanged_tables_revalidate(client):
+    _add_requests(2)
+    response = client.get('/api/requests')
+    assert 'Last-Modified' not in response.headers
+    assert _revalidate(client, response) == 304
+
+
+def test_delete_is_not_a_304(client):
+    requests = _add_requests(3)
+    response = client.get('/api/requests')
+    # Deleting an older row leaves max(updated_at) where it was
+    db.session.delete(requests[0])
+    db.session.commit()
+    assert _revalidate(client, response) == 200
+    assert client.get('/api/requests', headers={'If-Modified-Since': FUTURE}).status_code == 200
+
+
+def test_overdue_sweep_is_not_a_304(client):
+    _add_requests(1)
+    # Passes its due date without a save that would flag it
+    db.session.execute(update(Request).values(due_date=date.today() - timedelta(days=1),
+                                              updated_at=Request.updated_at))
+    db.session.commit()
+    response = client.get('/api/requests')
+    assert sweep_overdue() == (1, 0, 1)
+    assert _revalidate(client, response) == 200
+
+
+def test_validators_do_not_count_rows(app):
+    _add_requests(3)
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        table_validators((Team, TeamMember, Equipment, Request))
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+    assert len(statements) == 1
+    assert 'count(' not in statements[0].lower()
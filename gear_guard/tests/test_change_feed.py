@@ -0,0 +1,21 @@
+import change_feed
+from extensions import db
+from models import Equipment, Request
+
+
+def test_request_events_use_camel_case_keys(app):
+    equipment = Equipment(name='Pump 1')
+    db.session.add(equipment)
+    db.session.commit()
+    feed = change_feed.broker.subscribe()
+    try:
+        request = Request(title='Seal leak', type='CORRECTIVE', equipment_id=equipment.id)
+        db.session.add(request)
+        db.session.commit()
+        _, kind, payload = feed.get_nowait()
+    finally:
+        change_feed.broker.unsubscribe(feed)
+
+    assert kind == 'created'
+    assert payload['equipmentId'] == equipment.id
+    assert [key for key in payload if '_' in key] == []
@@ -0,0 +1,97 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import select
+
+from dashboard_stats import counter_table, rebuild_dashboard_counters, request_counter_groups
+from extensions import db
+from models import Equipment, MaintenanceHistory, Request, Team, TeamMember
+from reliability import MEASURES, rebuild_reliability_rollups, rollup_table
+from workload import load_table, pick_technician, rebuild_workload_index, technician_utilization
+
+
+def _totals(table, key_columns, value_columns):
+    """{key: values} of table with duplicate keys summed and all-zero rows dropped"""
+    totals = defaultdict(lambda: [0] * len(value_columns))
+    for row in db.session.execute(select(table)).mappings():
+        total = totals[tuple(row[name] for name in key_columns)]
+        for index, name in enumerate(value_columns):
+            total[index] += row[name]
+    return {key: [round(value, 6) for value in values] for key, values in totals.items() if any(values)}
+
+
+def _snapshot():
+    return (
+        _totals(counter_table, ('kind', 'status', 'type', 'priority', 'team_id', 'bucket_date'), ('count',)),
+        _totals(load_table, ('technician_id', 'day'), ('hours', 'open_requests')),
+        _totals(rollup_table, ('grain', 'period', 'dimension', 'dimension_key'), MEASURES),
+    )
+
+
+def test_incremental_counters_match_a_rebuild(app):
+    today = date.today()
+    teams = [Team(name='Electrical'), Team(name='Mechanical')]
+    db.session.add_all(teams)
+    db.session.flush()
+    members = [TeamMember(name=f'Tech {n}', email=f'tech{n}@example.com', team_id=teams[n % 2].id)
+               for n in range(4)]
+    equipment = [Equipment(name=f'Pump {n}', category='Pumps', status='available', maintenance_team_id=teams[n % 2].id)
+                 for n in range(3)]
+    db.session.add_all(members + equipment)
+    db.session.flush()
+    requests = [Request(title=f'Request {n}', type=('CORRECTIVE', 'PREVENTIVE')[n % 2], status='NEW_REQUEST',
+                        priority='HIGH', team_id=teams[n % 2].id, technician_id=members[n % 4].id,
+                        equipment_id=equipment[n % 3].id, due_date=today + timedelta(days=n - 3),
+                        estimated_hours=n or None)
+                for n in range(8)]
+    db.session.add_all(requests)
+    db.session.commit()
+    rebuild_dashboard_counters(today)
+    rebuild_workload_index()
+    rebuild_reliability_rollups()
+
+    db.session.add(Request(title='Undated', type='CORRECTIVE', team_id=teams[0].id, technician_id=members[0].id))
+    requests[0].status = 'IN_PROGRESS'
+    requests[1].status = 'COMPLETED'
+    requests[2].team_id = teams[0].id
+    requests[3].due_date = today + timedelta(days=30)
+    requests[4].technician_id = members[3].id
+    requests[5].scheduled_date = today + timedelta(days=2)
+    db.session.delete(requests[6])
+    equipment[0].status = 'maintenance'
+    members[1].status = 'inactive'
+    history = [MaintenanceHistory(equipment_id=equipment[n % 3].id, action_type=('REPAIR', 'INSPECTION')[n % 2],
+                                  performed_date=datetime(2025, 1 + n, 10), cost=100.0 * n, downtime_hours=n)
+               for n in range(4)]
+    db.session.add_all(history)
+    db.session.commit()
+    history[0].cost = 50.0
+    history[1].performed_date = datetime(2025, 6, 1)
+    db.session.delete(history[2])
+    equipment[1].category = 'Compressors'
+    equipment[2].maintenance_team_id = teams[0].id
+    db.session.commit()
+
+    incremental = _snapshot()
+    rebuild_dashboard_counters(today)
+    rebuild_workload_index()
+    rebuild_reliability_rollups()
+    assert incremental == _snapshot()
+
+
+def test_empty_keys_read_back_as_none(app):
+    team = Team(name='Electrical')
+    db.session.add(team)
+    db.session.flush()
+    technician = TeamMember(name='Priya Sharma', email='priya@example.com', team_id=team.id)
+    db.session.add(technician)
+    db.session.flush()
+    rebuild_dashboard_counters()
+    # No team, due date or schedule: stored under the counters' empty key values
+    db.session.add(Request(title='Unscheduled', type='CORRECTIVE', technician_id=technician.id, estimated_hours=3))
+    db.session.commit()
+
+    assert request_counter_groups() == [('NEW_REQUEST', 'CORRECTIVE', 'MEDIUM', None, 1)]
+    load = technician_utilization(start=date.today())[0]
+    assert (load['unscheduled_hours'], load['overdue_hours'], load['daily']) == (3, 0, [])
+    assert pick_technician(team.id) == technician.id
@@ -0,0 +1,50 @@
+from datetime import date, timedelta
+
+from sqlalchemy import event
+
+from dashboard_stats import compute_dashboard_stats, get_dashboard_stats, rebuild_dashboard_counters
+from extensions import db
+from jobs import enqueue_scheduled_tasks
+from models import DashboardCounter, Job, Request
+
+
+def _add_requests(today):
+    db.session.add_all([Request(title=f'Due in {days} days', type='CORRECTIVE', status='NEW_REQUEST',
+                                due_date=today + timedelta(days=days))
+                        for days in (-10, -3, -1, 0, 2)])
+    db.session.commit()
+
+
+def test_stats_page_does_not_write(client):
+    today = date.today()
+    # Counters last rolled over a week ago: three of the five requests fell due since
+    rebuild_dashboard_counters(today - timedelta(days=7))
+    _add_requests(today)
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement.split()[0].upper())
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        response = client.get('/api/dashboard/stats')
+        assert client.get('/').status_code == 200
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+
+    assert response.get_json()['stats']['overdue_requests'] == 3
+    assert response.get_json()['stats'] == compute_dashboard_stats(today).to_dict()
+    assert not {'INSERT', 'UPDATE', 'DELETE'} & set(statements)
+
+
+def test_scheduled_rollover_folds_passed_buckets(app):
+    today = date.today()
+    rebuild_dashboard_counters(today - timedelta(days=7))
+    _add_requests(today)
+    before = get_dashboard_stats(today)
+
+    assert 'rollover_dashboard_counters' in enqueue_scheduled_tasks()
+    assert enqueue_scheduled_tasks() == []
+    job = Job.query.filter_by(name='rollover_dashboard_counters').one()
+    assert (job.status, job.result) == ('succeeded', {'rolledOver': True})
+    passed = DashboardCounter.query.filter(DashboardCounter.kind == 'request_due',
+                                           DashboardCounter.bucket_date < today)
+    assert passed.count() == 0
+    assert get_dashboard_stats(today) == before == compute_dashboard_stats(today)
@@ -0,0 +1,80 @@
+import threading
+
+from database import retry_on_lock
+from employee_codes import allocate_employee_code, format_employee_code
+from extensions import db
+from models import Team, TeamMember
+
+THREADS = 8
+PER_THREAD = 5
+
+
+def _run_concurrently(work):
+    """Run work(thread_number) on THREADS threads started together; re-raise the first error"""
+    barrier = threading.Barrier(THREADS)
+    errors = []
+
+    def run(number):
+        try:
+            barrier.wait()
+            work(number)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(n,)) for n in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+
+
+def _team_id():
+    team = Team(name='Electrical')
+    db.session.add(team)
+    db.session.commit()
+    return team.id
+
+
+def _codes():
+    db.session.expire_all()
+    return sorted(db.session.execute(db.select(TeamMember.employee_id)).scalars())
+
+
+def test_concurrent_adds_get_unique_contiguous_codes(app):
+    team_id = _team_id()
+
+    def add_members(number):
+        client = app.test_client()
+        for n in range(PER_THREAD):
+            response = client.post('/members/add', data={
+                'name': f'Tech {number}-{n}', 'email': f'tech{number}.{n}@example.com', 'team_id': team_id})
+            assert response.status_code == 302
+
+    _run_concurrently(add_members)
+    assert _codes() == [format_employee_code(n) for n in range(1, THREADS * PER_THREAD + 1)]
+
+
+def test_rolled_back_allocations_give_their_codes_back(app):
+    team_id = _team_id()
+
+    @retry_on_lock
+    def add_member(name, keep):
+        db.session.add(TeamMember(name=name, email=f'{name}@example.com', team_id=team_id,
+                                  employee_id=allocate_employee_code()))
+        if keep:
+            db.session.commit()
+        else:
+            db.session.rollback()
+
+    def add_members(number):
+        # Each thread has its own app context, so its own session and connection
+        with app.app_context():
+            for n in range(PER_THREAD):
+                add_member(f'tech{number}x{n}', keep=n % 2 == 0)
+            db.session.remove()
+
+    _run_concurrently(add_members)
+    kept = THREADS * len(range(0, PER_THREAD, 2))
+    assert _codes() == [format_employee_code(n) for n in range(1, kept + 1)]
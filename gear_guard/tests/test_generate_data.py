@@ -0,0 +1,34 @@
+from datetime import date, timedelta
+
+from sqlalchemy import func, select, text
+
+from extensions import db
+from generate_data import clear_data, generate
+from models import Equipment, Job, MaintenancePlan, Notification, Request, TableVersion, User
+from overdue import sweep_overdue
+
+
+def test_clear_data_empties_every_table_but_users_and_versions(app):
+    generate(teams=2, members=6, equipment=5, requests=40, years=1, seed=1)
+    equipment_id = db.session.execute(select(Equipment.id)).scalars().first()
+    db.session.add_all([
+        MaintenancePlan(equipment_id=equipment_id, start_date=date.today()),
+        Request(title='Late inspection', type='PREVENTIVE', equipment_id=equipment_id,
+                due_date=date.today() - timedelta(days=1)),
+    ])
+    db.session.commit()
+    sweep_overdue()  # queues the job delivering the late request's alert
+    assert Notification.query.count() and Job.query.count()
+
+    # Deleting in the wrong order would fail on the foreign keys
+    db.session.execute(text('PRAGMA foreign_keys=ON'))
+    versions = dict(db.session.execute(select(TableVersion.table_name, TableVersion.version)).all())
+    clear_data()
+
+    kept = (User.__table__, TableVersion.__table__)
+    counts = {table.name: db.session.execute(select(func.count()).select_from(table)).scalar()
+              for table in db.metadata.sorted_tables if table not in kept}
+    assert {name: count for name, count in counts.items() if count} == {}
+    # The versions are bumped, not reset, so cached ETags do not match the regenerated data
+    for table_name in ('team', 'team_member', 'equipment', 'request'):
+        assert db.session.get(TableVersion, table_name).version == versions.get(table_name, 0) + 1
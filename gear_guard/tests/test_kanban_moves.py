@@ -0,0 +1,50 @@
+import sqlite3
+from datetime import date, timedelta
+
+from sqlalchemy.exc import OperationalError
+
+import app as app_module
+from extensions import db
+from models import Notification, Request
+
+
+def _move(client, request, new_status):
+    response = client.post('/kanban/move/batch', json={'moves': [
+        {'taskId': request.id, 'newStatus': new_status, 'expectedUpdatedAt': request.updated_at.isoformat()}]})
+    assert response.get_json()['results'][0]['result'] == 'ok'
+    db.session.refresh(request)
+
+
+def test_batch_moves_are_retried_on_a_lock_error(client, monkeypatch):
+    calls = []
+
+    def locked_once(moves):
+        calls.append(moves)
+        if len(calls) == 1:
+            raise OperationalError('UPDATE request', {}, sqlite3.OperationalError('database is locked'))
+        return {}
+
+    monkeypatch.setattr(app_module, 'apply_moves', locked_once)
+    monkeypatch.setitem(client.application.config, 'DB_LOCK_BACKOFF_MS', 0)
+    response = client.post('/kanban/move/batch', json={'moves': [{'taskId': 1, 'newStatus': 'IN_PROGRESS'}]})
+    assert response.status_code == 200
+    assert response.get_json() == {'ok': True, 'results': {}}
+    assert len(calls) == 2
+
+
+def test_reopened_cards_recompute_the_overdue_flag(client):
+    past_due = Request(title='Leaking valve', type='CORRECTIVE', status='COMPLETED',
+                       due_date=date.today() - timedelta(days=2))
+    not_due = Request(title='Worn belt', type='CORRECTIVE', status='COMPLETED',
+                      due_date=date.today() + timedelta(days=2))
+    db.session.add_all([past_due, not_due])
+    db.session.commit()
+    assert not past_due.overdue and Notification.query.count() == 0
+
+    _move(client, past_due, 'IN_PROGRESS')
+    _move(client, not_due, 'IN_PROGRESS')
+    assert (past_due.overdue, not_due.overdue) == (True, False)
+    assert Notification.query.filter_by(request_id=past_due.id, status='pending').count() == 1
+
+    _move(client, past_due, 'COMPLETED')
+    assert not past_due.overdue
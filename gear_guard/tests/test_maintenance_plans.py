@@ -0,0 +1,76 @@
+from datetime import date
+
+import pytest
+
+from extensions import db
+from jobs import enqueue_scheduled_tasks
+from models import Equipment, Job, MaintenancePlan, Request, Team, TeamMember
+
+
+@pytest.fixture
+def equipment(app):
+    team = Team(name='Mechanical')
+    db.session.add(team)
+    db.session.flush()
+    technician = TeamMember(name='Amit Patel', email='amit@example.com', team_id=team.id)
+    equipment = Equipment(name='Air compressor', maintenance_team_id=team.id)
+    db.session.add_all([technician, equipment])
+    db.session.commit()
+    return equipment
+
+
+@pytest.mark.parametrize('payload, message', [
+    ({'due_after_days': 'x'}, 'due_after_days must be a whole number'),
+    ({'due_after_days': -1}, 'due_after_days must be between 0 and 365'),
+    ({'estimated_hours': 'abc'}, 'estimated_hours must be a number'),
+    ({'estimated_hours': -2}, 'estimated_hours must be between 0 and 1000'),
+    ({'estimated_hours': 'nan'}, 'estimated_hours must be a number'),
+    ({'technician_id': 'zz'}, 'technician_id must be a whole number'),
+    ({'technician_id': 999}, 'technician_id 999 is not a team member'),
+    ({'priority': 'SOMEDAY'}, 'priority must be one of LOW, MEDIUM, HIGH, URGENT'),
+    ({'interval': 0}, 'interval must be between 1 and 3650'),
+    ({'interval': 2.5}, 'interval must be a whole number'),
+    ({'interval': True}, 'interval must be a whole number'),
+    ({'start_date': '2025-13-01'}, 'start_date must be a date (YYYY-MM-DD)'),
+    ({'start_date': '2025-06-01', 'end_date': '2025-05-01'}, 'end_date must not be before start_date'),
+    ({'title': 42}, 'title must be text'),
+    ({'rule': 'weekly', 'weekday': 7}, 'weekday must be between 0 and 6'),
+    ({'rule': 'monthly', 'day_of_month': '1st'}, 'day_of_month must be a whole number'),
+    ({'rule': 'usage', 'interval': 100}, 'usage plans need daily_usage_hours > 0'),
+    ({'rule': 'usage', 'interval': 100, 'daily_usage_hours': 30}, 'daily_usage_hours must be between 0 and 24'),
+])
+def test_invalid_plans_are_rejected(client, equipment, payload, message):
+    response = client.post(f'/api/equipment/{equipment.id}/plans', json=payload)
+
+    assert response.status_code == 400
+    assert response.get_json() == {'success': False, 'message': message}
+    assert MaintenancePlan.query.count() == 0
+    assert Request.query.count() == 0
+
+
+def test_valid_plan_generates_requests(client, equipment):
+    technician = TeamMember.query.one()
+    response = client.post(f'/api/equipment/{equipment.id}/plans', json={
+        'rule': 'weekly', 'interval': '2', 'weekday': 0, 'priority': 'HIGH', 'estimated_hours': '1.5',
+        'due_after_days': '3', 'technician_id': str(technician.id),
+    })
+
+    assert response.status_code == 201
+    plan = response.get_json()['plan']
+    assert (plan['interval'], plan['estimated_hours'], plan['due_after_days'], plan['technician_id']) == \
+        (2, 1.5, 3, technician.id)
+    assert response.get_json()['created_requests'] > 0
+    assert {request.technician_id for request in Request.query} == {technician.id}
+
+
+def test_workers_generate_plan_requests(app, equipment):
+    # Saved without the API, so nothing was generated for it yet
+    db.session.add(MaintenancePlan(equipment_id=equipment.id, title='Drain condensate', rule='interval',
+                                   interval=7, start_date=date.today()))
+    db.session.commit()
+
+    assert 'generate_maintenance' in enqueue_scheduled_tasks()
+    job = Job.query.filter_by(name='generate_maintenance').one()
+    assert job.status == 'succeeded'
+    assert job.result['created'] == Request.query.count() > 0
+    assert MaintenancePlan.query.one().generated_until is not None
@@ -0,0 +1,61 @@
+import json
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import insert
+
+import change_feed
+from extensions import db
+from jobs import enqueue_scheduled_tasks
+from models import Notification, Request
+from overdue import sweep_overdue
+
+
+def test_saved_request_is_flagged_at_once(app):
+    request = Request(title='Leaking valve', type='CORRECTIVE', due_date=date.today() - timedelta(days=2))
+    db.session.add(request)
+    db.session.commit()
+    assert request.overdue
+    assert Notification.query.filter_by(request_id=request.id, status='pending').count() == 1
+
+    request.title = 'Leaking valve, line 2'
+    db.session.commit()
+    assert Notification.query.count() == 1
+
+    request.due_date = date.today() + timedelta(days=1)
+    db.session.commit()
+    assert not request.overdue
+
+    # The periodic sweep delivers the alert raised on save
+    assert 'sweep_overdue' in enqueue_scheduled_tasks()
+    assert Notification.query.one().status == 'sent'
+
+
+def test_sweep_leaves_updated_at_alone(client):
+    version = datetime(2025, 1, 2, 3, 4, 5)
+    # Core inserts skip the save-time flag, so only the sweep flags this row
+    request_id = db.session.execute(insert(Request).values(
+        title='Worn belt', type='CORRECTIVE', status='NEW_REQUEST', priority='MEDIUM', overdue=False,
+        due_date=date.today() - timedelta(days=1), created_at=version, updated_at=version,
+    ).returning(Request.id)).scalar()
+    db.session.commit()
+
+    since = datetime.utcnow()
+    feed = change_feed.broker.subscribe()
+    try:
+        assert sweep_overdue() == (1, 0, 1)
+        event = feed.get_nowait()
+    finally:
+        change_feed.broker.unsubscribe(feed)
+    request = db.session.get(Request, request_id)
+    assert (request.overdue, request.updated_at) == (True, version)
+    assert request.overdue_changed_at >= since
+
+    # The flip still reaches the change feed and incremental exports
+    assert event[1:] == ('updated', {'id': request_id, 'isOverdue': True,
+                                     'overdueChangedAt': request.overdue_changed_at.isoformat()})
+    exported = client.get('/api/export/requests', query_string={'since': since.isoformat()})
+    assert [json.loads(line)['id'] for line in exported.get_data(as_text=True).splitlines()] == [request_id]
+
+    response = client.post('/kanban/move/batch', json={'moves': [
+        {'taskId': request_id, 'newStatus': 'COMPLETED', 'expectedUpdatedAt': version.isoformat()}]})
+    assert response.get_json()['results'][0]['result'] == 'ok'
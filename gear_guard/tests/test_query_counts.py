@@ -0,0 +1,51 @@
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from extensions import db
+from models import Equipment, Request, Team, TeamMember
+
+PAGES = ['/api/requests', '/requests', '/', '/kanban']
+STATUSES = ('NEW_REQUEST', 'IN_PROGRESS', 'UNDER_REVIEW', 'COMPLETED')
+
+
+def _add_requests(numbers):
+    """One request per number, each with its own team, technician and equipment so lazy loads cannot share them"""
+    today = date.today()
+    for n in numbers:
+        team = Team(name=f'Team {n}')
+        db.session.add(team)
+        db.session.flush()
+        technician = TeamMember(name=f'Tech {n}', email=f'tech{n}@example.com', team_id=team.id)
+        equipment = Equipment(name=f'Pump {n}', category='Pumps', status='available', maintenance_team_id=team.id)
+        db.session.add_all([technician, equipment])
+        db.session.flush()
+        equipment.technician_id = technician.id
+        db.session.add(Request(title=f'Request {n}', type=('CORRECTIVE', 'PREVENTIVE')[n % 2],
+                               status=STATUSES[n % len(STATUSES)], team_id=team.id, technician_id=technician.id,
+                               equipment_id=equipment.id, scheduled_date=today + timedelta(days=n % 7),
+                               due_date=today + timedelta(days=n % 5 - 2)))
+    db.session.commit()
+
+
+def _statements(client, path, newest):
+    """Number of SQL statements a GET of path runs; the page must show the newest request"""
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        response = client.get(path)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+    assert response.status_code == 200
+    assert f'Request {newest}' in response.get_data(as_text=True)
+    return len(statements)
+
+
+@pytest.mark.parametrize('path', PAGES)
+def test_statement_count_does_not_grow_with_rows(client, path):
+    _add_requests(range(3))
+    few = _statements(client, path, newest=2)
+    _add_requests(range(3, 30))
+    assert _statements(client, path, newest=29) == few
@@ -0,0 +1,19 @@
+from query_plans import INDEX_SCANS_ALLOWED, check_query_plans, full_scans, route_queries
+
+
+def test_route_queries_do_not_scan_whole_tables(app):
+    failed = {name: plan for name, (plan, scanned) in check_query_plans().items() if scanned}
+    assert failed == {}
+
+
+def test_index_scans_count_as_full_scans():
+    assert full_scans(['SCAN request']) == ['request']
+    assert full_scans(['SCAN request USING INDEX ix_request_overdue']) == ['request']
+    assert full_scans(['SCAN request USING COVERING INDEX ix_request_type_status']) == ['request']
+    assert full_scans(['SCAN request USING COVERING INDEX ix_request_type_status'], index_scans_allowed=True) == []
+    assert full_scans(['SCAN request'], index_scans_allowed=True) == ['request']
+    assert full_scans(['SEARCH request USING INDEX ix_request_due_date_status (due_date<?)']) == []
+
+
+def test_allowed_index_scans_name_route_queries(app):
+    assert set(INDEX_SCANS_ALLOWED) <= set(route_queries())
@@ -0,0 +1,31 @@
+import os
+import re
+
+import pytest
+
+from dashboard_stats import rebuild_dashboard_counters
+from extensions import db
+from models import REQUEST_STATUSES, Request
+
+
+@pytest.mark.parametrize('counters', [False, True], ids=['grouped', 'counters'])
+def test_every_kanban_status_filters_the_listing(client, counters):
+    db.session.add_all([Request(title=f'{status.title()} request', type='CORRECTIVE', status=status)
+                        for status in REQUEST_STATUSES])
+    db.session.commit()
+    if counters:
+        rebuild_dashboard_counters()
+
+    for status in ('NEW', 'REQUIRED', 'SCRAP'):
+        response = client.get(f'/requests?status={status}')
+        assert response.status_code == 200
+        page = response.get_data(as_text=True)
+        assert f'{status.title()} request' in page
+        assert 'Completed request' not in page
+        assert f'{status.title()} (1)' in page
+
+
+def test_kanban_columns_are_request_statuses(app):
+    with open(os.path.join(app.root_path, 'templates', 'kanban.html')) as f:
+        columns = re.findall(r'data-status="(\w+)"', f.read())
+    assert columns and set(columns) <= set(REQUEST_STATUSES)
@@ -0,0 +1,48 @@
+import os
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+
+from dashboard_stats import rebuild_dashboard_counters
+from extensions import db
+from models import Request, Team
+from routing import REPLICA_BIND, sync_sqlite_replica
+
+
+@pytest.fixture
+def replica(app, tmp_path):
+    """A replica bind on a copy of the test database"""
+    engine = create_engine(f"sqlite:///{os.path.join(tmp_path, 'replica.db')}")
+    db.engines[REPLICA_BIND] = engine
+    yield engine
+    del db.engines[REPLICA_BIND]
+    engine.dispose()
+
+
+@pytest.mark.parametrize('path', ['/', '/api/dashboard/stats', '/requests', '/requests?status=NEW_REQUEST'])
+def test_counter_reads_use_the_replica(client, replica, path):
+    team = Team(name='Electrical')
+    db.session.add(team)
+    db.session.flush()
+    db.session.add_all([Request(title=f'Request {n}', type='CORRECTIVE', team_id=team.id,
+                                due_date=date.today() + timedelta(days=n)) for n in range(3)])
+    db.session.commit()
+    rebuild_dashboard_counters()
+    db.session.remove()
+    sync_sqlite_replica(db)
+
+    statements = {'primary': [], 'replica': []}
+    listeners = {engine: lambda conn, cursor, statement, *args, name=name: statements[name].append(statement)
+                 for name, engine in (('primary', db.engines[None]), ('replica', replica))}
+    for engine, listener in listeners.items():
+        event.listen(engine, 'before_cursor_execute', listener)
+    try:
+        response = client.get(path)
+    finally:
+        for engine, listener in listeners.items():
+            event.remove(engine, 'before_cursor_execute', listener)
+
+    assert response.status_code == 200
+    assert statements['primary'] == []
+    assert statements['replica']
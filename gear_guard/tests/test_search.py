@@ -0,0 +1,36 @@
+from sqlalchemy import insert
+
+from extensions import db
+from models import Equipment, Request
+
+
+def _search(client, q):
+    response = client.get('/api/search', query_string={'q': q, 'kind': 'request'})
+    assert response.status_code == 200
+    return [result['id'] for result in response.get_json()['results']]
+
+
+def test_new_requests_are_searchable_after_upgrade(client):
+    """The request search triggers survive every migration up to head"""
+    request = Request(title='Conveyor belt maintenance', type='CORRECTIVE')
+    db.session.add(request)
+    db.session.commit()
+
+    assert _search(client, 'maintenance') == [request.id]
+
+
+def test_edited_and_bulk_inserted_requests_are_reindexed(client):
+    db.session.add(Equipment(name='Maintenance bay crane'))
+    request = Request(title='Gearbox inspection', type='PREVENTIVE')
+    db.session.add(request)
+    db.session.commit()
+    request.title = 'Gearbox replacement'
+    db.session.commit()
+    # Core bulk inserts, as generate_data.py and the importers use, skip the ORM
+    db.session.execute(insert(Request), [{'title': f'Pump {n} maintenance', 'type': 'CORRECTIVE'}
+                                         for n in range(3)])
+    db.session.commit()
+
+    assert _search(client, 'replacement') == [request.id]
+    assert _search(client, 'inspection') == []
+    assert len(_search(client, 'maintenance')) == 3
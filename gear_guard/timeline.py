@@ -0,0 +1,121 @@
+import heapq
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import and_, or_
+
+from models import MaintenanceHistory, Request
+from pagination import DEFAULT_PAGE_SIZE, InvalidCursor, Page, decode_cursor, encode_cursor
+from queries import history_query, request_query
+
+# Timeline sources and their rank, which orders entries sharing a timestamp
+TIMELINE_KINDS = {'request': 2, 'history': 1}
+
+
+@dataclass
+class TimelineEntry:
+    """One request or history entry on an equipment timeline"""
+    kind: str
+    date: datetime
+    record: object
+
+    @property
+    def sort_key(self):
+        return (self.date, TIMELINE_KINDS[self.kind], self.record.id)
+
+    def to_dict(self):
+        record = self.record
+        data = {
+            'kind': self.kind,
+            'id': record.id,
+            'date': self.date.isoformat(),
+            'technicianName': record.technician.name if record.technician else None,
+        }
+        if self.kind == 'request':
+            data.update({
+                'title': record.title,
+                'type': record.type,
+                'status': record.status,
+                'priority': record.priority,
+                'dueDate': record.due_date.isoformat() if record.due_date else None,
+                'completedDate': record.completed_date.isoformat() if record.completed_date else None,
+            })
+        else:
+            data.update({
+                'actionType': record.action_type,
+                'description': record.description,
+                'cost': record.cost,
+                'downtimeHours': record.downtime_hours,
+                'partsReplaced': record.parts_replaced,
+            })
+        return data
+
+
+def _streams(equipment_id, kinds, statuses, action_types):
+    """(kind, query, date column, id column) per index range the timeline is merged from.
+
+    A status or action type filter becomes one stream per value, so every
+    stream is a single range on (equipment_id[, status | action_type], date, id).
+    """
+    streams = []
+    if 'request' in kinds:
+        base = request_query('timeline').filter(Request.equipment_id == equipment_id)
+        for status in statuses or [None]:
+            query = base if status is None else base.filter(Request.status == status)
+            streams.append(('request', query, Request.created_at, Request.id))
+    if 'history' in kinds:
+        base = history_query().filter(MaintenanceHistory.equipment_id == equipment_id,
+                                      MaintenanceHistory.performed_date.isnot(None))
+        for action_type in action_types or [None]:
+            query = base if action_type is None else base.filter(MaintenanceHistory.action_type == action_type)
+            streams.append(('history', query, MaintenanceHistory.performed_date, MaintenanceHistory.id))
+    return streams
+
+
+def _before(kind, date_column, id_column, cursor):
+    """Rows of a stream that sort after the cursor entry (newest first)"""
+    cursor_date, cursor_rank, cursor_id = cursor
+    rank = TIMELINE_KINDS[kind]
+    if rank < cursor_rank:
+        return date_column <= cursor_date
+    if rank > cursor_rank:
+        return date_column < cursor_date
+    return or_(date_column < cursor_date, and_(date_column == cursor_date, id_column < cursor_id))
+
+
+def equipment_timeline(equipment_id, cursor=None, limit=DEFAULT_PAGE_SIZE, kinds=None, statuses=None,
+                       action_types=None):
+    """One page of an equipment's requests and history entries, newest first.
+
+    Requests are dated by creation and history entries by when the work was
+    performed. A status filter narrows requests and an action type filter
+    history entries; given only one of them, the timeline shows that kind
+    alone. Each stream reads at most limit + 1 rows from its index, so a
+    page costs the same however long the equipment's history is.
+    """
+    if kinds is None:
+        kinds = ['request', 'history']
+        if statuses and not action_types:
+            kinds = ['request']
+        elif action_types and not statuses:
+            kinds = ['history']
+    if cursor:
+        cursor = decode_cursor(cursor, 3)
+        if not isinstance(cursor[0], datetime) or cursor[1] not in TIMELINE_KINDS.values() \
+                or not isinstance(cursor[2], int):
+            raise InvalidCursor('Invalid cursor')
+
+    pages = []
+    for kind, query, date_column, id_column in _streams(equipment_id, kinds, statuses, action_types):
+        if cursor:
+            query = query.filter(_before(kind, date_column, id_column, cursor))
+        rows = query.order_by(date_column.desc(), id_column.desc()).limit(limit + 1).all()
+        pages.append([TimelineEntry(kind, getattr(row, date_column.key), row) for row in rows])
+
+    merged = heapq.merge(*pages, key=lambda entry: entry.sort_key, reverse=True)
+    entries = [entry for _, entry in zip(range(limit + 1), merged)]
+    next_cursor = None
+    if len(entries) > limit:
+        entries = entries[:limit]
+        next_cursor = encode_cursor(list(entries[-1].sort_key))
+    return Page(items=entries, next_cursor=next_cursor)
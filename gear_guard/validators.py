@@ -0,0 +1,13 @@
+import re
+
+# Field rules shared by the member/equipment forms and the bulk importer
+EMAIL_PATTERN = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
+PHONE_PATTERN = re.compile(r"\d{10}")
+
+
+def is_valid_email(email):
+    return bool(EMAIL_PATTERN.fullmatch(email))
+
+
+def is_valid_phone(phone):
+    return bool(PHONE_PATTERN.fullmatch(phone))
@@ -0,0 +1,188 @@
+from collections import defaultdict
+from datetime import date, timedelta
+
+from sqlalchemy import and_, bindparam, func, select
+
+from counters import NO_DATE, bump, track_changes
+from extensions import db
+from models import Request, TeamMember, TechnicianLoad
+from dashboard_stats import OPEN_STATUSES
+
+# Hours counted for open requests without an estimate
+DEFAULT_REQUEST_HOURS = 2.0
+# Bookable hours per technician and day, the 100% mark for utilization
+WORKDAY_HOURS = 8.0
+# Open work up to this many days after a request's date counts against a technician
+ASSIGNMENT_LOOKAHEAD_DAYS = 7
+
+# Request attributes the load index depends on
+WORKLOAD_ATTRIBUTES = ('technician_id', 'status', 'scheduled_date', 'due_date', 'estimated_hours')
+
+load_table = TechnicianLoad.__table__
+
+
+# ---------------------------------------------------------------------------
+# Load index
+#
+# technician_load holds the open hours and request count per (technician,
+# day), where day is the scheduled date, else the due date, else NO_DATE
+# (1970-01-01, before any real day). Rows are adjusted by delta on every
+# request change, so reads only sum a handful of index rows per technician
+# instead of scanning requests.
+# ---------------------------------------------------------------------------
+
+def _contribution(values):
+    """(technician_id, day, hours) a request adds to the index, or None"""
+    if not values or values['status'] not in OPEN_STATUSES or not values['technician_id']:
+        return None
+    hours = values['estimated_hours']
+    if hours is None:
+        hours = DEFAULT_REQUEST_HOURS
+    return values['technician_id'], values['scheduled_date'] or values['due_date'] or NO_DATE, hours
+
+
+def _bump(connection, technician_id, day, hours, count):
+    bump(connection, load_table, {'technician_id': technician_id, 'day': day},
+         {'hours': hours, 'open_requests': count})
+
+
+def record_workload_changes(connection, changes):
+    """Adjust the load index for request rows changed outside the ORM unit of work.
+
+    changes is an iterable of (old_values, new_values) dicts with the
+    WORKLOAD_ATTRIBUTES keys, None for the missing side of an insert or
+    delete. Deltas are summed so each index row is touched once.
+    """
+    deltas = defaultdict(lambda: [0.0, 0])
+    for old_values, new_values in changes:
+        for values, sign in ((old_values, -1), (new_values, 1)):
+            contribution = _contribution(values)
+            if contribution:
+                technician_id, day, hours = contribution
+                delta = deltas[(technician_id, day)]
+                delta[0] += sign * hours
+                delta[1] += sign
+    for (technician_id, day), (hours, count) in deltas.items():
+        _bump(connection, technician_id, day, hours, count)
+
+
+def _on_change(connection, target, old_values, new_values):
+    record_workload_changes(connection, [(old_values, new_values)])
+
+
+track_changes(Request, WORKLOAD_ATTRIBUTES, _on_change)
+
+
+def rebuild_workload_index():
+    """Recompute technician_load from the open requests"""
+    day = func.coalesce(Request.scheduled_date, Request.due_date)
+    groups = db.session.query(
+        Request.technician_id, day,
+        func.sum(func.coalesce(Request.estimated_hours, DEFAULT_REQUEST_HOURS)),
+        func.count(Request.id)
+    ).filter(
+        Request.status.in_(OPEN_STATUSES),
+        Request.technician_id.isnot(None)
+    ).group_by(Request.technician_id, day)
+    rows = [{'technician_id': technician_id, 'day': day or NO_DATE, 'hours': hours, 'open_requests': count}
+            for technician_id, day, hours, count in groups]
+
+    db.session.execute(load_table.delete())
+    if rows:
+        db.session.execute(load_table.insert(), rows)
+    db.session.commit()
+    return len(rows)
+
+
+# ---------------------------------------------------------------------------
+# Assignment and utilization
+# ---------------------------------------------------------------------------
+
+def _pick_statement(by_team):
+    hours = func.coalesce(func.sum(load_table.c.hours), 0)
+    open_requests = func.coalesce(func.sum(load_table.c.open_requests), 0)
+    query = (
+        select(TeamMember.id)
+        .outerjoin(load_table, and_(
+            load_table.c.technician_id == TeamMember.id,
+            # Unscheduled work sits at NO_DATE, so it always counts
+            load_table.c.day <= bindparam('until'),
+        ))
+        .where(TeamMember.status == 'active')
+        .group_by(TeamMember.id)
+        .order_by(hours, open_requests, TeamMember.id)
+        .limit(1)
+    )
+    if by_team:
+        query = query.where(TeamMember.team_id == bindparam('team_id'))
+    return query
+
+
+# Built once: assignment sits on the request-creation path
+_PICK_IN_TEAM = _pick_statement(by_team=True)
+_PICK_ANY = _pick_statement(by_team=False)
+
+
+def pick_technician(team_id=None, day=None):
+    """Id of the active technician with the fewest open hours up to day + lookahead.
+
+    Candidates are the members of team_id (the equipment's maintenance
+    team), or every active member when there is no team. Overdue and
+    unscheduled work counts too; ties go to fewer open requests, then the
+    lowest id. Returns None if there is no candidate.
+    """
+    until = (day or date.today()) + timedelta(days=ASSIGNMENT_LOOKAHEAD_DAYS)
+    if team_id:
+        return db.session.execute(_PICK_IN_TEAM, {'team_id': team_id, 'until': until}).scalar()
+    return db.session.execute(_PICK_ANY, {'until': until}).scalar()
+
+
+def technician_utilization(team_id=None, start=None, days=14):
+    """Per-technician load for the window [start, start + days).
+
+    Utilization is the hours booked inside the window against WORKDAY_HOURS
+    per day; overdue (before start) and unscheduled hours are reported
+    separately.
+    """
+    start = start or date.today()
+    end = start + timedelta(days=days)
+    members = TeamMember.query.filter_by(status='active')
+    if team_id:
+        members = members.filter_by(team_id=team_id)
+    members = members.order_by(TeamMember.name).all()
+
+    loads = defaultdict(lambda: {'overdue': 0.0, 'unscheduled': 0.0, 'open': 0, 'daily': defaultdict(float)})
+    if members:
+        rows = db.session.execute(
+            select(load_table.c.technician_id, load_table.c.day, load_table.c.hours, load_table.c.open_requests)
+            .where(load_table.c.technician_id.in_([member.id for member in members]),
+                   load_table.c.day < end)
+        )
+        for technician_id, day, hours, count in rows:
+            load = loads[technician_id]
+            load['open'] += count
+            if day == NO_DATE:
+                load['unscheduled'] += hours
+            elif day < start:
+                load['overdue'] += hours
+            else:
+                load['daily'][day] += hours
+
+    capacity = days * WORKDAY_HOURS
+    technicians = []
+    for member in members:
+        load = loads[member.id]
+        scheduled = sum(load['daily'].values())
+        technicians.append({
+            'id': member.id,
+            'name': member.name,
+            'team_id': member.team_id,
+            'open_requests': load['open'],
+            'scheduled_hours': round(scheduled, 2),
+            'overdue_hours': round(load['overdue'], 2),
+            'unscheduled_hours': round(load['unscheduled'], 2),
+            'utilization': round(scheduled / capacity * 100, 1) if capacity else 0,
+            'daily': [{'date': day.isoformat(), 'hours': round(hours, 2)}
+                      for day, hours in sorted(load['daily'].items()) if round(hours, 2)],
+        })
+    return technicians